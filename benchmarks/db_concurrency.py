@@ -0,0 +1,133 @@
+"""
+Measures throughput of ConfigService and WorkspaceMetadataService under
+concurrent threads, with the tuned DBService (one session factory, pooled
+connections, WAL and a busy timeout) against the previous setup (a new
+sessionmaker per session and default SQLite settings). Failed operations,
+e.g. "database is locked", are counted instead of aborting the run.
+
+Usage:
+    uv run python -m benchmarks.db_concurrency --operations 2000
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from server.services.core.config_service import ConfigService
+from server.services.core.sqlite_db_service import DBService
+from server.services.core.sqlite_db_service.tables.workspace_metadata import (
+    WorkspaceType,
+)
+from server.services.core.workspace_metadata_service import (
+    WorkspaceMetadataService,
+)
+
+
+class PreviousDBService(DBService):
+    @classmethod
+    def _create_engine(cls, connection_string: str) -> Engine:
+        return create_engine(connection_string)
+
+    def get_session(self) -> Session:
+        return sessionmaker(bind=self._engine)()
+
+
+def run(
+    db_service: DBService,
+    threads: int,
+    operations: int,
+    write_ratio: float,
+) -> tuple[float, int]:
+    config_service = ConfigService(db_service)
+    workspace_metadata_service = WorkspaceMetadataService(db_service)
+    workspace_uuids = [
+        workspace_metadata_service.create_workspace_metadata(
+            name=f"workspace {i}",
+            description="",
+            type=WorkspaceType.LOCAL,
+            location="",
+        ).uuid
+        for i in range(10)
+    ]
+    for i in range(10):
+        config_service.set(f"key {i}", "value")
+
+    def operation(i: int) -> bool:
+        rng = random.Random(i)
+        write = rng.random() < write_ratio
+        try:
+            if i % 2:
+                if write:
+                    config_service.set(f"key {rng.randrange(10)}", str(i))
+                else:
+                    config_service.get(f"key {rng.randrange(10)}")
+            elif write:
+                workspace_metadata_service.create_workspace_metadata(
+                    name=f"workspace {i}",
+                    description="",
+                    type=WorkspaceType.LOCAL,
+                    location="",
+                )
+            elif i % 4:
+                workspace_metadata_service.get_workspace_metadata(
+                    rng.choice(workspace_uuids)
+                )
+            else:
+                workspace_metadata_service.get_workspaces()
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(operation, range(operations)))
+    elapsed = time.perf_counter() - start
+    return operations / elapsed, results.count(False)
+
+
+def main(operations: int, write_ratio: float, threads: list[int]):
+    logging.disable(logging.CRITICAL)
+    print(
+        f"{'threads':>8} {'previous ops/s':>15} {'errors':>7}"
+        f" {'tuned ops/s':>12} {'errors':>7}"
+    )
+    for count in threads:
+        results = []
+        for db_service_class in (PreviousDBService, DBService):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_service = db_service_class.from_connection_string(
+                    f"sqlite:///{Path(temp_dir) / 'db.sqlite'}"
+                )
+                results.append(run(db_service, count, operations, write_ratio))
+                db_service.dispose()
+        (previous, previous_errors), (tuned, tuned_errors) = results
+        print(
+            f"{count:>8} {previous:>15.1f} {previous_errors:>7}"
+            f" {tuned:>12.1f} {tuned_errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--operations", type=int, default=2000, help="Operations per measurement"
+    )
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.2, help="Share of writes"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16, 32],
+        help="Concurrent thread counts",
+    )
+    args = parser.parse_args()
+    main(args.operations, args.write_ratio, args.threads)
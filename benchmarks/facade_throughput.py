@@ -0,0 +1,94 @@
+"""
+Measures request throughput of a facade called directly from an async handler
+against the same facade awaited through BaseFacade.run, for an increasing
+number of concurrent clients. The facade sleeps to stand in for the SQLite,
+disk and subprocess I/O of the real facades.
+
+Usage:
+    uv run python -m benchmarks.facade_throughput --latency 20 --requests 200
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from server.facades import BaseFacade, FacadeResponse
+
+
+class SleepFacade(BaseFacade):
+    max_concurrency = 16
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def execute(self) -> FacadeResponse:
+        time.sleep(self.latency)
+        return self._success_response(data=None, message="ok")
+
+
+def create_app(facade: SleepFacade) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking():
+        return facade.execute().to_dict()
+
+    @app.get("/offloaded")
+    async def offloaded():
+        return (await facade.run()).to_dict()
+
+    return app
+
+
+async def measure(
+    app: FastAPI,
+    path: str,
+    clients: int,
+    requests: int,
+) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        queue = iter(range(requests))
+
+        async def worker():
+            for _ in queue:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        return requests / (time.perf_counter() - start)
+
+
+async def main(latency: float, requests: int, clients: list[int]):
+    app = create_app(SleepFacade(latency))
+    print(f"{'clients':>8} {'blocking req/s':>16} {'offloaded req/s':>16}")
+    for count in clients:
+        blocking = await measure(app, "/blocking", count, requests)
+        offloaded = await measure(app, "/offloaded", count, requests)
+        print(f"{count:>8} {blocking:>16.1f} {offloaded:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--latency", type=float, default=20, help="Facade latency in ms"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per measurement"
+    )
+    parser.add_argument(
+        "--clients",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32],
+        help="Concurrent client counts",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.latency / 1000, args.requests, args.clients))
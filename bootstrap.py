@@ -9,9 +9,25 @@ from kink import di
 from server.services.core.config_service import (
     ConfigServiceProtocol,
 )
+from server.services.core.job_service import (
+    JobService,
+    JobServiceProtocol,
+)
+from server.services.core.ontology_indexing_service import (
+    OntologyIndexingService,
+    OntologyIndexingServiceProtocol,
+)
+from server.services.core.rml_mapper_service import (
+    RMLMapperService,
+    RMLMapperServiceProtocol,
+)
 from server.services.core.sqlite_db_service import (
     DBService,
 )
+from server.services.core.temp_file_service import (
+    TempFileService,
+    TempFileServiceProtocol,
+)
 
 
 async def bootstrap():
@@ -67,6 +83,49 @@ async def bootstrap():
     java_path = di[ConfigServiceProtocol].get("java_path")
     if not java_path:
         di[ConfigServiceProtocol].set("java_path", "java")
+    ontology_index_workers = di[ConfigServiceProtocol].get("ontology_index_workers")
+    if not ontology_index_workers:
+        di[ConfigServiceProtocol].set(
+            "ontology_index_workers",
+            str(OntologyIndexingService.DEFAULT_WORKERS),
+        )
+    job_workers = di[ConfigServiceProtocol].get(JobService.WORKERS_CONFIG_KEY)
+    if not job_workers:
+        di[ConfigServiceProtocol].set(
+            JobService.WORKERS_CONFIG_KEY,
+            str(JobService.DEFAULT_WORKERS),
+        )
+    rml_workers = di[ConfigServiceProtocol].get(RMLMapperService.WORKERS_CONFIG_KEY)
+    if not rml_workers:
+        di[ConfigServiceProtocol].set(
+            RMLMapperService.WORKERS_CONFIG_KEY,
+            str(RMLMapperService.DEFAULT_WORKERS),
+        )
+    rml_timeout = di[ConfigServiceProtocol].get(RMLMapperService.TIMEOUT_CONFIG_KEY)
+    if not rml_timeout:
+        di[ConfigServiceProtocol].set(
+            RMLMapperService.TIMEOUT_CONFIG_KEY,
+            str(int(RMLMapperService.DEFAULT_TIMEOUT)),
+        )
+    temp_quota = di[ConfigServiceProtocol].get(TempFileService.QUOTA_CONFIG_KEY)
+    if not temp_quota:
+        di[ConfigServiceProtocol].set(
+            TempFileService.QUOTA_CONFIG_KEY,
+            str(TempFileService.DEFAULT_QUOTA_MB),
+        )
+    temp_max_age = di[ConfigServiceProtocol].get(TempFileService.MAX_AGE_CONFIG_KEY)
+    if not temp_max_age:
+        di[ConfigServiceProtocol].set(
+            TempFileService.MAX_AGE_CONFIG_KEY,
+            str(TempFileService.DEFAULT_MAX_AGE_HOURS),
+        )
+    # Nothing references temporary files of a previous run, old ones are removed
+    di[TempFileServiceProtocol].sweep()
+    di[TempFileServiceProtocol].enforce_quota()
+    # Jobs do not survive a restart, the ones left running are failed
+    di[JobServiceProtocol].fail_interrupted_jobs()
+    # Resolved here so the mapper workers are warm by the first mapping
+    di[RMLMapperServiceProtocol]
 
     logger.info("Environment variables loaded")
 
@@ -74,4 +133,7 @@ async def bootstrap():
 
 
 async def teardown():
+    di[JobServiceProtocol].shutdown()
+    di[RMLMapperServiceProtocol].shutdown()
+    di[OntologyIndexingServiceProtocol].shutdown()
     di[DBService].dispose()
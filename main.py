@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import socket
 import threading
@@ -95,6 +96,8 @@ def on_closing():
 
 
 if __name__ == "__main__":
+    # Required for the ontology indexing process pool in frozen builds
+    multiprocessing.freeze_support()
     if DEBUG:
         start_fastapi()
     else:
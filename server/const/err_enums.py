@@ -17,6 +17,9 @@ class ErrCodes(Enum):
 
     # Ontology Service
     ONTOLOGY_NOT_FOUND = 40
+    ONTOLOGY_INVALID_FIELD = 41
+    ONTOLOGY_INVALID_CURSOR = 42
+    ONTOLOGY_INDEX_INVALID = 43
 
     # Workspace Service
     WORKSPACE_NOT_FOUND = 60
@@ -52,10 +55,18 @@ class ErrCodes(Enum):
     # RML Mapper Service
 
     RML_MAPPING_EXECUTION_ERROR = 180
+    RML_MAPPING_TIMEOUT = 181
+    RML_MAPPING_INVALID_SERIALIZATION = 182
 
     # Export Service
+    ARCHIVE_CODEC_NOT_AVAILABLE = 190
+    ARCHIVE_LEVEL_INVALID = 191
 
     # Import Service
     METADATA_NOT_FOUND = 200
     WRONG_IMPORT_TYPE = 201
     CORRUPTED_TAR = 202
+
+    # Job Service
+    JOB_NOT_FOUND = 220
+    JOB_NOT_FINISHED = 221
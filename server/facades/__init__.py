@@ -1,7 +1,10 @@
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, ClassVar
+
+from anyio import CapacityLimiter
+from starlette.concurrency import run_in_threadpool
 
 from server.exceptions import ErrCodes, ServerException
 
@@ -21,8 +24,22 @@ class FacadeResponse:
             "err_code": self.err_code.value if self.err_code else None,
         }
 
+    def unwrap(self) -> Any:
+        if 200 <= self.status < 300:
+            return self.data
+        raise ServerException(
+            self.message,
+            self.err_code or ErrCodes.UNKNOWN_ERROR,
+        )
+
 
 class BaseFacade(ABC):
+    # Maximum number of concurrent calls of a facade through run, facades doing
+    # heavy disk or process work lower it
+    max_concurrency: ClassVar[int] = 8
+
+    _limiters: ClassVar[dict[type["BaseFacade"], CapacityLimiter]] = {}
+
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -30,6 +47,23 @@ class BaseFacade(ABC):
     def execute(self, *args, **kwargs) -> FacadeResponse:
         pass
 
+    @classmethod
+    def _get_limiter(cls) -> CapacityLimiter:
+        limiter = BaseFacade._limiters.get(cls)
+        if limiter is None:
+            limiter = CapacityLimiter(cls.max_concurrency)
+            BaseFacade._limiters[cls] = limiter
+        return limiter
+
+    async def run(self, *args, **kwargs) -> FacadeResponse:
+        """
+        Run execute on the shared worker thread pool so the event loop is not
+        blocked by its database, disk and process I/O. Calls beyond
+        max_concurrency wait for a free slot.
+        """
+        async with self._get_limiter():
+            return await run_in_threadpool(self.execute, *args, **kwargs)
+
     @staticmethod
     def error_wrapper(
         func,
@@ -1,11 +1,11 @@
 import datetime
 import json
-import tarfile
-from io import BytesIO
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from kink import inject
 
+from server.exceptions import ErrCodes, ServerException
 from server.facades import (
     BaseFacade,
     FacadeResponse,
@@ -14,10 +14,12 @@ from server.models.export_metadata import (
     ExportMetadata,
     ExportMetadataType,
     OntologyExportMetadata,
+    OntologyIndexExportMetadata,
 )
 from server.models.file_metadata import FileMetadata
 from server.models.mapping import MappingGraph
-from server.models.ontology import Ontology
+from server.models.ontology import OntologySummary
+from server.models.source import Source
 from server.models.workspace import WorkspaceModel
 from server.models.workspace_metadata import (
     WorkspaceMetadata,
@@ -40,10 +42,16 @@ from server.service_protocols.workspace_metadata_service_protocol import (
 from server.service_protocols.workspace_service_protocol import (
     WorkspaceServiceProtocol,
 )
+from server.utils.archive_stream import ArchiveCodec, ArchiveStream
+from server.utils.ontology_indexer import OntologyIndexer
 
 
 @inject
 class ExportWorkspaceFacade(BaseFacade):
+    max_concurrency = 2
+    # Mappings and sources read at once
+    LOAD_WORKERS = 8
+
     def __init__(
         self,
         workspace_metadata_service: WorkspaceMetadataServiceProtocol,
@@ -52,7 +60,6 @@ class ExportWorkspaceFacade(BaseFacade):
         mapping_service: MappingServiceProtocol,
         source_service: SourceServiceProtocol,
         file_service: FSServiceProtocol,
-        TEMP_DIR: Path,
     ):
         super().__init__()
         self.workspace_metadata_service: WorkspaceMetadataServiceProtocol = (
@@ -64,12 +71,12 @@ class ExportWorkspaceFacade(BaseFacade):
         self.source_service: SourceServiceProtocol = source_service
         self.file_service: FSServiceProtocol = file_service
 
-        self.temp_dir = TEMP_DIR
-
     @BaseFacade.error_wrapper
     def execute(
         self,
         workspace_id: str,
+        codec: ArchiveCodec = ArchiveCodec.GZIP,
+        level: int | None = None,
     ) -> FacadeResponse:
         self.logger.info(f"Exporting workspace {workspace_id}")
 
@@ -87,43 +94,58 @@ class ExportWorkspaceFacade(BaseFacade):
 
         self.logger.info(f"Retrieved workspace {workspace_id}")
 
-        self.logger.info(f"Getting mappings for workspace {workspace_id}")
-
-        mappings: list[MappingGraph] = [
-            self.mapping_service.get_mapping(mapping_id)
-            for mapping_id in workspace.mappings
-        ]
-
-        self.logger.info(f"Getting sources for workspace {workspace_id}")
+        with ThreadPoolExecutor(
+            max_workers=self.LOAD_WORKERS,
+            thread_name_prefix="workspace-export",
+        ) as executor:
+            # Ontology summaries come from a single query, they are read while
+            # the mappings are loaded
+            self.logger.info(f"Getting ontologies for workspace {workspace_id}")
+            ontologies_future = executor.submit(
+                self.ontology_service.get_ontology_summaries,
+                workspace.ontologies,
+            )
 
-        sources = [
-            self.source_service.get_source(mapping.source_id) for mapping in mappings
-        ]
+            self.logger.info(f"Getting mappings for workspace {workspace_id}")
+            mappings: list[MappingGraph] = list(
+                executor.map(self.mapping_service.get_mapping, workspace.mappings)
+            )
 
-        self.logger.info(f"Getting ontologies for workspace {workspace_id}")
+            self.logger.info(f"Getting sources for workspace {workspace_id}")
+            source_ids = list(dict.fromkeys(mapping.source_id for mapping in mappings))
+            sources_by_id: dict[str, Source] = dict(
+                zip(
+                    source_ids,
+                    executor.map(self.source_service.get_source, source_ids),
+                )
+            )
+            sources = [sources_by_id[mapping.source_id] for mapping in mappings]
 
-        ontologies: list[Ontology] = [
-            self.ontology_service.get_ontology(ontology_id)
-            for ontology_id in workspace.ontologies
-        ]
+            ontologies: list[OntologySummary] = ontologies_future.result()
 
         self.logger.info(f"Getting files for workspace {workspace_id}")
 
-        files: list[FileMetadata] = []
-
-        files.extend(
-            [
-                self.file_service.get_file_metadata_by_uuid(source.file_uuid)
-                for source in sources
-            ]
-        )
+        file_uuids = [source.file_uuid for source in sources] + [
+            ontology.file_uuid for ontology in ontologies
+        ]
+        files_by_uuid = self.file_service.get_file_metadata_by_uuids(file_uuids)
+        for file_uuid in file_uuids:
+            if file_uuid not in files_by_uuid:
+                raise ServerException(
+                    f"File with UUID {file_uuid} does not exist",
+                    code=ErrCodes.FILE_NOT_FOUND,
+                )
+        files: list[FileMetadata] = [
+            files_by_uuid[file_uuid] for file_uuid in file_uuids
+        ]
 
-        files.extend(
-            [
-                self.file_service.get_file_metadata_by_uuid(ontology.file_uuid)
-                for ontology in ontologies
-            ]
-        )
+        # Stored indexes travel with the export, the importer reuses them
+        # instead of parsing the ontology files again
+        ontology_hashes = [
+            files_by_uuid[ontology.file_uuid].hash for ontology in ontologies
+        ]
+        index_files = self.ontology_service.get_index_file_uuids(ontology_hashes)
+        self.logger.info(f"Found {len(index_files)} stored ontology indexes")
 
         self.logger.info(f"Creating export metadata for workspace {workspace_id}")
 
@@ -140,65 +162,58 @@ class ExportWorkspaceFacade(BaseFacade):
                     description=ontology.description,
                     base_uri=ontology.base_uri,
                     file_uuid=ontology.file_uuid,
+                    index=(
+                        OntologyIndexExportMetadata(
+                            indexer_version=OntologyIndexer.VERSION,
+                            content_hash=content_hash,
+                            file=f"indexes/{content_hash}.json",
+                        )
+                        if content_hash in index_files
+                        else None
+                    ),
                 )
-                for ontology in ontologies
+                for ontology, content_hash in zip(ontologies, ontology_hashes)
             ],
         )
 
-        self.logger.info(f"Creating tar file for workspace {workspace_id}")
+        self.logger.info(f"Planning archive for workspace {workspace_id}")
 
-        tar_file_path = (
-            self.temp_dir
-            / f"rc-workspace-export-{workspace.name}-{datetime.datetime.now().isoformat().replace(':', '_')}.tar.gz"
+        # The archive is written while it is sent, stored files are read
+        # from disk when their member is reached
+        archive = ArchiveStream(
+            f"rc-workspace-export-{workspace.name}-{datetime.datetime.now().isoformat().replace(':', '_')}",
+            codec=codec,
+            level=level,
         )
-
-        self.logger.info(f"Tar file path for mapping {workspace_id}: {tar_file_path}")
-
-        with tarfile.open(tar_file_path, "w:gz") as tar:
-            self.logger.info(f"Creating tar file for workspace {workspace_id}")
-
-            tarinfo = tarfile.TarInfo("metadata.json")
-            export_metadata_dumps = json.dumps(export_metadata.to_dict()).encode(
-                "utf-8"
+        archive.add_bytes(
+            "metadata.json",
+            json.dumps(export_metadata.to_dict()).encode("utf-8"),
+        )
+        archive.add_directory("files/")
+
+        # Files with the same content are stored once, the others are hard
+        # links to the first member
+        members_by_hash: dict[str, str] = {}
+
+        for file in files_by_uuid.values():
+            if file.hash in members_by_hash:
+                archive.add_link(f"files/{file.uuid}", members_by_hash[file.hash])
+                continue
+            members_by_hash[file.hash] = f"files/{file.uuid}"
+            archive.add_file(
+                f"files/{file.uuid}",
+                partial(self.file_service.open_file_with_uuid, file.uuid),
             )
-            tarinfo.size = len(export_metadata_dumps)
-            tarinfo.mode = 0o666
 
-            tar.addfile(
-                tarinfo,
-                BytesIO(export_metadata_dumps),
+        if index_files:
+            archive.add_directory("indexes/")
+        for content_hash, index_file_uuid in index_files.items():
+            archive.add_file(
+                f"indexes/{content_hash}.json",
+                partial(self.file_service.open_file_with_uuid, index_file_uuid),
             )
 
-            files_folder = tarfile.TarInfo("files/")
-            files_folder.type = tarfile.DIRTYPE
-            files_folder.mode = 0o777
-            tar.addfile(files_folder)
-
-            for file in files:
-                self.logger.info(
-                    f"Downloading file {file.uuid} for workspace {workspace_id}"
-                )
-
-                _data = self.file_service.download_file_with_uuid(file.uuid)
-
-                self.logger.info(
-                    f"Adding file {file.uuid} to tar for workspace {workspace_id}"
-                )
-
-                _file_tarinfo = tarfile.TarInfo(name=f"files/{file.uuid}")
-                _file_tarinfo.size = len(_data)
-                _file_tarinfo.mode = 0o666
-
-                tar.addfile(
-                    _file_tarinfo,
-                    BytesIO(_data),
-                )
-
-        self.logger.info(
-            f"Successfully created tar file for workspace {workspace_id} at {tar_file_path}"
-        )
-
         return self._success_response(
-            data=tar_file_path,
+            data=archive,
             message="Exported workspace successfully",
         )
@@ -1,5 +1,6 @@
 from kink import inject
 
+from server.exceptions import ErrCodes, ServerException
 from server.facades import (
     BaseFacade,
     FacadeResponse,
@@ -28,24 +29,24 @@ class GetWorkspacesFacade(BaseFacade):
         self,
         uuid: str | None = None,
     ) -> FacadeResponse:
-        self.logger.info("Retrieving all workspace metadata")
-        all_workspace_metadata = self.workspace_metadata_service.get_workspaces()
-
         if uuid:
-            all_workspace_metadata = [
-                metadata for metadata in all_workspace_metadata if metadata.uuid == uuid
-            ]
-
-        all_workspaces = []
-
-        for metadata in all_workspace_metadata:
-            self.logger.info(f"Getting workspace {metadata.location}")
+            self.logger.info(f"Retrieving workspace metadata {uuid}")
             try:
-                workspace = self.workspace_service.get_workspace(metadata.location)
-                all_workspaces.append(workspace)
-            except Exception as e:
-                self.logger.error(f"Error getting workspace {metadata.location}: {e}")
-                self.logger.error(f"Skipping workspace {metadata.location}")
+                all_workspace_metadata = [
+                    self.workspace_metadata_service.get_workspace_metadata(uuid)
+                ]
+            except ServerException as e:
+                if e.code != ErrCodes.WORKSPACE_METADATA_NOT_FOUND:
+                    raise
+                all_workspace_metadata = []
+        else:
+            self.logger.info("Retrieving all workspace metadata")
+            all_workspace_metadata = self.workspace_metadata_service.get_workspaces()
+
+        self.logger.info(f"Getting {len(all_workspace_metadata)} workspaces")
+        all_workspaces = self.workspace_service.get_workspaces(
+            [metadata.location for metadata in all_workspace_metadata]
+        )
 
         return FacadeResponse(
             status=200,
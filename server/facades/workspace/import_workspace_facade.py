@@ -1,7 +1,10 @@
 import json
 import tarfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
+from typing import IO, BinaryIO
 
 from kink import inject
 
@@ -13,11 +16,17 @@ from server.facades import (
 from server.models.export_metadata import (
     ExportMetadata,
     ExportMetadataType,
+    OntologyIndexExportMetadata,
 )
+from server.models.ontology import OntologyInput
+from server.models.source import Source
 from server.models.workspace import WorkspaceModel
 from server.service_protocols.fs_service_protocol import (
     FSServiceProtocol,
 )
+from server.service_protocols.job_service_protocol import (
+    JobServiceProtocol,
+)
 from server.service_protocols.mapping_service_protocol import (
     MappingServiceProtocol,
 )
@@ -33,10 +42,13 @@ from server.service_protocols.workspace_metadata_service_protocol import (
 from server.service_protocols.workspace_service_protocol import (
     WorkspaceServiceProtocol,
 )
+from server.utils.archive_stream import open_archive
 
 
 @inject
 class ImportWorkspaceFacade(BaseFacade):
+    max_concurrency = 2
+
     def __init__(
         self,
         workspace_metadata_service: WorkspaceMetadataServiceProtocol,
@@ -45,6 +57,7 @@ class ImportWorkspaceFacade(BaseFacade):
         mapping_service: MappingServiceProtocol,
         source_service: SourceServiceProtocol,
         file_service: FSServiceProtocol,
+        job_service: JobServiceProtocol,
         TEMP_DIR: Path,
     ):
         super().__init__()
@@ -56,29 +69,91 @@ class ImportWorkspaceFacade(BaseFacade):
         self.mapping_service: MappingServiceProtocol = mapping_service
         self.source_service: SourceServiceProtocol = source_service
         self.file_service: FSServiceProtocol = file_service
+        self.job_service: JobServiceProtocol = job_service
 
         self.temp_dir = TEMP_DIR
 
-    @BaseFacade.error_wrapper
-    def execute(
-        self,
-        data: bytes,
-    ) -> FacadeResponse:
-        self.logger.info("Importing workspace")
-        tar_f = tarfile.open(fileobj=BytesIO(data))
-
-        export_metadata_raw = tar_f.extractfile("metadata.json")
-
-        if export_metadata_raw is None:
+    def _read_export_metadata(self, raw: IO[bytes] | None) -> ExportMetadata:
+        if raw is None:
             raise ServerException(
                 "Export metadata not found, the tar is corrupted",
                 code=ErrCodes.METADATA_NOT_FOUND,
             )
+        return ExportMetadata.from_dict(json.load(raw))
 
-        export_metadata: ExportMetadata = ExportMetadata.from_dict(
-            json.load(export_metadata_raw)
-        )
+    @contextmanager
+    def _open(
+        self, fileobj: BinaryIO
+    ) -> Iterator[tuple[tarfile.TarFile, ExportMetadata]]:
+        # Exports start with metadata.json, their members are then read in a
+        # single forward pass. Other archives are read with random access.
+        with open_archive(fileobj, stream=True) as tar_f:
+            first = tar_f.next()
+            if first is not None and first.name == "metadata.json":
+                yield tar_f, self._read_export_metadata(tar_f.extractfile(first))
+                return
+
+        self.logger.info("metadata.json is not the first member, reading by name")
+        fileobj.seek(0)
+        with open_archive(fileobj) as tar_f:
+            try:
+                raw = tar_f.extractfile("metadata.json")
+            except KeyError:
+                raw = None
+            yield tar_f, self._read_export_metadata(raw)
+
+    def _open_member(
+        self,
+        tar_f: tarfile.TarFile,
+        member: tarfile.TarInfo,
+        stored_members: dict[str, str],
+    ) -> IO[bytes]:
+        # The first reader gets the member itself, later readers and hard
+        # links read back its stored copy
+        name = member.linkname if member.islnk() else member.name
+        if name in stored_members:
+            return self.file_service.open_file_with_uuid(stored_members[name])
+        raw = None if member.islnk() else tar_f.extractfile(member)
+        if raw is None:
+            raise ServerException(
+                f"File {name} not found",
+                code=ErrCodes.CORRUPTED_TAR,
+            )
+        return raw
+
+    def _import_index(
+        self, exported_index: OntologyIndexExportMetadata, raw: IO[bytes]
+    ) -> None:
+        # Indexes that are outdated or invalid are skipped, the contents
+        # they were built from are indexed again
+        self.logger.info(f"Importing ontology index {exported_index.file}")
+        try:
+            with raw:
+                self.ontology_service.import_index(
+                    exported_index.content_hash,
+                    raw,
+                    exported_index.indexer_version,
+                )
+        except ServerException as e:
+            if e.code != ErrCodes.ONTOLOGY_INDEX_INVALID:
+                raise e
+            self.logger.warning(f"Skipping ontology index {exported_index.file}")
 
+    @BaseFacade.error_wrapper
+    def execute(
+        self,
+        data: bytes | BinaryIO,
+    ) -> FacadeResponse:
+        self.logger.info("Importing workspace")
+        with self._open(BytesIO(data) if isinstance(data, bytes) else data) as (
+            tar_f,
+            export_metadata,
+        ):
+            return self._import(tar_f, export_metadata)
+
+    def _import(
+        self, tar_f: tarfile.TarFile, export_metadata: ExportMetadata
+    ) -> FacadeResponse:
         if (
             export_metadata.type != ExportMetadataType.WORKSPACE
             or export_metadata.workspace_metadata is None
@@ -119,22 +194,97 @@ class ImportWorkspaceFacade(BaseFacade):
 
         self.logger.info("Workspace created")
 
-        self.logger.info("Importing sources")
+        self.logger.info("Importing files")
+
+        sources = {source.uuid: source for source in export_metadata.sources}
+        sources_by_file: dict[str, list[Source]] = {}
+        for source in sources.values():
+            sources_by_file.setdefault(source.file_uuid, []).append(source)
+        ontology_files = {ontology.file_uuid for ontology in export_metadata.ontologies}
+        exported_files = {file.uuid: file for file in export_metadata.files}
+        exported_indexes = {
+            ontology.index.file: ontology.index
+            for ontology in export_metadata.ontologies
+            if ontology.index is not None
+        }
 
         source_mapping: dict[str, str] = {}
+        # Stored copy of every member that was read, hard links in the
+        # archive are read from the copy of their target
+        stored_members: dict[str, str] = {}
+        staged_ontology_files: dict[str, str] = {}
+        staged_hashes: set[str] = set()
+        # Reading the files is the first half of the import, creating the
+        # ontologies the second
+        file_count = len(sources_by_file.keys() | ontology_files)
+        files_read = 0
+
+        try:
+            for member in tar_f:
+                if member.name in exported_indexes and member.isfile():
+                    # Exports write the indexes after the files, an index is
+                    # only trusted for a file whose stored content has its hash
+                    exported_index = exported_indexes[member.name]
+                    raw = tar_f.extractfile(member)
+                    if exported_index.content_hash in staged_hashes and raw is not None:
+                        self._import_index(exported_index, raw)
+                    continue
+                if not member.name.startswith("files/") or not (
+                    member.isfile() or member.islnk()
+                ):
+                    continue
+                file_uuid = member.name.removeprefix("files/")
+                if file_uuid not in sources_by_file and file_uuid not in ontology_files:
+                    continue
+
+                for source in sources_by_file.get(file_uuid, []):
+                    self.logger.info(f"Importing source {source.uuid}")
+                    with self._open_member(tar_f, member, stored_members) as content:
+                        new_source_id = self.source_service.create_source(
+                            source.type,
+                            content,
+                            source.extra,
+                        )
+                    source_mapping[source.uuid] = new_source_id
+                    stored_members.setdefault(
+                        member.name,
+                        self.source_service.get_source(new_source_id).file_uuid,
+                    )
+
+                if file_uuid in ontology_files:
+                    self.logger.info(f"Storing ontology file {file_uuid}")
+                    exported_file = exported_files.get(file_uuid)
+                    with self._open_member(tar_f, member, stored_members) as content:
+                        staged = self.file_service.upload_file_stream(
+                            exported_file.name if exported_file else file_uuid,
+                            content,
+                        )
+                    staged_ontology_files[file_uuid] = staged.uuid
+                    staged_hashes.add(staged.hash)
+                    stored_members.setdefault(member.name, staged.uuid)
 
-        for source in export_metadata.sources:
-            file_raw = tar_f.extractfile(f"files/{source.file_uuid}")
-            if file_raw is None:
-                raise ServerException(
-                    f"File {source.file_uuid} not found",
-                    code=ErrCodes.CORRUPTED_TAR,
+                files_read += 1
+                self.job_service.report_progress(
+                    0.5 * files_read / file_count,
+                    f"Imported {files_read} of {file_count} files",
                 )
-            new_source_id = self.source_service.create_source(
-                source.type, file_raw.read(), source.extra
-            )
 
-            source_mapping[source.uuid] = new_source_id
+            for source in sources.values():
+                if source.uuid not in source_mapping:
+                    raise ServerException(
+                        f"File {source.file_uuid} not found",
+                        code=ErrCodes.CORRUPTED_TAR,
+                    )
+            for file_uuid in ontology_files:
+                if file_uuid not in staged_ontology_files:
+                    raise ServerException(
+                        f"File {file_uuid} not found",
+                        code=ErrCodes.CORRUPTED_TAR,
+                    )
+        except Exception:
+            for staged_uuid in staged_ontology_files.values():
+                self.file_service.delete_file_with_uuid(staged_uuid)
+            raise
 
         self.logger.info("Importing mappings")
 
@@ -152,22 +302,42 @@ class ImportWorkspaceFacade(BaseFacade):
 
         self.logger.info("Importing ontologies")
 
+        # The stored ontology files are handed over, indexes of contents that
+        # were indexed before or came with the export are reused by their hash
+        ontologies_to_create: list[OntologyInput] = []
+        used_ontology_files: set[str] = set()
         for ontology in export_metadata.ontologies:
-            file_raw = tar_f.extractfile(f"files/{ontology.file_uuid}")
-            if file_raw is None:
-                raise ServerException(
-                    f"File {ontology.file_uuid} not found",
-                    code=ErrCodes.CORRUPTED_TAR,
+            exported_file = exported_files.get(ontology.file_uuid)
+            if ontology.file_uuid in used_ontology_files:
+                # Every ontology owns its file, a file shared in the export
+                # is stored again for the ontologies after the first
+                with self.file_service.open_file_with_uuid(
+                    staged_ontology_files[ontology.file_uuid]
+                ) as content:
+                    staged_uuid = self.file_service.upload_file_stream(
+                        exported_file.name if exported_file else ontology.file_uuid,
+                        content,
+                    ).uuid
+            else:
+                staged_uuid = staged_ontology_files[ontology.file_uuid]
+                used_ontology_files.add(ontology.file_uuid)
+            ontologies_to_create.append(
+                OntologyInput(
+                    name=ontology.name,
+                    description=ontology.description,
+                    base_uri=ontology.base_uri,
+                    file_name=exported_file.name if exported_file else None,
+                    file_uuid=staged_uuid,
                 )
-            new_ontology = self.ontology_service.create_ontology(
-                name=ontology.name,
-                description=ontology.description,
-                base_uri=ontology.base_uri,
-                content=file_raw.read(),
             )
-            new_workspace.ontologies.append(new_ontology.uuid)
 
-        self.logger.info("Importing files")
+        with self.job_service.progress_range(0.5, 1.0):
+            new_ontologies = self.ontology_service.create_ontologies(
+                ontologies_to_create
+            )
+        new_workspace.ontologies.extend(
+            new_ontology.uuid for new_ontology in new_ontologies
+        )
 
         self.workspace_service.create_workspace(workspace=new_workspace)
 
@@ -1,3 +1,5 @@
+from typing import BinaryIO
+
 from kink import inject
 
 from server.facades import (
@@ -42,7 +44,7 @@ class CreateMappingInWorkspaceFacade(BaseFacade):
         workspace_id: str,
         name: str,
         description: str,
-        source_content: bytes,
+        source_content: bytes | BinaryIO,
         source_type: SourceType,
         extra: dict,
     ) -> FacadeResponse:
@@ -1,8 +1,6 @@
 import datetime
 import json
-import tarfile
-from io import BytesIO
-from pathlib import Path
+from functools import partial
 
 from kink import inject
 
@@ -25,6 +23,7 @@ from server.service_protocols.mapping_service_protocol import (
 from server.service_protocols.source_service_protocol import (
     SourceServiceProtocol,
 )
+from server.utils.archive_stream import ArchiveCodec, ArchiveStream
 
 
 @inject
@@ -34,7 +33,6 @@ class ExportMappingInWorkspaceFacade(BaseFacade):
         mapping_service: MappingServiceProtocol,
         source_service: SourceServiceProtocol,
         file_service: FSServiceProtocol,
-        TEMP_DIR: Path,
     ):
         super().__init__()
 
@@ -42,12 +40,12 @@ class ExportMappingInWorkspaceFacade(BaseFacade):
         self.source_service: SourceServiceProtocol = source_service
         self.file_service: FSServiceProtocol = file_service
 
-        self.temp_dir = TEMP_DIR
-
     @BaseFacade.error_wrapper
     def execute(
         self,
         mapping_id: str,
+        codec: ArchiveCodec = ArchiveCodec.GZIP,
+        level: int | None = None,
     ) -> FacadeResponse:
         self.logger.info(f"Exporting mapping {mapping_id}")
         self.logger.info(f"Getting mapping {mapping_id}")
@@ -78,46 +76,25 @@ class ExportMappingInWorkspaceFacade(BaseFacade):
             f"Created export metadata for mapping {mapping_id}: {export_metadata}"
         )
 
-        tar_file_path = (
-            self.temp_dir
-            / f"rc-mapping-export-{mapping.name}-{datetime.datetime.now().isoformat().replace(':', '_')}.tar.gz"
+        archive = ArchiveStream(
+            f"rc-mapping-export-{mapping.name}-{datetime.datetime.now().isoformat().replace(':', '_')}",
+            codec=codec,
+            level=level,
         )
-
-        self.logger.info(f"Tar file path for mapping {mapping_id}: {tar_file_path}")
-
-        with tarfile.open(tar_file_path, "w:gz") as tar:
-            self.logger.info(f"Creating tar file for mapping {mapping_id}")
-            files_folder = tarfile.TarInfo("files/")
-            files_folder.type = tarfile.DIRTYPE
-            files_folder.mode = 0o777
-            tar.addfile(files_folder)
-            for file in export_metadata.files:
-                self.logger.info(
-                    f"Adding file {file.uuid} to tar for mapping {mapping_id}"
-                )
-                _data = self.file_service.download_file_with_uuid(file.uuid)
-                tarinfo = tarfile.TarInfo(name=f"files/{file.uuid}")
-                tarinfo.size = len(_data)
-                tarinfo.mode = 0o666
-                tar.addfile(
-                    tarinfo=tarinfo,
-                    fileobj=BytesIO(_data),
-                )
-
-            self.logger.info(f"Adding metadata.json to tar for mapping {mapping_id}")
-            metadata_info = tarfile.TarInfo("metadata.json")
-            metadata_content = json.dumps(export_metadata.to_dict()).encode()
-            metadata_info.size = len(metadata_content)
-            metadata_info.mode = 0o666
-            tar.addfile(
-                tarinfo=metadata_info,
-                fileobj=BytesIO(metadata_content),
+        archive.add_directory("files/")
+        for file in export_metadata.files:
+            self.logger.info(f"Adding file {file.uuid} to tar for mapping {mapping_id}")
+            # Read from disk once the archive is sent
+            archive.add_file(
+                f"files/{file.uuid}",
+                partial(self.file_service.open_file_with_uuid, file.uuid),
             )
-
-        self.logger.info(
-            f"Successfully created tar file for mapping {mapping_id} at {tar_file_path}"
+        archive.add_bytes(
+            "metadata.json",
+            json.dumps(export_metadata.to_dict()).encode(),
         )
+
         return self._success_response(
-            data=tar_file_path,
+            data=archive,
             message="Exported mapping successfully",
         )
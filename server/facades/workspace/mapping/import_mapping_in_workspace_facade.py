@@ -1,7 +1,7 @@
 import json
-import tarfile
 from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from kink import inject
 
@@ -30,6 +30,7 @@ from server.service_protocols.workspace_metadata_service_protocol import (
 from server.service_protocols.workspace_service_protocol import (
     WorkspaceServiceProtocol,
 )
+from server.utils.archive_stream import open_archive
 
 
 @inject
@@ -59,7 +60,7 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
     def execute(
         self,
         workspace_id: str,
-        tar: bytes,
+        tar: bytes | BinaryIO,
     ) -> FacadeResponse:
         self.logger.info("Importing mapping from tar")
 
@@ -75,47 +76,48 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
 
         self.logger.info("Extracting tar")
 
-        tar_f: tarfile.TarFile = tarfile.open(fileobj=BytesIO(tar))
+        with open_archive(BytesIO(tar) if isinstance(tar, bytes) else tar) as tar_f:
+            export_metadata_raw = tar_f.extractfile("metadata.json")
 
-        export_metadata_raw = tar_f.extractfile("metadata.json")
+            if export_metadata_raw is None:
+                raise ServerException(
+                    "Export metadata not found, the tar is corrupted",
+                    code=ErrCodes.METADATA_NOT_FOUND,
+                )
 
-        if export_metadata_raw is None:
-            raise ServerException(
-                "Export metadata not found, the tar is corrupted",
-                code=ErrCodes.METADATA_NOT_FOUND,
+            export_metadata = ExportMetadata.from_dict(
+                json.loads(export_metadata_raw.read().decode("utf-8"))
             )
 
-        export_metadata = ExportMetadata.from_dict(
-            json.loads(export_metadata_raw.read().decode("utf-8"))
-        )
+            if export_metadata.type != ExportMetadataType.MAPPING:
+                raise ServerException(
+                    "The export is not a mapping export",
+                    code=ErrCodes.WRONG_IMPORT_TYPE,
+                )
 
-        if export_metadata.type != ExportMetadataType.MAPPING:
-            raise ServerException(
-                "The export is not a mapping export",
-                code=ErrCodes.WRONG_IMPORT_TYPE,
-            )
+            self.logger.info(f"Importing mapping {export_metadata.mappings[0].name}")
 
-        self.logger.info(f"Importing mapping {export_metadata.mappings[0].name}")
+            imported_mapping = export_metadata.mappings[0]
+            imported_source = export_metadata.sources[0]
 
-        imported_mapping = export_metadata.mappings[0]
-        imported_source = export_metadata.sources[0]
+            self.logger.info(
+                f"Creating source with file uuid {imported_source.file_uuid}"
+            )
 
-        self.logger.info(f"Creating source with file uuid {imported_source.file_uuid}")
+            raw_source = tar_f.extractfile(f"files/{imported_source.file_uuid}")
 
-        raw_source = tar_f.extractfile(f"files/{imported_source.file_uuid}")
+            if raw_source is None:
+                raise ServerException(
+                    "Source file not found in the tar",
+                    code=ErrCodes.CORRUPTED_TAR,
+                )
 
-        if raw_source is None:
-            raise ServerException(
-                "Source file not found in the tar",
-                code=ErrCodes.CORRUPTED_TAR,
+            source_id = self.source_service.create_source(
+                type=imported_source.type,
+                extra=imported_source.extra,
+                content=raw_source,
             )
 
-        source_id = self.source_service.create_source(
-            type=imported_source.type,
-            extra=imported_source.extra,
-            content=raw_source.read(),
-        )
-
         self.logger.info(f"Source {source_id} created")
 
         self.logger.info(f"Creating mapping {imported_mapping.name}")
@@ -1,3 +1,5 @@
+from typing import BinaryIO
+
 from kink import inject
 
 from server.facades import (
@@ -18,6 +20,8 @@ from server.services.local.local_workspace_service import (
 
 @inject
 class CreateOntologyInWorkspaceFacade(BaseFacade):
+    max_concurrency = 2
+
     def __init__(
         self,
         workspace_metadata_service: WorkspaceMetadataServiceProtocol,
@@ -36,7 +40,8 @@ class CreateOntologyInWorkspaceFacade(BaseFacade):
         name: str,
         description: str,
         base_uri: str,
-        content: bytes,
+        content: bytes | BinaryIO,
+        file_name: str | None = None,
     ) -> FacadeResponse:
         self.logger.info("Retrieving workspace metadata")
         workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
@@ -54,6 +59,7 @@ class CreateOntologyInWorkspaceFacade(BaseFacade):
             description,
             base_uri,
             content,
+            file_name,
         )
 
         self.logger.info("Adding ontology to workspace")
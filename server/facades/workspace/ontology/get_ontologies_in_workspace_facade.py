@@ -4,6 +4,7 @@ from server.facades import (
     BaseFacade,
     FacadeResponse,
 )
+from server.models.ontology import NamedNodeType
 from server.service_protocols.ontology_service_protocol import (
     OntologyServiceProtocol,
 )
@@ -32,6 +33,10 @@ class GetOntologyInWorkspaceFacade(BaseFacade):
     def execute(
         self,
         workspace_id: str,
+        term_type: NamedNodeType | None = None,
+        fields: list[str] | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
     ) -> FacadeResponse:
         self.logger.info("Retrieving workspace metadata")
         workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
@@ -43,6 +48,22 @@ class GetOntologyInWorkspaceFacade(BaseFacade):
             workspace_metadata.location,
         )
 
+        # Any paging argument switches from whole ontologies to a page of terms
+        if any(arg is not None for arg in (term_type, fields, cursor, limit)):
+            self.logger.info("Retrieving ontology terms in workspace")
+            page = self.ontology_service.get_ontology_terms(
+                workspace.ontologies,
+                term_type=term_type,
+                fields=fields,
+                cursor=cursor,
+                limit=limit or 500,
+            )
+            return FacadeResponse(
+                status=200,
+                message="Ontology terms retrieved",
+                data=page.to_dict(),
+            )
+
         self.logger.info("Retrieving ontologies in workspace")
         ontologies = self.ontology_service.get_ontologies(workspace.ontologies)
 
@@ -0,0 +1,64 @@
+from kink import inject
+
+from server.facades import (
+    BaseFacade,
+    FacadeResponse,
+)
+from server.models.ontology import NamedNodeType
+from server.service_protocols.ontology_service_protocol import (
+    OntologyServiceProtocol,
+)
+from server.services.core.workspace_metadata_service import (
+    WorkspaceMetadataServiceProtocol,
+)
+from server.services.local.local_workspace_service import (
+    WorkspaceServiceProtocol,
+)
+
+
+@inject
+class SearchOntologyTermsInWorkspaceFacade(BaseFacade):
+    def __init__(
+        self,
+        workspace_metadata_service: WorkspaceMetadataServiceProtocol,
+        workspace_service: WorkspaceServiceProtocol,
+        ontology_service: OntologyServiceProtocol,
+    ):
+        super().__init__()
+        self.workspace_metadata_service = workspace_metadata_service
+        self.workspace_service = workspace_service
+        self.ontology_service = ontology_service
+
+    @BaseFacade.error_wrapper
+    def execute(
+        self,
+        workspace_id: str,
+        query: str,
+        term_type: NamedNodeType | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> FacadeResponse:
+        self.logger.info("Retrieving workspace metadata")
+        workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
+            workspace_id,
+        )
+
+        self.logger.info("Retrieving workspace")
+        workspace = self.workspace_service.get_workspace(
+            workspace_metadata.location,
+        )
+
+        self.logger.info("Searching ontology terms in workspace")
+        terms = self.ontology_service.search_terms(
+            workspace.ontologies,
+            query,
+            term_type=term_type,
+            limit=limit,
+            offset=offset,
+        )
+
+        return FacadeResponse(
+            status=200,
+            message="Ontology terms retrieved",
+            data=[term.to_dict() for term in terms],
+        )
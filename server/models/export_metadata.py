@@ -15,12 +15,45 @@ class ExportMetadataType(StrEnum):
     WORKSPACE = "workspace"
 
 
+@dataclass
+class OntologyIndexExportMetadata:
+    """
+    A pre-built index of an exported ontology file, stored in the archive so
+    the importer does not have to index the file again
+
+    Attributes:
+        indexer_version (int): Version of the indexer that built the index
+        content_hash (str): sha1 of the ontology file the index was built from
+        file (str): Name of the index member in the archive
+    """
+
+    indexer_version: int
+    content_hash: str
+    file: str
+
+    def to_dict(self):
+        return {
+            "indexer_version": self.indexer_version,
+            "content_hash": self.content_hash,
+            "file": self.file,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            indexer_version=data["indexer_version"],
+            content_hash=data["content_hash"],
+            file=data["file"],
+        )
+
+
 @dataclass
 class OntologyExportMetadata:
     name: str
     description: str
     base_uri: str
     file_uuid: str
+    index: OntologyIndexExportMetadata | None = None
 
     def to_dict(self):
         return {
@@ -28,6 +61,7 @@ class OntologyExportMetadata:
             "description": self.description,
             "base_uri": self.base_uri,
             "file_uuid": self.file_uuid,
+            "index": self.index.to_dict() if self.index is not None else None,
         }
 
     @classmethod
@@ -37,6 +71,11 @@ class OntologyExportMetadata:
             description=data["description"],
             base_uri=data["base_uri"],
             file_uuid=data["file_uuid"],
+            index=(
+                OntologyIndexExportMetadata.from_dict(data["index"])
+                if data.get("index") is not None
+                else None
+            ),
         )
 
 
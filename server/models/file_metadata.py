@@ -16,6 +16,7 @@ class FileMetadata:
         stem (str): name of the file without extension
         suffix (str): extension of the file
         hash (str): hash of the file
+        format (str | None): RDF serialization of the file, if it was parsed as RDF
     """
 
     uuid: str
@@ -23,6 +24,7 @@ class FileMetadata:
     stem: str
     suffix: str
     hash: str
+    format: str | None = None
 
     def to_table(self):
         """
@@ -37,6 +39,7 @@ class FileMetadata:
             stem=self.stem,
             suffix=self.suffix,
             hash=self.hash,
+            format=self.format,
         )
 
     @classmethod
@@ -56,6 +59,7 @@ class FileMetadata:
             stem=table.stem,
             suffix=table.suffix,
             hash=table.hash,
+            format=table.format,
         )
 
     @classmethod
@@ -85,6 +89,7 @@ class FileMetadata:
             stem=data["stem"],
             suffix=data["suffix"],
             hash=data["hash"],
+            format=data.get("format"),
         )
 
     def to_dict(self):
@@ -97,4 +102,5 @@ class FileMetadata:
             "stem": self.stem,
             "suffix": self.suffix,
             "hash": self.hash,
+            "format": self.format,
         }
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from server.services.core.sqlite_db_service.tables.job import (
+    JobStatus,
+    JobTable,
+)
+
+
+@dataclass
+class Job:
+    """
+    Model for a background job
+
+    Attributes:
+        uuid (str): UUID of the job
+        type (str): kind of work, e.g. create_ontology
+        status (JobStatus): status of the job
+        progress (float): progress between 0 and 1
+        message (str | None): last progress message, or the error of a failed job
+        err_code (int | None): error code of a failed job
+        created_at (datetime): submission time
+        updated_at (datetime): time of the last status or progress change
+    """
+
+    uuid: str
+    type: str
+    status: JobStatus
+    progress: float
+    message: str | None
+    err_code: int | None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_table(cls, table: JobTable):
+        """
+        Convert from table representation
+
+        Args:
+            table (JobTable): Table representation
+
+        Returns:
+            Job: The job
+        """
+        return cls(
+            uuid=table.uuid,
+            type=table.type,
+            status=JobStatus(table.status),
+            progress=table.progress,
+            message=table.message,
+            err_code=table.err_code,
+            created_at=table.created_at,
+            updated_at=table.updated_at,
+        )
+
+    def to_dict(self):
+        return {
+            "uuid": self.uuid,
+            "type": self.type,
+            "status": self.status.value,
+            "progress": self.progress,
+            "message": self.message,
+            "err_code": self.err_code,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+@dataclass
+class JobResult:
+    """
+    Result of a succeeded job, either a JSON compatible value or a file
+
+    Attributes:
+        value (Any): the result value, None if the job produced a file
+        path (Path | None): the file produced by the job
+    """
+
+    value: Any = None
+    path: Path | None = None
@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 from enum import StrEnum
+from pathlib import Path
+from typing import BinaryIO
 
 
 @dataclass(kw_only=True)
@@ -228,6 +230,112 @@ class Property(NamedNode):
         )
 
 
+@dataclass(kw_only=True)
+class OntologyIndex:
+    """
+    The indexed terms of an ontology file.
+
+    Attributes:
+        classes (list[Class]): The classes in the ontology
+        individuals (list[Individual]): The individuals in the ontology
+        properties (list[Property]): The properties in the ontology
+        format (str | None): The serialization the ontology file was parsed with
+    """
+
+    classes: list[Class]
+    individuals: list[Individual]
+    properties: list[Property]
+    format: str | None = None
+
+    def to_dict(self):
+        return {
+            "classes": [cls.to_dict() for cls in self.classes],
+            "individuals": [ind.to_dict() for ind in self.individuals],
+            "properties": [prop.to_dict() for prop in self.properties],
+            "format": self.format,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            classes=[Class.from_dict(cls) for cls in data["classes"]],
+            individuals=[Individual.from_dict(ind) for ind in data["individuals"]],
+            properties=[Property.from_dict(prop) for prop in data["properties"]],
+            format=data.get("format"),
+        )
+
+
+@dataclass(kw_only=True)
+class OntologyTermPage:
+    """
+    A page of ontology terms.
+
+    Attributes:
+        items (list[dict]): The terms, projected to the requested fields
+        next_cursor (str | None): Cursor of the next page, None on the last page
+    """
+
+    items: list[dict]
+    next_cursor: str | None = None
+
+    def to_dict(self):
+        return {
+            "items": self.items,
+            "next_cursor": self.next_cursor,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            items=data["items"],
+            next_cursor=data.get("next_cursor"),
+        )
+
+
+@dataclass(kw_only=True)
+class OntologySummary:
+    """
+    The fields of an ontology without its terms.
+
+    Attributes:
+        uuid (str): The UUID of the ontology
+        file_uuid (str): The UUID of the file that the ontology is in
+        name (str): The name of the ontology
+        description (str): The description of the ontology
+        base_uri (str): The base URI of the ontology
+    """
+
+    uuid: str
+    file_uuid: str
+    name: str
+    description: str
+    base_uri: str
+
+
+@dataclass(kw_only=True)
+class OntologyInput:
+    """
+    An ontology file to be indexed and stored.
+
+    Attributes:
+        name (str): The name of the ontology
+        description (str): The description of the ontology
+        base_uri (str): The base URI of the ontology
+        content (bytes | BinaryIO): The content of the ontology file, streams are read in chunks
+        file_name (str | None): The original file name, used as a format hint
+        file_path (Path | None): Path of the stored content, read instead of content when set
+        file_uuid (str | None): UUID of content already stored in the file service, used instead of content. The file becomes the file of the ontology
+    """
+
+    name: str
+    description: str
+    base_uri: str
+    content: bytes | BinaryIO = b""
+    file_name: str | None = None
+    file_path: Path | None = None
+    file_uuid: str | None = None
+
+
 @dataclass(kw_only=True)
 class Ontology:
     """
@@ -0,0 +1,140 @@
+import json
+from typing import Annotated
+
+import anyio
+from fastapi.exceptions import HTTPException
+from fastapi.params import Depends, Query
+from fastapi.routing import APIRouter
+from kink.container import di
+from starlette.background import BackgroundTask
+from starlette.responses import (
+    FileResponse,
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+
+from server.exceptions import ErrCodes, ServerException
+from server.models.job import Job
+from server.service_protocols.job_service_protocol import JobServiceProtocol
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
+
+router = APIRouter()
+
+# Seconds between two status reads of the events stream
+EVENTS_POLL_INTERVAL = 0.5
+
+
+JobServiceDep = Annotated[
+    JobServiceProtocol,
+    Depends(lambda: di[JobServiceProtocol]),
+]
+
+TempFileServiceDep = Annotated[
+    TempFileServiceProtocol,
+    Depends(lambda: di[TempFileServiceProtocol]),
+]
+
+
+def _http_exception(e: ServerException) -> HTTPException:
+    status_code = {
+        ErrCodes.JOB_NOT_FOUND: 404,
+        ErrCodes.JOB_NOT_FINISHED: 409,
+    }.get(e.code, 400)
+    return HTTPException(
+        status_code=status_code,
+        detail={
+            "status": status_code,
+            "message": e.message,
+            "err_code": e.code.value,
+        },
+    )
+
+
+@router.get("/")
+def get_jobs(
+    job_service: JobServiceDep,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+) -> list[Job]:
+    return job_service.get_jobs(limit=limit)
+
+
+@router.get("/{job_id}")
+def get_job(
+    job_id: str,
+    job_service: JobServiceDep,
+) -> Job:
+    try:
+        return job_service.get_job(job_id)
+    except ServerException as e:
+        raise _http_exception(e)
+
+
+@router.get("/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    job_service: JobServiceDep,
+) -> StreamingResponse:
+    try:
+        job = await anyio.to_thread.run_sync(job_service.get_job, job_id)
+    except ServerException as e:
+        raise _http_exception(e)
+
+    async def events():
+        current = job
+        last_event = None
+        while True:
+            event = json.dumps(current.to_dict())
+            if event != last_event:
+                yield f"data: {event}\n\n"
+                last_event = event
+            if current.status.is_finished:
+                return
+            await anyio.sleep(EVENTS_POLL_INTERVAL)
+            current = await anyio.to_thread.run_sync(job_service.get_job, job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/{job_id}/result")
+def get_job_result(
+    job_id: str,
+    job_service: JobServiceDep,
+    temp_file_service: TempFileServiceDep,
+) -> Response:
+    try:
+        result = job_service.get_job_result(job_id)
+    except ServerException as e:
+        raise _http_exception(e)
+
+    if result.path is not None:
+        # The file is not evicted while it is sent
+        temp_file_service.acquire(result.path)
+        if not result.path.exists():
+            temp_file_service.release(result.path)
+            raise HTTPException(
+                status_code=410,
+                detail={
+                    "status": 410,
+                    "message": f"Result file of job {job_id} no longer exists",
+                },
+            )
+        return FileResponse(
+            path=result.path,
+            filename=result.path.name,
+            background=BackgroundTask(
+                temp_file_service.release,
+                result.path,
+                keep=True,
+            ),
+        )
+    if isinstance(result.value, str):
+        return PlainTextResponse(result.value)
+    return JSONResponse(result.value)
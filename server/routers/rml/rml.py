@@ -1,15 +1,22 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi.exceptions import HTTPException
-from fastapi.params import Body, Depends
+from fastapi.params import Body, Depends, Query
 from fastapi.routing import APIRouter
 from kink.container import di
-from starlette.responses import PlainTextResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse
 
 from server.exceptions import ServerException
+from server.models.job import Job
+from server.service_protocols.job_service_protocol import JobServiceProtocol
 from server.service_protocols.rml_mapper_service_protocol import (
     RMLMapperServiceProtocol,
 )
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
 
 router = APIRouter()
 
@@ -19,10 +26,30 @@ RMLMapperDep = Annotated[
     Depends(lambda: di[RMLMapperServiceProtocol]),
 ]
 
+JobServiceDep = Annotated[
+    JobServiceProtocol,
+    Depends(lambda: di[JobServiceProtocol]),
+]
+
+TempFileServiceDep = Annotated[
+    TempFileServiceProtocol,
+    Depends(lambda: di[TempFileServiceProtocol]),
+]
+
+Serialization = Literal["turtle", "nquads", "trig", "trix", "jsonld"]
+
+MEDIA_TYPES = {
+    "turtle": "text/turtle",
+    "nquads": "application/n-quads",
+    "trig": "application/trig",
+    "trix": "application/trix",
+    "jsonld": "application/ld+json",
+}
+
 
 @router.post(
     "/run-rml-mapping",
-    response_class=PlainTextResponse,
+    response_class=FileResponse,
 )
 async def run_rml_mapping(
     rml: Annotated[
@@ -32,9 +59,24 @@ async def run_rml_mapping(
         ),
     ],
     rml_mapper_service: RMLMapperDep,
-) -> str:
+    temp_file_service: TempFileServiceDep,
+    serialization: Serialization = "turtle",
+    partition_rows: Annotated[int | None, Query(ge=1)] = None,
+) -> FileResponse:
     try:
-        return rml_mapper_service.execute_rml_mapping(rml)
+        # Mappings wait for a free mapper worker on the thread pool
+        output_file = await run_in_threadpool(
+            rml_mapper_service.execute_rml_mapping,
+            rml,
+            serialization,
+            partition_rows,
+        )
+        # The output is sent in chunks and deleted once it is sent
+        return FileResponse(
+            path=output_file,
+            media_type=MEDIA_TYPES[serialization],
+            background=BackgroundTask(temp_file_service.release, output_file),
+        )
     except ServerException as e:
         raise HTTPException(
             status_code=500,
@@ -45,3 +87,34 @@ async def run_rml_mapping(
             status_code=500,
             detail=str(e),
         )
+
+
+@router.post("/run-rml-mapping/job", status_code=202)
+async def run_rml_mapping_job(
+    rml: Annotated[
+        str,
+        Body(
+            media_type="text/plain",
+        ),
+    ],
+    rml_mapper_service: RMLMapperDep,
+    job_service: JobServiceDep,
+    serialization: Serialization = "turtle",
+    partition_rows: Annotated[int | None, Query(ge=1)] = None,
+) -> Job:
+    # The output file is the result of the job
+    return await run_in_threadpool(
+        job_service.submit,
+        "run_rml_mapping",
+        rml_mapper_service.execute_rml_mapping,
+        rml,
+        serialization,
+        partition_rows,
+    )
+
+
+@router.get("/stats")
+def get_rml_mapper_stats(
+    rml_mapper_service: RMLMapperDep,
+) -> dict:
+    return rml_mapper_service.get_stats()
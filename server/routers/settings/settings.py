@@ -1,15 +1,19 @@
 import re
-import shutil
 import subprocess
 from pathlib import Path
 from typing import Annotated
+from uuid import uuid4
 
 from fastapi.exceptions import HTTPException
 from fastapi.params import Depends
 from fastapi.routing import APIRouter
 from kink.container import di
+from starlette.background import BackgroundTask
 from starlette.responses import FileResponse
 
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
 from server.services.core.config_service import ConfigServiceProtocol
 
 router = APIRouter()
@@ -18,47 +22,51 @@ ConfigServiceDep = Annotated[
     ConfigServiceProtocol, Depends(lambda: di[ConfigServiceProtocol])
 ]
 
+TempFileServiceDep = Annotated[
+    TempFileServiceProtocol, Depends(lambda: di[TempFileServiceProtocol])
+]
+
 
 @router.get("/openai-url")
-async def get_openai_url(config_service: ConfigServiceDep):
+def get_openai_url(config_service: ConfigServiceDep):
     return config_service.get("openai_url") or ""
 
 
 @router.put("/openai-url")
-async def set_openai_url(openai_url: str, config_service: ConfigServiceDep):
+def set_openai_url(openai_url: str, config_service: ConfigServiceDep):
     config_service.set("openai_url", openai_url)
     return {"message": "OpenAI URL updated"}
 
 
 @router.get("/openai-key")
-async def get_openai_key(config_service: ConfigServiceDep):
+def get_openai_key(config_service: ConfigServiceDep):
     return config_service.get("openai_key") or ""
 
 
 @router.put("/openai-key")
-async def set_openai_key(openai_key: str, config_service: ConfigServiceDep):
+def set_openai_key(openai_key: str, config_service: ConfigServiceDep):
     config_service.set("openai_key", openai_key)
     return {"message": "OpenAI key updated"}
 
 
 @router.get("/openai-model")
-async def get_openai_model(config_service: ConfigServiceDep):
+def get_openai_model(config_service: ConfigServiceDep):
     return config_service.get("openai_model") or ""
 
 
 @router.put("/openai-model")
-async def set_openai_model(openai_model: str, config_service: ConfigServiceDep):
+def set_openai_model(openai_model: str, config_service: ConfigServiceDep):
     config_service.set("openai_model", openai_model)
     return {"message": "OpenAI model updated"}
 
 
 @router.get("/java-memory")
-async def get_java_memory(config_service: ConfigServiceDep):
+def get_java_memory(config_service: ConfigServiceDep):
     return config_service.get("java_memory")
 
 
 @router.put("/java-memory")
-async def set_java_memory(java_memory: str, config_service: ConfigServiceDep):
+def set_java_memory(java_memory: str, config_service: ConfigServiceDep):
     mem_checker = r"^\d+[kKmMgG]$"  # 1k, 1K, 1m, 1M, 1g, 1G
     if not java_memory or not java_memory.lower().strip() or not java_memory.strip():
         return {"message": "Java memory cannot be empty"}
@@ -68,13 +76,54 @@ async def set_java_memory(java_memory: str, config_service: ConfigServiceDep):
     return {"message": "Java memory updated"}
 
 
+@router.get("/ontology-index-workers")
+def get_ontology_index_workers(config_service: ConfigServiceDep):
+    return config_service.get("ontology_index_workers")
+
+
+@router.put("/ontology-index-workers")
+def set_ontology_index_workers(
+    ontology_index_workers: int, config_service: ConfigServiceDep
+):
+    if ontology_index_workers < 1:
+        return {"message": "Ontology index workers must be at least 1"}
+    config_service.set("ontology_index_workers", str(ontology_index_workers))
+    return {"message": "Ontology index workers updated"}
+
+
+@router.get("/rml-workers")
+def get_rml_workers(config_service: ConfigServiceDep):
+    return config_service.get("rml_workers")
+
+
+@router.put("/rml-workers")
+def set_rml_workers(rml_workers: int, config_service: ConfigServiceDep):
+    if rml_workers < 1:
+        return {"message": "RML workers must be at least 1"}
+    config_service.set("rml_workers", str(rml_workers))
+    return {"message": "RML workers updated"}
+
+
+@router.get("/rml-timeout")
+def get_rml_timeout(config_service: ConfigServiceDep):
+    return config_service.get("rml_timeout")
+
+
+@router.put("/rml-timeout")
+def set_rml_timeout(rml_timeout: int, config_service: ConfigServiceDep):
+    if rml_timeout < 1:
+        return {"message": "RML timeout must be at least 1 second"}
+    config_service.set("rml_timeout", str(rml_timeout))
+    return {"message": "RML timeout updated"}
+
+
 @router.get("/java-path")
-async def get_java_path(config_service: ConfigServiceDep):
+def get_java_path(config_service: ConfigServiceDep):
     return config_service.get("java_path")
 
 
 @router.put("/java-path")
-async def set_java_path(java_path: str, config_service: ConfigServiceDep):
+def set_java_path(java_path: str, config_service: ConfigServiceDep):
     path = Path(java_path).absolute()
     if not path.exists():
         return {"message": "Java path does not exist"}
@@ -100,28 +149,29 @@ async def set_java_path(java_path: str, config_service: ConfigServiceDep):
 
 
 @router.delete("/clear-temp")
-async def clear_temp():
-    shutil.rmtree(di["TEMP_DIR"])
-    di["TEMP_DIR"].mkdir()
+def clear_temp(temp_file_service: TempFileServiceDep):
+    # Files that are in use, e.g. exports being downloaded, are kept
+    temp_file_service.sweep(max_age=0)
     return {"message": "Temporary directory cleared"}
 
 
 @router.get("/logs", response_class=FileResponse)
-async def get_logs():
+def get_logs(temp_file_service: TempFileServiceDep):
     path: Path = di["APP_DIR"] / "rdfcraft.log"
     if not path.exists():
         raise HTTPException(status_code=404, detail="Logs not found")
-    new_path = di["TEMP_DIR"] / "rdfcraft.log"
-    if new_path.exists():
-        new_path.unlink()
+    new_path = temp_file_service.create_file(f"rdfcraft-{uuid4().hex}.log")
     new_path.write_text(path.read_text())
     return FileResponse(
-        new_path, filename="rdfcraft.log", media_type="application/octet-stream"
+        new_path,
+        filename="rdfcraft.log",
+        media_type="application/octet-stream",
+        background=BackgroundTask(temp_file_service.release, new_path),
     )
 
 
 @router.delete("/logs")
-async def clear_logs():
+def clear_logs():
     path = di["APP_DIR"] / "rdfcraft.log"
     if path.exists():
         open(path, "w").close()
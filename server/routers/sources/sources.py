@@ -18,7 +18,7 @@ GetSourceFacadeDep = Annotated[GetSourceFacade, Depends(lambda: di[GetSourceFaca
 
 @router.get("/{source_uuid}")
 async def get_source(source_uuid: str, get_source_facade: GetSourceFacadeDep) -> Source:
-    facade_response = get_source_facade.execute(
+    facade_response = await get_source_facade.run(
         source_uuid=source_uuid,
     )
 
@@ -32,6 +32,12 @@ class CreateOntologyInput(BaseModel):
     description: str
     base_uri: HttpUrl
     content: Base64UrlStr
+    file_name: str | None = None
+
+
+class OntologyTermPageResponse(BaseModel):
+    items: list[dict]
+    next_cursor: str | None = None
 
 
 class CreateMappingInput(BaseModel):
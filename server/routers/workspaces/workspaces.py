@@ -1,11 +1,17 @@
+import shutil
 from pathlib import Path
-from typing import Annotated, cast
+from typing import Annotated, BinaryIO, cast
+from urllib.parse import quote
+from uuid import uuid4
 
+from fastapi import UploadFile
 from fastapi.exceptions import HTTPException
-from fastapi.params import Depends, File
+from fastapi.params import Depends, Form, Query
 from fastapi.routing import APIRouter
 from kink.container import di
-from starlette.responses import FileResponse
+from pydantic import HttpUrl, Json
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
 from starlette.routing import PlainTextResponse
 
 from server.facades import FacadeResponse
@@ -52,6 +58,9 @@ from server.facades.workspace.ontology.delete_ontology_from_workspace_facade imp
 from server.facades.workspace.ontology.get_ontologies_in_workspace_facade import (
     GetOntologyInWorkspaceFacade,
 )
+from server.facades.workspace.ontology.search_ontology_terms_in_workspace_facade import (
+    SearchOntologyTermsInWorkspaceFacade,
+)
 from server.facades.workspace.prefix.create_prefix_in_workspace_facade import (
     CreatePrefixInWorkspaceFacade,
 )
@@ -61,8 +70,10 @@ from server.facades.workspace.prefix.delete_prefix_from_workspace_facade import
 from server.facades.workspace.prefix.get_prefixes_in_workspace_facade import (
     GetPrefixInWorkspaceFacade,
 )
+from server.models.job import Job
 from server.models.mapping import MappingGraph
-from server.models.ontology import Ontology
+from server.models.ontology import NamedNodeType, Ontology
+from server.models.source import SourceType
 from server.models.workspace import WorkspaceModel
 from server.routers.models import BasicResponse
 from server.routers.workspaces.models import (
@@ -70,11 +81,73 @@ from server.routers.workspaces.models import (
     CreateOntologyInput,
     CreatePrefixInput,
     CreateWorkspaceInput,
+    OntologyTermPageResponse,
+)
+from server.service_protocols.job_service_protocol import JobServiceProtocol
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
 )
+from server.utils.archive_stream import ArchiveCodec, ArchiveStream
 
 router = APIRouter()
 
 
+def _copy_upload(upload: BinaryIO, path: Path) -> None:
+    with open(path, "wb") as f:
+        shutil.copyfileobj(upload, f, 1024 * 1024)
+
+
+def _archive_response(archive: ArchiveStream) -> StreamingResponse:
+    # Same Content-Disposition as FileResponse, names that are not plain
+    # ASCII are sent percent encoded
+    filename = quote(archive.filename)
+    if filename != archive.filename:
+        content_disposition = f"attachment; filename*=utf-8''{filename}"
+    else:
+        content_disposition = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        archive,
+        media_type=archive.media_type,
+        headers={"Content-Disposition": content_disposition},
+    )
+
+
+def _write_archive(
+    archive: ArchiveStream,
+    temp_file_service: TempFileServiceProtocol,
+    job_service: JobServiceProtocol,
+) -> Path:
+    # Job results are served after the job ended, so the archive is stored
+    path = temp_file_service.create_file(archive.filename)
+    try:
+        archive.write_to(
+            path,
+            lambda written, members: job_service.report_progress(
+                written / members, f"Wrote {written} of {members} archive members"
+            ),
+        )
+    except Exception:
+        temp_file_service.release(path)
+        raise
+    return path
+
+
+ArchiveLevelQuery = Annotated[
+    int | None,
+    Query(description="Compression level, the default of the codec if not set"),
+]
+
+
+JobServiceDep = Annotated[
+    JobServiceProtocol,
+    Depends(lambda: di[JobServiceProtocol]),
+]
+
+TempFileServiceDep = Annotated[
+    TempFileServiceProtocol,
+    Depends(lambda: di[TempFileServiceProtocol]),
+]
+
 CreateWorkspaceFacadeDep = Annotated[
     CreateWorkspaceFacade,
     Depends(lambda: di[CreateWorkspaceFacade]),
@@ -130,6 +203,11 @@ DeleteOntologyFromWorkspaceDep = Annotated[
     Depends(lambda: di[DeleteOntologyFromWorkspaceFacade]),
 ]
 
+SearchOntologyTermsInWorkspaceDep = Annotated[
+    SearchOntologyTermsInWorkspaceFacade,
+    Depends(lambda: di[SearchOntologyTermsInWorkspaceFacade]),
+]
+
 CreateMappingInWorkspaceDep = Annotated[
     CreateMappingInWorkspaceFacade,
     Depends(lambda: di[CreateMappingInWorkspaceFacade]),
@@ -170,7 +248,7 @@ MappingToYARRRMLDep = Annotated[
 async def get_workspaces(
     get_workspaces_facade: GetWorkspacesFacadeDep,
 ) -> list[WorkspaceModel]:
-    facade_response: FacadeResponse = get_workspaces_facade.execute()
+    facade_response: FacadeResponse = await get_workspaces_facade.run()
 
     if facade_response.status // 100 == 2:
         return facade_response.data or []
@@ -186,7 +264,7 @@ async def get_workspace(
     workspace_id: str,
     get_workspaces_facade: GetWorkspacesFacadeDep,
 ) -> WorkspaceModel:
-    facade_response: FacadeResponse = get_workspaces_facade.execute(
+    facade_response: FacadeResponse = await get_workspaces_facade.run(
         uuid=workspace_id,
     )
 
@@ -217,7 +295,7 @@ async def create_workspace(
     input: CreateWorkspaceInput,
     create_workspace_facade: CreateWorkspaceFacadeDep,
 ) -> BasicResponse:
-    facade_response = create_workspace_facade.execute(
+    facade_response = await create_workspace_facade.run(
         name=input.name,
         description=input.description,
         type=input.type,
@@ -240,7 +318,7 @@ async def delete_workspace(
     workspace_id: str,
     delete_workspace_facade: DeleteWorkspaceFacadeDep,
 ) -> BasicResponse:
-    facade_response = delete_workspace_facade.execute(
+    facade_response = await delete_workspace_facade.run(
         uuid=workspace_id,
     )
 
@@ -255,22 +333,21 @@ async def delete_workspace(
     )
 
 
-@router.get("/{workspace_id}/export", response_class=FileResponse)
+@router.get("/{workspace_id}/export", response_class=StreamingResponse)
 async def export_workspace(
     workspace_id: str,
     export_workspace_facade: ExportWorkspaceFacadeDep,
-) -> FileResponse:
-    facade_response: FacadeResponse = export_workspace_facade.execute(
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    level: ArchiveLevelQuery = None,
+) -> StreamingResponse:
+    facade_response: FacadeResponse = await export_workspace_facade.run(
         workspace_id=workspace_id,
+        codec=codec,
+        level=level,
     )
 
     if facade_response.status // 100 == 2 and facade_response.data:
-        _data = cast(Path, facade_response.data)
-        return FileResponse(
-            path=facade_response.data,
-            filename=_data.name,
-            media_type="application/gzip",
-        )
+        return _archive_response(cast(ArchiveStream, facade_response.data))
 
     raise HTTPException(
         status_code=facade_response.status,
@@ -278,13 +355,37 @@ async def export_workspace(
     )
 
 
+@router.post("/{workspace_id}/export/job", status_code=202)
+async def export_workspace_job(
+    workspace_id: str,
+    export_workspace_facade: ExportWorkspaceFacadeDep,
+    job_service: JobServiceDep,
+    temp_file_service: TempFileServiceDep,
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    level: ArchiveLevelQuery = None,
+) -> Job:
+    return await run_in_threadpool(
+        job_service.submit,
+        "export_workspace",
+        lambda: _write_archive(
+            export_workspace_facade.execute(
+                workspace_id=workspace_id,
+                codec=codec,
+                level=level,
+            ).unwrap(),
+            temp_file_service,
+            job_service,
+        ),
+    )
+
+
 @router.post("/import", response_class=PlainTextResponse)
 async def import_workspace(
-    tar: Annotated[bytes, File()],
+    tar: UploadFile,
     import_workspace_facade: ImportWorkspaceFacadeDep,
 ) -> str:
-    facade_response = import_workspace_facade.execute(
-        data=tar,
+    facade_response = await import_workspace_facade.run(
+        data=tar.file,
     )
 
     if facade_response.status // 100 == 2 and facade_response.data:
@@ -296,12 +397,43 @@ async def import_workspace(
     )
 
 
+@router.post("/import/job", status_code=202)
+async def import_workspace_job(
+    tar: UploadFile,
+    import_workspace_facade: ImportWorkspaceFacadeDep,
+    job_service: JobServiceDep,
+    temp_file_service: TempFileServiceDep,
+) -> Job:
+    # Uploads are closed once the request ends, jobs read a copy instead
+    path = temp_file_service.create_file(f"upload-{uuid4().hex}")
+    try:
+        await run_in_threadpool(_copy_upload, tar.file, path)
+    except Exception:
+        temp_file_service.release(path)
+        raise
+
+    def import_spooled_workspace():
+        try:
+            with open(path, "rb") as f:
+                return import_workspace_facade.execute(
+                    data=f,
+                ).unwrap()
+        finally:
+            temp_file_service.release(path)
+
+    return await run_in_threadpool(
+        job_service.submit,
+        "import_workspace",
+        import_spooled_workspace,
+    )
+
+
 @router.get("/{workspace_id}/prefix")
 async def get_prefixes(
     workspace_id: str,
     get_prefix_in_workspace_facade: GetPrefixInWorkspaceFacadeDep,
 ) -> dict[str, str]:
-    facade_response = get_prefix_in_workspace_facade.execute(
+    facade_response = await get_prefix_in_workspace_facade.run(
         workspace_id=workspace_id,
     )
 
@@ -320,7 +452,7 @@ async def create_prefix(
     data: CreatePrefixInput,
     create_prefix_in_workspace_facade: CreatePrefixInWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = create_prefix_in_workspace_facade.execute(
+    facade_response = await create_prefix_in_workspace_facade.run(
         workspace_id=workspace_id,
         prefix=data.prefix,
         uri=str(data.uri),
@@ -343,7 +475,7 @@ async def delete_prefix(
     prefix: str,
     delete_prefix_from_workspace_facade: DeletePrefixFromWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = delete_prefix_from_workspace_facade.execute(
+    facade_response = await delete_prefix_from_workspace_facade.run(
         workspace_id=workspace_id,
         prefix=prefix,
     )
@@ -363,9 +495,44 @@ async def delete_prefix(
 async def get_ontologies(
     workspace_id: str,
     get_ontology_in_workspace_facade: GetOntologyInWorkspaceFacadeDep,
-) -> list[Ontology]:
-    facade_response = get_ontology_in_workspace_facade.execute(
+    term_type: NamedNodeType | None = None,
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: Annotated[int | None, Query(ge=1, le=5000)] = None,
+) -> list[Ontology] | OntologyTermPageResponse:
+    # Without any paging argument, whole ontologies are returned as before
+    facade_response = await get_ontology_in_workspace_facade.run(
         workspace_id=workspace_id,
+        term_type=term_type,
+        fields=[field.strip() for field in fields.split(",")] if fields else None,
+        cursor=cursor,
+        limit=limit,
+    )
+
+    if facade_response.status // 100 == 2:
+        return facade_response.data or []
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
+@router.get("/{workspace_id}/ontology/search")
+async def search_ontology_terms(
+    workspace_id: str,
+    search_ontology_terms_in_workspace_facade: SearchOntologyTermsInWorkspaceDep,
+    q: Annotated[str, Query(min_length=1)],
+    term_type: NamedNodeType | None = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 20,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[dict]:
+    facade_response = await search_ontology_terms_in_workspace_facade.run(
+        workspace_id=workspace_id,
+        query=q,
+        term_type=term_type,
+        limit=limit,
+        offset=offset,
     )
 
     if facade_response.status // 100 == 2:
@@ -383,12 +550,68 @@ async def create_ontology(
     data: CreateOntologyInput,
     create_ontology_in_workspace_facade: CreateOntologyInWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = create_ontology_in_workspace_facade.execute(
+    facade_response = await create_ontology_in_workspace_facade.run(
         workspace_id=workspace_id,
         name=data.name,
         description=data.description,
         base_uri=str(data.base_uri),
         content=data.content.encode(),
+        file_name=data.file_name,
+    )
+
+    if facade_response.status // 100 == 2:
+        return BasicResponse(
+            message=facade_response.message,
+        )
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
+@router.post("/{workspace_id}/ontology/job", status_code=202)
+async def create_ontology_job(
+    workspace_id: str,
+    data: CreateOntologyInput,
+    create_ontology_in_workspace_facade: CreateOntologyInWorkspaceDep,
+    job_service: JobServiceDep,
+) -> Job:
+    # The job result is the UUID of the created ontology
+    return await run_in_threadpool(
+        job_service.submit,
+        "create_ontology",
+        lambda: (
+            create_ontology_in_workspace_facade.execute(
+                workspace_id=workspace_id,
+                name=data.name,
+                description=data.description,
+                base_uri=str(data.base_uri),
+                content=data.content.encode(),
+                file_name=data.file_name,
+            )
+            .unwrap()
+            .uuid
+        ),
+    )
+
+
+@router.post("/{workspace_id}/ontology/upload", status_code=201)
+async def upload_ontology(
+    workspace_id: str,
+    name: Annotated[str, Form()],
+    description: Annotated[str, Form()],
+    base_uri: Annotated[HttpUrl, Form()],
+    file: UploadFile,
+    create_ontology_in_workspace_facade: CreateOntologyInWorkspaceDep,
+) -> BasicResponse:
+    facade_response = await create_ontology_in_workspace_facade.run(
+        workspace_id=workspace_id,
+        name=name,
+        description=description,
+        base_uri=str(base_uri),
+        content=file.file,
+        file_name=file.filename,
     )
 
     if facade_response.status // 100 == 2:
@@ -408,7 +631,7 @@ async def delete_ontology(
     ontology_id: str,
     delete_ontology_from_workspace_facade: DeleteOntologyFromWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = delete_ontology_from_workspace_facade.execute(
+    facade_response = await delete_ontology_from_workspace_facade.run(
         workspace_id=workspace_id,
         ontology_id=ontology_id,
     )
@@ -429,7 +652,7 @@ async def get_mappings(
     workspace_id: str,
     get_mappings_in_workspace_facade: GetMappingsInWorkspaceDep,
 ) -> list[MappingGraph]:
-    facade_response = get_mappings_in_workspace_facade.execute(
+    facade_response = await get_mappings_in_workspace_facade.run(
         workspace_id=workspace_id,
     )
 
@@ -448,7 +671,7 @@ async def get_mapping(
     mapping_id: str,
     get_mappings_in_workspace_facade: GetMappingsInWorkspaceDep,
 ) -> MappingGraph:
-    facade_response = get_mappings_in_workspace_facade.execute(
+    facade_response = await get_mappings_in_workspace_facade.run(
         workspace_id=workspace_id,
         mapping_id=mapping_id,
     )
@@ -468,7 +691,7 @@ async def create_mapping(
     data: CreateMappingInput,
     create_mapping_in_workspace_facade: CreateMappingInWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = create_mapping_in_workspace_facade.execute(
+    facade_response = await create_mapping_in_workspace_facade.run(
         workspace_id=workspace_id,
         name=data.name,
         description=data.description,
@@ -488,13 +711,43 @@ async def create_mapping(
     )
 
 
+@router.post("/{workspace_id}/mapping/upload", status_code=201)
+async def upload_mapping(
+    workspace_id: str,
+    name: Annotated[str, Form()],
+    description: Annotated[str, Form()],
+    source_type: Annotated[SourceType, Form()],
+    file: UploadFile,
+    create_mapping_in_workspace_facade: CreateMappingInWorkspaceDep,
+    extra: Annotated[Json[dict], Form()] = "{}",
+) -> BasicResponse:
+    facade_response = await create_mapping_in_workspace_facade.run(
+        workspace_id=workspace_id,
+        name=name,
+        description=description,
+        source_content=file.file,
+        source_type=source_type,
+        extra=extra,
+    )
+
+    if facade_response.status // 100 == 2:
+        return BasicResponse(
+            message=facade_response.message,
+        )
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
 @router.delete("/{workspace_id}/mapping/{mapping_id}")
 async def delete_mapping(
     workspace_id: str,
     mapping_id: str,
     delete_mapping_from_workspace_facade: DeleteMappingFromWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = delete_mapping_from_workspace_facade.execute(
+    facade_response = await delete_mapping_from_workspace_facade.run(
         workspace_id=workspace_id,
         mapping_id=mapping_id,
     )
@@ -516,7 +769,7 @@ async def update_mapping(
     data: MappingGraph,
     update_mapping_facade: UpdateMappingDep,
 ) -> BasicResponse:
-    facade_response = update_mapping_facade.execute(
+    facade_response = await update_mapping_facade.run(
         mapping_id=mapping_id,
         mapping_graph=data,
     )
@@ -534,24 +787,23 @@ async def update_mapping(
 
 @router.get(
     "/{workspace_id}/mapping/{mapping_id}/export",
-    response_class=FileResponse,
+    response_class=StreamingResponse,
 )
 async def export_mapping(
     workspace_id: str,
     mapping_id: str,
     export_mapping_in_workspace_facade: ExportMappingInWorkspaceDep,
-) -> FileResponse:
-    facade_response: FacadeResponse = export_mapping_in_workspace_facade.execute(
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    level: ArchiveLevelQuery = None,
+) -> StreamingResponse:
+    facade_response: FacadeResponse = await export_mapping_in_workspace_facade.run(
         mapping_id=mapping_id,
+        codec=codec,
+        level=level,
     )
 
     if facade_response.status // 100 == 2 and facade_response.data:
-        _data = cast(Path, facade_response.data)
-        return FileResponse(
-            path=facade_response.data,
-            filename=_data.name,
-            media_type="application/gzip",
-        )
+        return _archive_response(cast(ArchiveStream, facade_response.data))
 
     raise HTTPException(
         status_code=facade_response.status,
@@ -565,12 +817,12 @@ async def export_mapping(
 )
 async def import_mapping(
     workspace_id: str,
-    tar: Annotated[bytes, File()],
+    tar: UploadFile,
     import_mapping_in_workspace_facade: ImportMappingInWorkspaceDep,
 ) -> str:
-    facade_response = import_mapping_in_workspace_facade.execute(
+    facade_response = await import_mapping_in_workspace_facade.run(
         workspace_id=workspace_id,
-        tar=tar,
+        tar=tar.file,
     )
 
     if facade_response.status // 100 == 2:
@@ -591,7 +843,7 @@ async def mapping_to_yarrrml(
     mapping_id: str,
     mapping_to_yarrrml_facade: MappingToYARRRMLDep,
 ) -> str:
-    facade_response = mapping_to_yarrrml_facade.execute(
+    facade_response = await mapping_to_yarrrml_facade.run(
         workspace_id=workspace_id,
         mapping_id=mapping_id,
     )
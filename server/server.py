@@ -17,6 +17,7 @@ from uvicorn.protocols.utils import (
 )
 
 from bootstrap import bootstrap, teardown
+from server.routers.jobs.jobs import router as jobs_router
 from server.routers.rml.rml import router as rml_router
 from server.routers.settings.settings import router as settings_router
 from server.routers.sources.sources import (
@@ -142,6 +143,11 @@ app.include_router(
     prefix="/api/settings",
     tags=["settings"],
 )
+app.include_router(
+    jobs_router,
+    prefix="/api/jobs",
+    tags=["jobs"],
+)
 
 current_dir = Path(__file__).parent.parent
 build_dir = current_dir / "public"
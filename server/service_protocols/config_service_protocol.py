@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
 
 
 class ConfigServiceProtocol(ABC):
@@ -15,6 +19,21 @@ class ConfigServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_typed(self, key: str, cast: Callable[[str], T], default: T) -> T:
+        """
+        Get a value from the config converted to a type
+
+        Args:
+            key (str): key to get
+            cast (Callable[[str], T]): conversion of the value, e.g. int
+            default (T): value if the key is not set or can not be converted
+
+        Returns:
+            T: converted value of the key, or default
+        """
+        ...
+
     @abstractmethod
     def set(self, key: str, value: str):
         """
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from contextlib import AbstractContextManager
 from pathlib import Path
+from typing import BinaryIO
 
 from server.models.file_metadata import (
     FileMetadata,
@@ -14,6 +17,7 @@ class FSServiceProtocol(ABC):
         content: bytes,
         uuid: str | None = None,
         allow_overwrite: bool = False,
+        format: str | None = None,
     ) -> FileMetadata:
         """
         Upload a file
@@ -23,12 +27,48 @@ class FSServiceProtocol(ABC):
             content (bytes): content of the file
             uuid (str | None): UUID of the file, defaults to None. If None, a new UUID will be generated
             allow_overwrite (bool): whether to allow overwriting the file, defaults to False
+            format (str | None): RDF serialization of the file, if known
 
         Returns:
             FileMetadata: metadata of the file
         """
         ...
 
+    @abstractmethod
+    def upload_file_stream(
+        self,
+        name: str,
+        stream: BinaryIO,
+        uuid: str | None = None,
+        allow_overwrite: bool = False,
+        format: str | None = None,
+    ) -> FileMetadata:
+        """
+        Upload a file from a stream, the content is read in chunks and never held in memory at once
+
+        Args:
+            name (str): name of the file with extension
+            stream (BinaryIO): stream read until its end
+            uuid (str | None): UUID of the file, defaults to None. If None, a new UUID will be generated
+            allow_overwrite (bool): whether to allow overwriting the file, defaults to False
+            format (str | None): RDF serialization of the file, if known
+
+        Returns:
+            FileMetadata: metadata of the file
+        """
+        ...
+
+    @abstractmethod
+    def set_file_format(self, uuid: str, format: str | None) -> None:
+        """
+        Record the RDF serialization of a file
+
+        Args:
+            uuid (str): UUID of the file
+            format (str | None): RDF serialization of the file
+        """
+        ...
+
     @abstractmethod
     def delete_file_with_uuid(self, uuid: str) -> None:
         """
@@ -52,10 +92,63 @@ class FSServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def download_files_with_uuids(self, uuids: Iterable[str]) -> dict[str, bytes]:
+        """
+        Download several files at once, files that do not exist are left out
+
+        Args:
+            uuids (Iterable[str]): UUIDs of the files
+
+        Returns:
+            dict[str, bytes]: content of the files by UUID
+        """
+        ...
+
+    @abstractmethod
+    def open_file_with_uuid(self, uuid: str) -> BinaryIO:
+        """
+        Open a file with UUID for reading, the caller closes it
+
+        Args:
+            uuid (str): UUID of the file
+
+        Returns:
+            BinaryIO: content of the file
+        """
+        ...
+
+    @abstractmethod
+    def map_file_with_uuid(self, uuid: str) -> AbstractContextManager[memoryview]:
+        """
+        Map a file with UUID into memory, the content is read lazily and not copied.
+        Views derived from the mapping must be released before the context exits.
+
+        Args:
+            uuid (str): UUID of the file
+
+        Returns:
+            AbstractContextManager[memoryview]: read only view of the content
+        """
+        ...
+
+    @abstractmethod
+    def link_file_with_uuid(self, uuid: str, destination: Path) -> None:
+        """
+        Make the content of a file with UUID available at a path, without copying it where possible.
+        The destination may share storage with the file, it must not be modified.
+
+        Args:
+            uuid (str): UUID of the file
+            destination (Path): path to create, replaced if it exists
+        """
+        ...
+
     @abstractmethod
     def provide_file_path_of_uuid(self, uuid: str) -> Path:
         """
         Provide the path of a file with UUID. If file does not exist locally, implementation should first download it.
+        Files with the same content may share the path, it must not be modified.
 
         Args:
             uuid (str): UUID of the file
@@ -76,3 +169,18 @@ class FSServiceProtocol(ABC):
             FileMetadata: metadata of the file
         """
         ...
+
+    @abstractmethod
+    def get_file_metadata_by_uuids(
+        self, uuids: Iterable[str]
+    ) -> dict[str, FileMetadata]:
+        """
+        Get metadata of several files at once, files that do not exist are left out
+
+        Args:
+            uuids (Iterable[str]): UUIDs of the files
+
+        Returns:
+            dict[str, FileMetadata]: metadata of the files by UUID
+        """
+        ...
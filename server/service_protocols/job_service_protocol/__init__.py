@@ -0,0 +1,124 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from typing import Any
+
+from server.models.job import Job, JobResult
+
+
+class JobServiceProtocol(ABC):
+    """
+    Service that runs long running work in the background and keeps track of
+    its status, progress and result
+    """
+
+    @abstractmethod
+    def submit(
+        self,
+        job_type: str,
+        func: Callable[..., Any],
+        *args,
+        **kwargs,
+    ) -> Job:
+        """
+        Submit work to be run in the background. The return value of func is the
+        result of the job, a returned Path is served as a file. A raised
+        ServerException fails the job with its code.
+
+        Args:
+            job_type (str): kind of work, e.g. create_ontology
+            func (Callable[..., Any]): the work
+            *args: positional arguments of func
+            **kwargs: keyword arguments of func
+
+        Returns:
+            Job: the pending job
+        """
+        ...
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Job:
+        """
+        Get a job
+
+        Args:
+            job_id (str): UUID of the job
+
+        Returns:
+            Job: the job
+        """
+        ...
+
+    @abstractmethod
+    def get_jobs(self, limit: int = 50) -> list[Job]:
+        """
+        Get the most recently submitted jobs
+
+        Args:
+            limit (int): maximum number of jobs
+
+        Returns:
+            list[Job]: the jobs, newest first
+        """
+        ...
+
+    @abstractmethod
+    def get_job_result(self, job_id: str) -> JobResult:
+        """
+        Get the result of a succeeded job
+
+        Args:
+            job_id (str): UUID of the job
+
+        Returns:
+            JobResult: the result
+        """
+        ...
+
+    @abstractmethod
+    def report_progress(self, progress: float, message: str | None = None) -> None:
+        """
+        Report the progress of the job running on the calling thread. Does
+        nothing when called outside of a job.
+
+        Args:
+            progress (float): progress between 0 and 1
+            message (str | None): description of the current step
+        """
+        ...
+
+    @abstractmethod
+    def progress_range(self, start: float, end: float) -> AbstractContextManager[None]:
+        """
+        Map the progress reported inside the block to a part of the progress
+        of the current step, so a step that reports from 0 to 1 can be nested
+        in a larger one
+
+        Args:
+            start (float): progress of the enclosing step when the block starts
+            end (float): progress of the enclosing step when the block ends
+
+        Returns:
+            AbstractContextManager[None]: context of the block
+        """
+        ...
+
+    @abstractmethod
+    def fail_interrupted_jobs(self) -> int:
+        """
+        Mark jobs that were pending or running when the server stopped as failed
+
+        Returns:
+            int: number of failed jobs
+        """
+        ...
+
+    @abstractmethod
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop accepting jobs and cancel the pending ones
+
+        Args:
+            wait (bool): wait for the running jobs to finish
+        """
+        ...
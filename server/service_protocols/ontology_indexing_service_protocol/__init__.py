@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+
+from server.models.ontology import OntologyIndex, OntologyInput
+
+
+class OntologyIndexingServiceProtocol(ABC):
+    """
+    Service that parses and indexes ontology files
+    """
+
+    @abstractmethod
+    def index_ontology(self, ontology: OntologyInput) -> OntologyIndex:
+        """
+        Parse and index a single ontology
+
+        Args:
+            ontology (OntologyInput): the ontology file, its base URI and file name hint. The stored file is read when file_path is set
+
+        Returns:
+            OntologyIndex: indexed terms of the ontology and the format it was parsed with
+        """
+        ...
+
+    @abstractmethod
+    def index_ontologies(
+        self,
+        ontologies: list[OntologyInput],
+    ) -> list[OntologyIndex]:
+        """
+        Parse and index several ontologies concurrently
+
+        Args:
+            ontologies (list[OntologyInput]): the ontology files
+
+        Returns:
+            list[OntologyIndex]: indexed terms, in the same order as the input
+        """
+        ...
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """
+        Release the resources held by the service
+        """
+        ...
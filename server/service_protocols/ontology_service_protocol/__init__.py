@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 
 from server.models.file_metadata import (
     FileMetadata,
 )
 from server.models.ontology import (
+    NamedNode,
+    NamedNodeType,
     Ontology,
+    OntologyInput,
+    OntologySummary,
+    OntologyTermPage,
 )
 
 
@@ -33,20 +39,133 @@ class OntologyServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_ontology_summaries(self, ids: list[str]) -> list[OntologySummary]:
+        """
+        Get the fields of ontologies without loading their terms
+
+        Parameters:
+            ids (list[str]): List of ontology ids
+
+        Returns:
+            list[OntologySummary]: Summaries in the order of the ids
+        """
+        ...
+
+    @abstractmethod
+    def get_ontology_terms(
+        self,
+        ids: list[str],
+        term_type: NamedNodeType | None = None,
+        fields: list[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 500,
+    ) -> OntologyTermPage:
+        """
+        Get a page of the classes, properties and individuals of ontologies,
+        without loading the ontologies as a whole
+
+        Parameters:
+            ids (list[str]): Ids of the ontologies
+            term_type (NamedNodeType | None): Only return terms of this type
+            fields (list[str] | None): Fields of the terms to return, all fields if None
+            cursor (str | None): Cursor returned with the previous page
+            limit (int): Maximum number of terms in the page
+
+        Returns:
+            OntologyTermPage: The terms and the cursor of the next page
+        """
+        ...
+
+    @abstractmethod
+    def search_terms(
+        self,
+        ids: list[str],
+        query: str,
+        term_type: NamedNodeType | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[NamedNode]:
+        """
+        Search classes, properties and individuals of ontologies by their
+        local name, labels and descriptions. Every word of the query is
+        matched as a prefix.
+
+        Parameters:
+            ids (list[str]): Ids of the ontologies to search in
+            query (str): Search text
+            term_type (NamedNodeType | None): Only return terms of this type
+            limit (int): Maximum number of terms to return
+            offset (int): Number of best matching terms to skip
+
+        Returns:
+            list[NamedNode]: Matching terms, best match first
+        """
+        ...
+
     @abstractmethod
     def create_ontology(
         self,
         name: str,
         description: str,
         base_uri: str,
-        content: bytes,
+        content: bytes | BinaryIO,
+        file_name: str | None = None,
     ) -> Ontology:
         """
         Create an ontology
 
         Parameters:
             name (str): Ontology name
-            content (bytes): Ontology content
+            content (bytes | BinaryIO): Ontology content, streams are read in chunks
+            file_name (str | None): Original file name, used as a format hint
+        """
+        ...
+
+    @abstractmethod
+    def create_ontologies(
+        self,
+        ontologies: list[OntologyInput],
+    ) -> list[Ontology]:
+        """
+        Create several ontologies, parsing and indexing them in parallel
+
+        Parameters:
+            ontologies (list[OntologyInput]): Name, description, base URI and content of every ontology
+
+        Returns:
+            list[Ontology]: Created ontologies, in the same order as the input
+        """
+        ...
+
+    @abstractmethod
+    def get_index_file_uuids(self, content_hashes: list[str]) -> dict[str, str]:
+        """
+        Get the stored indexes of ontology contents, built by the current
+        indexer version
+
+        Parameters:
+            content_hashes (list[str]): sha1 of the ontology files
+
+        Returns:
+            dict[str, str]: UUIDs of the index files by content hash, contents without an index are left out
+        """
+        ...
+
+    @abstractmethod
+    def import_index(
+        self, content_hash: str, index: BinaryIO, indexer_version: int
+    ) -> None:
+        """
+        Store a pre-built index of an ontology content, ontologies created
+        with that content use it instead of indexing the content. Indexes of
+        another indexer version or that do not load as an index raise
+        ONTOLOGY_INDEX_INVALID. Contents that already have an index keep it.
+
+        Parameters:
+            content_hash (str): sha1 of the ontology file the index was built from
+            index (BinaryIO): JSON of the index
+            indexer_version (int): Version of the indexer that built the index
         """
         ...
 
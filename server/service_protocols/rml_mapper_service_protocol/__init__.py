@@ -1,15 +1,43 @@
 from abc import ABC, abstractmethod
+from pathlib import Path
 
 
 class RMLMapperServiceProtocol(ABC):
     @abstractmethod
-    def execute_rml_mapping(self, mapping: str) -> str:
+    def execute_rml_mapping(
+        self,
+        mapping: str,
+        serialization: str = "turtle",
+        partition_rows: int | None = None,
+    ) -> Path:
         """
-        Execute an RML mapping
+        Execute an RML mapping. The output is written to a temporary file, the
+        caller holds a reference to it and releases it once it is consumed.
+
+        With partition_rows and nquads output, a mapping over a single CSV file
+        without join conditions is run in parallel over partitions of the file
+        and the outputs are concatenated. Other mappings are run at once.
 
         Args:
             mapping (str): RML mapping
+            serialization (str): Output serialization, one of turtle, nquads, trig, trix and jsonld
+            partition_rows (int | None): Maximum number of CSV rows per partition
 
         Returns:
-            str: Result of the mapping
+            Path: File containing the result of the mapping
+        """
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        """
+        Get usage statistics of the mapper workers
+
+        Returns:
+            dict: Pool size, started, busy and queued workers, job counts and average wait and run times
+        """
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """
+        Stop the mapper workers
         """
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 
 from server.models.source import Source, SourceType
 
@@ -33,7 +34,7 @@ class SourceServiceProtocol(ABC):
     def create_source(
         self,
         type: SourceType,
-        content: bytes,
+        content: bytes | BinaryIO,
         extra: dict = {},
     ) -> str:
         """
@@ -41,7 +42,7 @@ class SourceServiceProtocol(ABC):
 
         Args:
             type (SourceType): Type of the source
-            content (bytes): Content of the source, depending on the type this can be a file or connection args
+            content (bytes | BinaryIO): Content of the source, depending on the type this can be a file or connection args. Streams are read in chunks
 
         Returns:
             str: ID of the source
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class TempFileServiceProtocol(ABC):
+    """
+    Service that owns the files in the temporary directory. Files are
+    reference counted, a file without references is either deleted right away
+    or kept until it is evicted by the size quota or the startup sweep.
+    """
+
+    @abstractmethod
+    def create_file(self, name: str) -> Path:
+        """
+        Reserve a file in the temporary directory and take a reference to it.
+        Creating a name that is already in use takes another reference to the
+        same file.
+
+        Args:
+            name (str): name of the file
+
+        Returns:
+            Path: path of the file, the file itself is not created
+        """
+        ...
+
+    @abstractmethod
+    def acquire(self, path: Path) -> None:
+        """
+        Take a reference to a temporary file so it is not evicted while it is used
+
+        Args:
+            path (Path): path of the file
+        """
+        ...
+
+    @abstractmethod
+    def release(self, path: Path, keep: bool = False) -> None:
+        """
+        Drop a reference to a temporary file. Files outside of the temporary
+        directory are ignored.
+
+        Args:
+            path (Path): path of the file
+            keep (bool): keep the file once it has no references, until it is evicted
+        """
+        ...
+
+    @abstractmethod
+    def enforce_quota(self) -> int:
+        """
+        Evict files without references, least recently used first, until the
+        temporary directory fits in its quota
+
+        Returns:
+            int: number of evicted files
+        """
+        ...
+
+    @abstractmethod
+    def sweep(self, max_age: float | None = None) -> int:
+        """
+        Delete files and directories without references that were not used
+        for max_age seconds
+
+        Args:
+            max_age (float | None): age in seconds, the configured maximum age if None
+
+        Returns:
+            int: number of deleted entries
+        """
+        ...
@@ -23,6 +23,20 @@ class WorkspaceServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_workspaces(self, locations: list[str]) -> list[WorkspaceModel]:
+        """
+        Get several workspaces at once, workspaces that can not be read are
+        skipped
+
+        Args:
+            locations (list[str]): locations of the workspaces
+
+        Returns:
+            list[WorkspaceModel]: workspaces, in the order of their locations
+        """
+        ...
+
     @abstractmethod
     def create_workspace(self, workspace: WorkspaceModel) -> None:
         """
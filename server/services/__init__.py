@@ -1,13 +1,22 @@
 from server.services.core.config_service import (
     ConfigService,
 )
+from server.services.core.job_service import (
+    JobService,
+)
 from server.services.core.mapping_to_yarrrml_service import (
     MappingToYARRRMLService,
 )
+from server.services.core.ontology_indexing_service import (
+    OntologyIndexingService,
+)
 from server.services.core.rml_mapper_service import (
     RMLMapperService,
 )
 from server.services.core.sqlite_db_service import DBService
+from server.services.core.temp_file_service import (
+    TempFileService,
+)
 from server.services.core.workspace_metadata_service import (
     WorkspaceMetadataService,
 )
@@ -30,12 +39,15 @@ from server.services.local.local_workspace_service import (
 __all__ = [
     "ConfigService",
     "DBService",
-    "WorkspaceMetadataService",
-    "LocalWorkspaceService",
+    "JobService",
     "LocalFSService",
+    "LocalMappingService",
     "LocalOntologyService",
     "LocalSourceService",
-    "LocalMappingService",
+    "LocalWorkspaceService",
     "MappingToYARRRMLService",
+    "OntologyIndexingService",
     "RMLMapperService",
+    "TempFileService",
+    "WorkspaceMetadataService",
 ]
@@ -1,7 +1,10 @@
 import logging
+import threading
+from collections.abc import Callable
+from typing import TypeVar
 
 from kink import inject
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from server.service_protocols.config_service_protocol import (
     ConfigServiceProtocol,
@@ -11,39 +14,60 @@ from server.services.core.sqlite_db_service.tables.config import (
     ConfigTable,
 )
 
+T = TypeVar("T")
+
 
 @inject(alias=ConfigServiceProtocol)
 class ConfigService(ConfigServiceProtocol):
     def __init__(self, db_service: DBService):
         self.logger = logging.getLogger(__name__)
         self._db_service = db_service
+        # The config is only written through this service, every value is
+        # read once and served from memory afterwards
+        self._lock = threading.Lock()
+        with self._db_service.get_session() as session:
+            self._cache: dict[str, str] = {
+                item.key: item.value for item in session.scalars(select(ConfigTable))
+            }
 
-        self.logger.info("ConfigService initialized")
+        self.logger.info(f"ConfigService initialized with {len(self._cache)} keys")
 
     def get(self, key: str) -> str | None:
-        self.logger.info(f"Getting config: {key}")
-        with self._db_service.get_session() as session:
-            result: ConfigTable | None = session.get(ConfigTable, key)
-            self.logger.info(f"Got config {key}: {result}")
-            return result.value if result else None
+        value = self._cache.get(key)
+        self.logger.debug(f"Got config {key}: {value}")
+        return value
+
+    def get_typed(self, key: str, cast: Callable[[str], T], default: T) -> T:
+        value = self.get(key)
+        if not value:
+            return default
+        try:
+            return cast(value)
+        except ValueError:
+            self.logger.warning(f"Invalid {key} config {value}, using default")
+            return default
 
     def set(self, key: str, value: str):
         self.logger.info(f"Setting config: {key} to {value}")
-        with self._db_service.get_session() as session:
-            session.merge(ConfigTable(key=key, value=value))
-            session.commit()
+        with self._lock:
+            with self._db_service.get_session() as session:
+                session.merge(ConfigTable(key=key, value=value))
+                session.commit()
+            self._cache[key] = value
 
         self.logger.info(f"Set config {key} to {value}")
 
     def delete(self, key: str):
         self.logger.info(f"Deleting config: {key}")
-        with self._db_service.get_session() as session:
-            item = session.get(ConfigTable, key)
-            if not item:
-                self.logger.info(f"Config {key} not found, ignoring delete")
-                return
-            session.execute(delete(ConfigTable).where(ConfigTable.key == key))
-            session.commit()
+        with self._lock:
+            with self._db_service.get_session() as session:
+                item = session.get(ConfigTable, key)
+                if not item:
+                    self.logger.info(f"Config {key} not found, ignoring delete")
+                    return
+                session.execute(delete(ConfigTable).where(ConfigTable.key == key))
+                session.commit()
+            self._cache.pop(key, None)
 
         self.logger.info(f"Deleted config {key}")
 
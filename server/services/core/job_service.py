@@ -0,0 +1,277 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from kink import inject
+from sqlalchemy import select, update
+
+from server.exceptions import ErrCodes, ServerException
+from server.models.job import Job, JobResult
+from server.service_protocols.config_service_protocol import (
+    ConfigServiceProtocol,
+)
+from server.service_protocols.job_service_protocol import (
+    JobServiceProtocol,
+)
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
+from server.services.core.sqlite_db_service import (
+    DBService,
+    JobStatus,
+    JobTable,
+)
+
+# UUID of the job running on the current thread
+_current_job: ContextVar[str | None] = ContextVar("current_job", default=None)
+# Part of the progress of the job that the current step reports into
+_progress_range: ContextVar[tuple[float, float]] = ContextVar(
+    "progress_range", default=(0.0, 1.0)
+)
+# Monotonic time of the last stored progress of the job on the current thread
+_last_progress: ContextVar[float] = ContextVar("last_progress", default=float("-inf"))
+
+
+def _now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _to_jsonable(value: Any) -> Any:
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_jsonable(item) for key, item in value.items()}
+    return value
+
+
+@inject(alias=JobServiceProtocol)
+class JobService(JobServiceProtocol):
+    WORKERS_CONFIG_KEY = "job_workers"
+    DEFAULT_WORKERS = 4
+
+    # Jobs that are not finished, only these are updated by their worker
+    ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+    # Seconds between stored progress reports, steps may report per file
+    PROGRESS_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        db_service: DBService,
+        config_service: ConfigServiceProtocol,
+        temp_file_service: TempFileServiceProtocol,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self._db_service = db_service
+        self._config_service = config_service
+        self._temp_file_service = temp_file_service
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+        self.logger.info("JobService initialized")
+
+    def _get_worker_count(self) -> int:
+        return max(
+            1,
+            self._config_service.get_typed(
+                self.WORKERS_CONFIG_KEY, int, self.DEFAULT_WORKERS
+            ),
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                workers = self._get_worker_count()
+                self.logger.info(f"Starting job executor with {workers} workers")
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="job",
+                )
+            return self._executor
+
+    def _update(self, job_id: str, **values) -> bool:
+        # A job failed by fail_interrupted_jobs is never flipped back
+        with self._db_service.get_session() as session:
+            result = session.execute(
+                update(JobTable)
+                .where(
+                    JobTable.uuid == job_id,
+                    JobTable.status.in_(self.ACTIVE_STATUSES),
+                )
+                .values(updated_at=_now(), **values)
+            )
+            session.commit()
+        return result.rowcount > 0
+
+    def submit(
+        self,
+        job_type: str,
+        func: Callable[..., Any],
+        *args,
+        **kwargs,
+    ) -> Job:
+        now = _now()
+        job_table = JobTable(
+            uuid=uuid4().hex,
+            type=job_type,
+            status=JobStatus.PENDING,
+            progress=0.0,
+            created_at=now,
+            updated_at=now,
+        )
+        self.logger.info(f"Submitting {job_type} job {job_table.uuid}")
+        with self._db_service.get_session() as session:
+            session.add(job_table)
+            session.commit()
+            job = Job.from_table(job_table)
+
+        self._get_executor().submit(self._run, job.uuid, func, args, kwargs)
+        return job
+
+    def _run(
+        self,
+        job_id: str,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+    ) -> None:
+        if not self._update(job_id, status=JobStatus.RUNNING):
+            self.logger.warning(f"Job {job_id} is already finished, not running it")
+            return
+        token = _current_job.set(job_id)
+        last_progress_token = _last_progress.set(float("-inf"))
+        self.logger.info(f"Running job {job_id}")
+        try:
+            result = func(*args, **kwargs)
+            if isinstance(result, Path):
+                values = {"result_path": str(result)}
+                # Result files are kept for downloads until they are evicted
+                self._temp_file_service.release(result, keep=True)
+            else:
+                values = {"result": json.dumps(_to_jsonable(result), default=str)}
+            # Step messages of throttled reports may be behind, they are
+            # cleared with the job done
+            self._update(
+                job_id,
+                status=JobStatus.SUCCEEDED,
+                progress=1.0,
+                message=None,
+                **values,
+            )
+            self.logger.info(f"Job {job_id} succeeded")
+        except ServerException as e:
+            self.logger.error(f"Job {job_id} failed: {e.message}")
+            self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                message=e.message,
+                err_code=e.code.value,
+            )
+        except Exception as e:
+            self.logger.error(f"Job {job_id} failed: {e}", exc_info=e)
+            self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                message=str(e),
+                err_code=ErrCodes.UNKNOWN_ERROR.value,
+            )
+        finally:
+            _last_progress.reset(last_progress_token)
+            _current_job.reset(token)
+
+    def _get_job_table(self, job_id: str) -> JobTable:
+        with self._db_service.get_session() as session:
+            job_table = session.get(JobTable, job_id)
+        if job_table is None:
+            raise ServerException(
+                f"Job {job_id} not found",
+                ErrCodes.JOB_NOT_FOUND,
+            )
+        return job_table
+
+    def get_job(self, job_id: str) -> Job:
+        return Job.from_table(self._get_job_table(job_id))
+
+    def get_jobs(self, limit: int = 50) -> list[Job]:
+        query = select(JobTable).order_by(JobTable.created_at.desc()).limit(limit)
+        with self._db_service.get_session() as session:
+            return [Job.from_table(row[0]) for row in session.execute(query).all()]
+
+    def get_job_result(self, job_id: str) -> JobResult:
+        job_table = self._get_job_table(job_id)
+        if job_table.status != JobStatus.SUCCEEDED:
+            raise ServerException(
+                f"Job {job_id} has not succeeded, its status is {job_table.status}",
+                ErrCodes.JOB_NOT_FINISHED,
+            )
+        if job_table.result_path is not None:
+            return JobResult(path=Path(job_table.result_path))
+        return JobResult(
+            value=json.loads(job_table.result) if job_table.result else None
+        )
+
+    def report_progress(self, progress: float, message: str | None = None) -> None:
+        job_id = _current_job.get()
+        if job_id is None:
+            return
+        now = time.monotonic()
+        if now - _last_progress.get() < self.PROGRESS_INTERVAL:
+            return
+        _last_progress.set(now)
+        start, end = _progress_range.get()
+        self._update(
+            job_id,
+            progress=start + min(1.0, max(0.0, progress)) * (end - start),
+            message=message,
+        )
+
+    @contextmanager
+    def progress_range(self, start: float, end: float) -> Iterator[None]:
+        outer_start, outer_end = _progress_range.get()
+        span = outer_end - outer_start
+        token = _progress_range.set(
+            (outer_start + start * span, outer_start + end * span)
+        )
+        try:
+            yield
+        finally:
+            _progress_range.reset(token)
+
+    def fail_interrupted_jobs(self) -> int:
+        with self._db_service.get_session() as session:
+            result = session.execute(
+                update(JobTable)
+                .where(JobTable.status.in_(self.ACTIVE_STATUSES))
+                .values(
+                    status=JobStatus.FAILED,
+                    message="Interrupted by server shutdown",
+                    err_code=ErrCodes.UNKNOWN_ERROR.value,
+                    updated_at=_now(),
+                )
+            )
+            session.commit()
+        if result.rowcount:
+            self.logger.warning(f"Marked {result.rowcount} interrupted jobs as failed")
+        return result.rowcount
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        # Waiting happens outside of the lock, running jobs may submit jobs
+        if executor is not None:
+            self.logger.info("Shutting down job executor")
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+__all__ = ["JobService"]
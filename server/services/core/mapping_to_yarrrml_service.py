@@ -20,13 +20,16 @@ from server.service_protocols.mapping_to_yarrrml_service_protocol import (
     FSServiceProtocol,
     MappingToYARRRMLServiceProtocol,
 )
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
 
 
 @inject(alias=MappingToYARRRMLServiceProtocol)
 class MappingToYARRRMLService(MappingToYARRRMLServiceProtocol):
-    def __init__(self, TEMP_DIR: Path) -> None:
+    def __init__(self, temp_file_service: TempFileServiceProtocol) -> None:
         self.logger = logging.getLogger(__name__)
-        self.temp_dir = TEMP_DIR
+        self.temp_file_service = temp_file_service
 
     def convert_mapping_to_yarrrml(
         self,
@@ -58,15 +61,14 @@ class MappingToYARRRMLService(MappingToYARRRMLServiceProtocol):
 
             # Write the YARRRML to a temporary file
 
-            temp_file_path: Path = (
-                self.temp_dir
-                / f"yarrrml-{mapping.name}-{datetime.datetime.now().isoformat().replace(':', '_')}.yml"
+            temp_file_path = self.temp_file_service.create_file(
+                f"yarrrml-{mapping.name}-{datetime.datetime.now().isoformat().replace(':', '_')}.yml"
             )
 
-            temp_file_path.touch()
-
             temp_file_path.write_text(yaml_str)
 
+            self.temp_file_service.release(temp_file_path, keep=True)
+
             return yaml_str
 
         except Exception as e:
@@ -81,22 +83,23 @@ class MappingToYARRRMLService(MappingToYARRRMLServiceProtocol):
         self, source: Source, fs_service: FSServiceProtocol
     ) -> Path:
         self.logger.info(
-            "Downloading source file content, to workaround a limitation in the RMLMapper (files must have a extension)"
+            "Linking source file, to workaround a limitation in the RMLMapper (files must have a extension)"
         )
-        source_content = fs_service.download_file_with_uuid(source.file_uuid)
-
         extension = "csv" if source.type == SourceType.CSV else "json"
 
-        source_path = self.temp_dir / f"{source.file_uuid}.{extension}"
-
-        self.logger.info(f"Writing source file content to {source_path}")
+        source_path = self.temp_file_service.create_file(
+            f"{source.file_uuid}.{extension}"
+        )
 
-        if source_path.exists():
-            source_path.unlink()
+        self.logger.info(f"Linking source file content to {source_path}")
 
-        source_path.touch()
+        # The stored file is linked instead of copied, the mapper only reads it
+        fs_service.link_file_with_uuid(source.file_uuid, source_path)
 
-        source_path.write_bytes(source_content)
+        # The mapping generated from the YARRRML reads the file later on. The
+        # RML mapper holds it while it runs and links it again by the file
+        # UUID in its name if it was evicted in between.
+        self.temp_file_service.release(source_path, keep=True)
 
         return source_path
 
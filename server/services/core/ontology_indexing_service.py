@@ -0,0 +1,167 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from kink import inject
+from rdflib.plugins.parsers.ntriples import ParseError
+
+from server.models.ontology import OntologyIndex, OntologyInput
+from server.service_protocols.config_service_protocol import (
+    ConfigServiceProtocol,
+)
+from server.service_protocols.ontology_indexing_service_protocol import (
+    OntologyIndexingServiceProtocol,
+)
+from server.utils.ontology_indexer import OntologyIndexer, OntologyTermAccumulator
+from server.utils.rdf_loader import RDFLoader
+
+
+def _index_ontology_file(
+    base_uri: str,
+    file_path: Path,
+    file_name: str | None,
+) -> OntologyIndex:
+    format = RDFLoader.guess_file_format(file_path, file_name)
+    if format in RDFLoader.STREAMING_FORMATS:
+        accumulator = OntologyTermAccumulator()
+        try:
+            # The annotations are read in a second pass, once the terms are
+            # known, so only the annotations of terms are kept in memory
+            RDFLoader.stream_triples(
+                file_path,
+                format,
+                accumulator.add,
+                OntologyTermAccumulator.STRUCTURE_PREDICATES,
+            )
+            RDFLoader.stream_triples(
+                file_path,
+                format,
+                accumulator.add,
+                OntologyTermAccumulator.ANNOTATION_PREDICATES,
+            )
+        except ParseError as e:
+            logging.getLogger(__name__).warning(
+                f"Failed to stream {file_path} as {format}: {e}, loading it instead"
+            )
+        else:
+            index = OntologyIndexer().index_accumulator(base_uri, accumulator)
+            index.format = format
+            return index
+    return _index_ontology_bytes(base_uri, file_path.read_bytes(), file_name)
+
+
+def _index_ontology_bytes(
+    base_uri: str,
+    content: bytes,
+    file_name: str | None,
+) -> OntologyIndex:
+    g, format = RDFLoader.load_rdf_bytes_with_format(content, file_name)
+    try:
+        index = OntologyIndexer().index(base_uri, g)
+        index.format = format
+    finally:
+        g.close()
+    return index
+
+
+def _index_ontology_worker(
+    base_uri: str,
+    content: bytes | None,
+    file_path: str | None,
+    file_name: str | None,
+) -> bytes:
+    """
+    Runs inside a worker process. Stored files are read by the worker, line
+    based formats are streamed without building a graph. The index is returned
+    as UTF-8 encoded JSON which is much cheaper to send back to the parent than
+    pickled models.
+    """
+    if file_path is not None:
+        index = _index_ontology_file(base_uri, Path(file_path), file_name)
+    else:
+        index = _index_ontology_bytes(base_uri, content or b"", file_name)
+    return json.dumps(index.to_dict()).encode("utf-8")
+
+
+@inject(alias=OntologyIndexingServiceProtocol)
+class OntologyIndexingService(OntologyIndexingServiceProtocol):
+    WORKERS_CONFIG_KEY = "ontology_index_workers"
+    DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+    def __init__(self, config_service: ConfigServiceProtocol):
+        self.logger = logging.getLogger(__name__)
+        self._config_service = config_service
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_workers = 0
+
+        self.logger.info("OntologyIndexingService initialized")
+
+    def _get_worker_count(self) -> int:
+        return max(
+            1,
+            self._config_service.get_typed(
+                self.WORKERS_CONFIG_KEY, int, self.DEFAULT_WORKERS
+            ),
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        workers = self._get_worker_count()
+        with self._lock:
+            if self._executor is None or self._executor_workers != workers:
+                if self._executor is not None:
+                    self.logger.info(
+                        f"Worker count changed to {workers}, recreating process pool"
+                    )
+                    self._executor.shutdown(wait=False)
+                self.logger.info(
+                    f"Starting ontology indexing pool with {workers} workers"
+                )
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+                self._executor_workers = workers
+            return self._executor
+
+    def index_ontology(self, ontology: OntologyInput) -> OntologyIndex:
+        return self.index_ontologies([ontology])[0]
+
+    def index_ontologies(
+        self,
+        ontologies: list[OntologyInput],
+    ) -> list[OntologyIndex]:
+        self.logger.info(f"Indexing {len(ontologies)} ontologies")
+        executor = self._get_executor()
+        futures = [
+            executor.submit(
+                _index_ontology_worker,
+                ontology.base_uri,
+                None if ontology.file_path else ontology.content,
+                str(ontology.file_path) if ontology.file_path else None,
+                ontology.file_name,
+            )
+            for ontology in ontologies
+        ]
+        try:
+            return [
+                OntologyIndex.from_dict(json.loads(future.result()))
+                for future in futures
+            ]
+        except BrokenProcessPool:
+            self.logger.error("Ontology indexing pool is broken, it will be recreated")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self.logger.info("Shutting down ontology indexing pool")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+__all__ = ["OntologyIndexingService"]
@@ -1,28 +1,73 @@
 import logging
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import ClassVar
 from uuid import uuid4
 
 from kink import inject
+from rdflib import Graph, Literal
 
 from server.exceptions import ErrCodes, ServerException
 from server.service_protocols.config_service_protocol import (
     ConfigServiceProtocol,
 )
+from server.service_protocols.fs_service_protocol import (
+    FSServiceProtocol,
+)
+from server.service_protocols.job_service_protocol import (
+    JobServiceProtocol,
+)
 from server.service_protocols.rml_mapper_service_protocol import (
     RMLMapperServiceProtocol,
 )
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
+from server.utils.rml_partitioner import RML, RMLPartitioner
+from server.utils.rml_worker_pool import (
+    RMLWorker,
+    RMLWorkerError,
+    RMLWorkerPool,
+    RMLWorkerPoolStats,
+    RMLWorkerStartError,
+)
 
 
 @inject(alias=RMLMapperServiceProtocol)
 class RMLMapperService(RMLMapperServiceProtocol):
+    WORKERS_CONFIG_KEY = "rml_workers"
+    DEFAULT_WORKERS = 2
+    TIMEOUT_CONFIG_KEY = "rml_timeout"
+    DEFAULT_TIMEOUT = 600.0
+
+    # Mapper serializations and the extension of their output files
+    SERIALIZATIONS: ClassVar[dict[str, str]] = {
+        "turtle": "ttl",
+        "nquads": "nq",
+        "trig": "trig",
+        "trix": "trix",
+        "jsonld": "jsonld",
+    }
+
     def __init__(
         self,
         config_service: ConfigServiceProtocol,
+        temp_file_service: TempFileServiceProtocol,
+        fs_service: FSServiceProtocol,
+        job_service: JobServiceProtocol,
         TEMP_DIR: Path,
     ):
         self.logger = logging.getLogger(__name__)
-        self.TEMP_DIR = TEMP_DIR
+        self._temp_file_service = temp_file_service
+        self._fs_service = fs_service
+        self._job_service = job_service
+        self._temp_dir = TEMP_DIR.absolute()
+        self._config_service = config_service
+        self._lock = threading.Lock()
+        self._pool: RMLWorkerPool | None = None
+        self._pool_disabled = False
         self.logger.info("Instantiating RMLMapperService")
         self.logger.info("Determining if system has Java installed")
         self.mapper_bin = (
@@ -63,49 +108,308 @@ class RMLMapperService(RMLMapperServiceProtocol):
 
         if not self.mapper_bin.exists():
             self.logger.error("Mapper not found, RML mappings will not be executed")
+            return
+
+        # Mapper JVMs are started in the background so the first mapping does
+        # not pay for their startup
+        pool = self._get_pool()
+        if pool is not None:
+            threading.Thread(target=pool.warm_up, daemon=True).start()
 
         self.logger.info("RMLMapperService instantiated")
 
-    def execute_rml_mapping(self, mapping: str) -> str:
-        self.logger.info("Executing RML mapping")
-        self.logger.info("Writing RML mapping to temp file")
-        process_uuid = uuid4().hex
-        rml_file: Path = self.TEMP_DIR / f"rml_{process_uuid}.ttl"
+    def _get_worker_count(self) -> int:
+        return max(
+            1,
+            self._config_service.get_typed(
+                self.WORKERS_CONFIG_KEY, int, self.DEFAULT_WORKERS
+            ),
+        )
 
-        rml_file.touch()
-        rml_file.write_text(mapping)
+    def _get_timeout(self) -> float:
+        return max(
+            1.0,
+            self._config_service.get_typed(
+                self.TIMEOUT_CONFIG_KEY, float, self.DEFAULT_TIMEOUT
+            ),
+        )
+
+    def _start_worker(self) -> RMLWorker:
+        assert self.java_path is not None
+        return RMLWorker(
+            RMLWorker.java_command(self.java_path, self.java_memory, self.mapper_bin)
+        )
 
-        rdf_output_file: Path = self.TEMP_DIR / f"rdf_{process_uuid}.ttl"
+    def _get_pool(self) -> RMLWorkerPool | None:
+        if self._pool_disabled:
+            return None
+        workers = self._get_worker_count()
+        with self._lock:
+            if self._pool is None or self._pool.size != workers:
+                if self._pool is not None:
+                    self.logger.info(
+                        f"Worker count changed to {workers}, recreating mapper pool"
+                    )
+                    self._pool.shutdown()
+                self._pool = RMLWorkerPool(workers, self._start_worker)
+            return self._pool
 
-        cmd_rml = (
-            f"java -Xmx{self.java_memory} -jar {self.mapper_bin} -m {rml_file} -o {rdf_output_file} -s"
-            " turtle"
+    def _disable_pool(self, reason: str) -> None:
+        self.logger.warning(
+            f"Mapper workers are not available, falling back to one process per mapping: {reason}"
         )
+        with self._lock:
+            self._pool_disabled = True
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
 
-        self.logger.info(f"Executing command: {cmd_rml}")
+    def _run_process(
+        self,
+        rml_file: Path,
+        rdf_output_file: Path,
+        serialization: str,
+        timeout: float,
+    ) -> None:
+        assert self.java_path is not None
+        cmd_rml = [
+            self.java_path,
+            f"-Xmx{self.java_memory}",
+            "-jar",
+            str(self.mapper_bin),
+            "-m",
+            str(rml_file),
+            "-o",
+            str(rdf_output_file),
+            "-s",
+            serialization,
+        ]
+
+        self.logger.info(f"Executing command: {' '.join(cmd_rml)}")
 
         try:
             result = subprocess.run(
                 cmd_rml,
-                shell=True,
                 capture_output=True,
                 text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise ServerException(
+                f"RML mapping timed out after {timeout} seconds",
+                ErrCodes.RML_MAPPING_TIMEOUT,
+            )
+
+        if result.returncode != 0:
+            self.logger.error(f"Error executing RML mapping: {result.stderr}")
+            raise ServerException(
+                f"Error executing RML mapping: {result.stderr}",
+                ErrCodes.RML_MAPPING_EXECUTION_ERROR,
             )
 
-            if result.returncode != 0:
-                self.logger.error(f"Error executing RML mapping: {result.stderr}")
+    def _run_mapping(
+        self,
+        rml_file: Path,
+        rdf_output_file: Path,
+        serialization: str,
+    ) -> None:
+        timeout = self._get_timeout()
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                pool.run(rml_file, rdf_output_file, serialization, timeout)
+                return
+            except RMLWorkerStartError as e:
+                self._disable_pool(str(e))
+            except TimeoutError:
+                raise ServerException(
+                    f"RML mapping timed out after {timeout} seconds",
+                    ErrCodes.RML_MAPPING_TIMEOUT,
+                )
+            except RMLWorkerError as e:
+                self.logger.error(f"Error executing RML mapping: {e}")
                 raise ServerException(
-                    f"Error executing RML mapping: {result.stderr}",
+                    f"Error executing RML mapping: {e}",
                     ErrCodes.RML_MAPPING_EXECUTION_ERROR,
                 )
+        self._run_process(rml_file, rdf_output_file, serialization, timeout)
+
+    def execute_rml_mapping(
+        self,
+        mapping: str,
+        serialization: str = "turtle",
+        partition_rows: int | None = None,
+    ) -> Path:
+        if serialization not in self.SERIALIZATIONS:
+            raise ServerException(
+                f"Unsupported serialization {serialization}",
+                ErrCodes.RML_MAPPING_INVALID_SERIALIZATION,
+            )
+        if self.java_path is None:
+            raise ServerException(
+                "Java not found, RML mappings can not be executed",
+                ErrCodes.RML_MAPPING_EXECUTION_ERROR,
+            )
+        self.logger.info("Executing RML mapping")
+        self.logger.info("Writing RML mapping to temp file")
+        process_uuid = uuid4().hex
+        rml_file = self._temp_file_service.create_file(f"rml_{process_uuid}.ttl")
+
+        rml_file.touch()
+        rml_file.write_text(mapping)
+
+        rdf_output_file = self._temp_file_service.create_file(
+            f"rdf_{process_uuid}.{self.SERIALIZATIONS[serialization]}"
+        )
+
+        sources: list[Path] = []
+        try:
+            rml = Graph()
+            rml.parse(data=mapping, format="turtle")
+            sources = self._hold_sources(rml)
+            if not (
+                partition_rows
+                and serialization == "nquads"
+                and self._run_partitioned(
+                    rml, process_uuid, rdf_output_file, partition_rows
+                )
+            ):
+                self._run_mapping(rml_file, rdf_output_file, serialization)
 
             self.logger.info("RML mapping executed successfully")
 
-            return rdf_output_file.read_text()
+            return rdf_output_file
 
         except Exception as e:
+            self._temp_file_service.release(rdf_output_file)
+            if isinstance(e, ServerException):
+                raise
             self.logger.error(f"Error executing RML mapping: {e}")
             raise ServerException(
                 f"Error executing RML mapping: {e}",
                 ErrCodes.RML_MAPPING_EXECUTION_ERROR,
             )
+        finally:
+            self._temp_file_service.release(rml_file)
+            for source in sources:
+                self._temp_file_service.release(source, keep=True)
+
+    def _hold_sources(self, rml: Graph) -> list[Path]:
+        # Mappings generated from YARRRML read links to stored files that are
+        # named <file uuid>.<extension> in the temp directory. They are held
+        # while the mapper runs, and linked again when they were evicted since
+        # the YARRRML was generated.
+        sources: list[Path] = []
+        for source in set(rml.objects(None, RML.source)):
+            if not isinstance(source, Literal):
+                continue
+            path = Path(str(source)).absolute()
+            if path.parent != self._temp_dir:
+                continue
+            self._temp_file_service.acquire(path)
+            sources.append(path)
+            if path.exists():
+                continue
+            try:
+                self._fs_service.link_file_with_uuid(path.stem, path)
+                self.logger.info(f"Linked evicted source {path} again")
+            except ServerException as e:
+                if e.code != ErrCodes.FILE_NOT_FOUND:
+                    raise
+        return sources
+
+    def _run_partitioned(
+        self,
+        rml: Graph,
+        process_uuid: str,
+        rdf_output_file: Path,
+        partition_rows: int,
+    ) -> bool:
+        source = RMLPartitioner.find_partitionable_source(rml)
+        if source is None:
+            self.logger.info("Mapping can not be partitioned, running it at once")
+            return False
+
+        partition_dir = self._temp_file_service.create_file(
+            f"partitions_{process_uuid}"
+        )
+        partition_dir.mkdir()
+        try:
+            partitions = RMLPartitioner.split_csv(
+                Path(source), partition_dir, partition_rows
+            )
+            if len(partitions) < 2:
+                self.logger.info("Source fits in one partition, running it at once")
+                return False
+
+            self.logger.info(
+                f"Running mapping over {len(partitions)} partitions of {source}"
+            )
+            outputs: list[Path] = []
+            jobs: list[tuple[Path, Path]] = []
+            for index, partition in enumerate(partitions):
+                partition_rml_file = partition_dir / f"rml_{index}.ttl"
+                RMLPartitioner.write_partition_mapping(
+                    rml, source, partition, partition_rml_file
+                )
+                output = partition_dir / f"rdf_{index}.nq"
+                outputs.append(output)
+                jobs.append((partition_rml_file, output))
+
+            # Partitions are queued on the mapper pool, which bounds how many
+            # of them run at once
+            with ThreadPoolExecutor(
+                max_workers=min(len(jobs), self._get_worker_count()),
+                thread_name_prefix="rml-partition",
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._run_mapping, partition_rml_file, output, "nquads"
+                    )
+                    for partition_rml_file, output in jobs
+                ]
+                # Progress is reported from the calling thread, which is the
+                # one running the job
+                for done, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+                    self._job_service.report_progress(
+                        done / len(futures),
+                        f"Mapped {done} of {len(futures)} partitions",
+                    )
+
+            lines = RMLPartitioner.merge_nquads(outputs, rdf_output_file)
+            self.logger.info(f"Merged partition outputs into {lines} lines")
+            return True
+        finally:
+            self._temp_file_service.release(partition_dir)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            pool = self._pool
+            pool_disabled = self._pool_disabled
+        if pool is None:
+            stats = RMLWorkerPoolStats(
+                size=self._get_worker_count(),
+                workers=0,
+                busy=0,
+                queued=0,
+                completed=0,
+                failed=0,
+                timeouts=0,
+                restarts=0,
+                avg_wait_seconds=0.0,
+                avg_run_seconds=0.0,
+            )
+        else:
+            stats = pool.stats()
+        return {**stats.to_dict(), "pooled": not pool_disabled}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self.logger.info("Shutting down mapper pool")
+                self._pool.shutdown()
+                self._pool = None
+
+
+__all__ = ["RMLMapperService"]
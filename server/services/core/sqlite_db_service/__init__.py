@@ -1,9 +1,10 @@
 from pathlib import Path
 
 from kink import inject
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event, inspect, make_url, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
 
 from server.service_protocols.db_service_protocol import (
     DBServiceProtocol,
@@ -14,6 +15,14 @@ from server.services.core.sqlite_db_service.tables import *  # noqa: F403
 
 @inject(alias=DBServiceProtocol)
 class DBService(DBServiceProtocol):
+    # Seconds a connection waits for a lock held by another connection
+    BUSY_TIMEOUT = 30
+    # Bytes of the database file read through memory mapping
+    MMAP_SIZE = 256 * 1024 * 1024
+    # Connections kept open, and opened on top of them under load
+    POOL_SIZE = 8
+    MAX_OVERFLOW = 32
+
     def __init__(
         self,
         APP_DIR: Path,
@@ -21,26 +30,88 @@ class DBService(DBServiceProtocol):
         self._db_path = f"sqlite:///{(APP_DIR / 'db.sqlite').absolute()}"
         if not APP_DIR.exists():
             APP_DIR.mkdir()
-        self._engine = create_engine(
-            f"{self._db_path}",
-        )
-        Base.metadata.create_all(self._engine)
+        self._setup(self._db_path)
 
     @classmethod
     def from_connection_string(cls, connection_string: str):
         db_service = cls.__new__(cls)
         db_service._db_path = connection_string
-        db_service._engine = create_engine(
-            connection_string,
-        )
-        Base.metadata.create_all(db_service._engine)
+        db_service._setup(connection_string)
         return db_service
 
+    def _setup(self, connection_string: str):
+        self._engine = self._create_engine(connection_string)
+        self._session_factory = sessionmaker(bind=self._engine)
+        self._create_tables()
+
+    @classmethod
+    def _create_engine(cls, connection_string: str) -> Engine:
+        url = make_url(connection_string)
+        in_memory = url.database in (None, "", ":memory:")
+        engine = create_engine(
+            url,
+            # Sessions are used from the threads of the server and of jobs,
+            # a connection is only used by one thread at a time
+            connect_args={"check_same_thread": False},
+            # In-memory databases keep their default pool, every connection
+            # to them would open a new empty database
+            **(
+                {}
+                if in_memory
+                else {
+                    "poolclass": QueuePool,
+                    "pool_size": cls.POOL_SIZE,
+                    "max_overflow": cls.MAX_OVERFLOW,
+                }
+            ),
+        )
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                if not in_memory:
+                    # Readers do not block the writer and the other way around
+                    cursor.execute("PRAGMA journal_mode=WAL")
+                    cursor.execute(f"PRAGMA mmap_size={cls.MMAP_SIZE}")
+                # Durable at checkpoints, which is enough in WAL mode
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute(f"PRAGMA busy_timeout={cls.BUSY_TIMEOUT * 1000}")
+            finally:
+                cursor.close()
+
+        return engine
+
+    def _create_tables(self):
+        Base.metadata.create_all(self._engine)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        # create_all does not alter existing tables, columns added to a table
+        # after its creation are added here. Only nullable columns without
+        # constraints can be added this way.
+        inspector = inspect(self._engine)
+        with self._engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing_columns = {
+                    column["name"] for column in inspector.get_columns(table.name)
+                }
+                for column in table.columns:
+                    if column.name in existing_columns:
+                        continue
+                    column_type = column.type.compile(dialect=self._engine.dialect)
+                    connection.execute(
+                        text(
+                            f'ALTER TABLE "{table.name}" '
+                            f'ADD COLUMN "{column.name}" {column_type}'
+                        )
+                    )
+
     def get_engine(self) -> Engine:
         return self._engine
 
     def get_session(self) -> Session:
-        return sessionmaker(bind=self._engine)()
+        return self._session_factory()
 
     def dispose(self):
         self._engine.dispose()
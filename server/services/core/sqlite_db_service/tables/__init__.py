@@ -4,16 +4,32 @@ from server.services.core.sqlite_db_service.tables.config import (
 from server.services.core.sqlite_db_service.tables.file_metadata import (
     FileMetadataTable,
 )
+from server.services.core.sqlite_db_service.tables.job import (
+    JobStatus,
+    JobTable,
+)
 from server.services.core.sqlite_db_service.tables.ontology import (
     OntologyTable,
 )
+from server.services.core.sqlite_db_service.tables.ontology_index_cache import (
+    OntologyIndexCacheTable,
+)
+from server.services.core.sqlite_db_service.tables.ontology_term import (
+    ONTOLOGY_TERM_FTS_TABLE,
+    OntologyTermTable,
+)
 from server.services.core.sqlite_db_service.tables.workspace_metadata import (
     WorkspaceMetadataTable,
 )
 
 __all__ = [
+    "ONTOLOGY_TERM_FTS_TABLE",
     "ConfigTable",
-    "WorkspaceMetadataTable",
     "FileMetadataTable",
+    "JobStatus",
+    "JobTable",
+    "OntologyIndexCacheTable",
     "OntologyTable",
+    "OntologyTermTable",
+    "WorkspaceMetadataTable",
 ]
@@ -14,9 +14,10 @@ class FileMetadataTable(Base):
     stem: Mapped[str] = mapped_column(String)
     suffix: Mapped[str] = mapped_column(String)
     hash: Mapped[str] = mapped_column(String, index=True)
+    format: Mapped[str | None] = mapped_column(String, nullable=True)
 
     def __repr__(self):
-        return f"<FileMetadata(uuid={self.uuid}, name={self.name}, stem={self.stem}, suffix={self.suffix}, hash={self.hash})>"
+        return f"<FileMetadata(uuid={self.uuid}, name={self.name}, stem={self.stem}, suffix={self.suffix}, hash={self.hash}, format={self.format})>"
 
     def __str__(self):
         return self.__repr__()
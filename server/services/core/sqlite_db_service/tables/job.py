@@ -0,0 +1,57 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobTable(Base):
+    """
+    Table for background jobs.
+
+    Attributes:
+        - uuid - str
+        - type - str - kind of work, e.g. create_ontology
+        - status - JobStatus
+        - progress - float - between 0 and 1
+        - message - str - last progress message, or the error of a failed job
+        - err_code - int - error code of a failed job
+        - result - str - JSON of the result of a succeeded job
+        - result_path - str - file produced by a succeeded job
+        - created_at - datetime
+        - updated_at - datetime
+    """
+
+    __tablename__ = "job"
+
+    uuid: Mapped[str] = mapped_column(String, primary_key=True)
+    type: Mapped[str] = mapped_column(String)
+    status: Mapped[JobStatus] = mapped_column(String, index=True)
+    progress: Mapped[float] = mapped_column(Float, default=0.0)
+    message: Mapped[str | None] = mapped_column(String, nullable=True)
+    err_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)
+    result_path: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+    def __repr__(self):
+        return f"<Job(uuid={self.uuid}, type={self.type}, status={self.status}, progress={self.progress})>"
+
+    def __str__(self):
+        return self.__repr__()
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from server.services.core.sqlite_db_service.base import (
@@ -13,6 +13,12 @@ class OntologyTable(Base):
     name: Mapped[str] = mapped_column(String)
     json_file_uuid: Mapped[str] = mapped_column(String)
     ontology_file_uuid: Mapped[str] = mapped_column(String)
+    # Number of rows in ontology_term, None until the terms are stored
+    term_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Copied from the JSON file so summaries are read without it, None for
+    # ontologies created before these columns
+    description: Mapped[str | None] = mapped_column(String, nullable=True)
+    base_uri: Mapped[str | None] = mapped_column(String, nullable=True)
 
     def to_dict(self):
         return {
@@ -20,6 +26,9 @@ class OntologyTable(Base):
             "name": self.name,
             "json_file_uuid": self.json_file_uuid,
             "ontology_file_uuid": self.ontology_file_uuid,
+            "term_count": self.term_count,
+            "description": self.description,
+            "base_uri": self.base_uri,
         }
 
     @classmethod
@@ -29,4 +38,7 @@ class OntologyTable(Base):
             name=data["name"],
             json_file_uuid=data["json_file_uuid"],
             ontology_file_uuid=data["ontology_file_uuid"],
+            term_count=data.get("term_count"),
+            description=data.get("description"),
+            base_uri=data.get("base_uri"),
         )
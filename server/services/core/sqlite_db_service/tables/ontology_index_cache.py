@@ -0,0 +1,29 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class OntologyIndexCacheTable(Base):
+    """
+    Table for cached ontology indexes, keyed by the content of the ontology file.
+
+    Attributes:
+        - content_hash - str - sha1 of the ontology file
+        - indexer_version - int - version of the indexer that produced the index
+        - index_file_uuid - str - file containing the JSON of the index
+    """
+
+    __tablename__ = "ontology_index_cache"
+
+    content_hash: Mapped[str] = mapped_column(String, primary_key=True)
+    indexer_version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    index_file_uuid: Mapped[str] = mapped_column(String)
+
+    def __repr__(self):
+        return f"<OntologyIndexCache(content_hash={self.content_hash}, indexer_version={self.indexer_version}, index_file_uuid={self.index_file_uuid})>"
+
+    def __str__(self):
+        return self.__repr__()
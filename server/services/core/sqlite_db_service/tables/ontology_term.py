@@ -0,0 +1,84 @@
+from sqlalchemy import DDL, Boolean, Index, Integer, String, Text, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class OntologyTermTable(Base):
+    """
+    Table for the classes, properties and individuals of indexed ontologies.
+    Rows are mirrored into the `ontology_term_fts` FTS5 table by triggers.
+
+    Attributes:
+        - id - int - rowid of the term, also the rowid of its full text entry
+        - ontology_uuid - str - ontology the term belongs to
+        - term_type - str - class, property or individual
+        - full_uri - str
+        - local_name - str - fragment or last path segment of the URI
+        - label - str - all labels, separated by new lines
+        - description - str - all descriptions, separated by new lines
+        - is_deprecated - bool
+        - data - str - JSON of the term model
+    """
+
+    __tablename__ = "ontology_term"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ontology_uuid: Mapped[str] = mapped_column(String)
+    term_type: Mapped[str] = mapped_column(String)
+    full_uri: Mapped[str] = mapped_column(String)
+    local_name: Mapped[str] = mapped_column(String)
+    label: Mapped[str] = mapped_column(Text)
+    description: Mapped[str] = mapped_column(Text)
+    is_deprecated: Mapped[bool] = mapped_column(Boolean, default=False)
+    data: Mapped[str] = mapped_column(Text)
+
+    __table_args__ = (
+        Index("ix_ontology_term_ontology_type", "ontology_uuid", "term_type", "id"),
+    )
+
+    def __repr__(self):
+        return f"<OntologyTerm(id={self.id}, ontology_uuid={self.ontology_uuid}, term_type={self.term_type}, full_uri={self.full_uri})>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+ONTOLOGY_TERM_FTS_TABLE = "ontology_term_fts"
+
+# External content FTS5 index over the text columns of ontology_term, kept in
+# sync by triggers. Prefix indexes make short autocomplete prefixes cheap.
+_ONTOLOGY_TERM_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {ONTOLOGY_TERM_FTS_TABLE} USING fts5(
+        local_name, label, description,
+        content='ontology_term', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2", prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS ontology_term_ai AFTER INSERT ON ontology_term
+    BEGIN
+        INSERT INTO {ONTOLOGY_TERM_FTS_TABLE}(rowid, local_name, label, description)
+        VALUES (new.id, new.local_name, new.label, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS ontology_term_ad AFTER DELETE ON ontology_term
+    BEGIN
+        INSERT INTO {ONTOLOGY_TERM_FTS_TABLE}(
+            {ONTOLOGY_TERM_FTS_TABLE}, rowid, local_name, label, description
+        )
+        VALUES ('delete', old.id, old.local_name, old.label, old.description);
+    END
+    """,
+]
+
+for _statement in _ONTOLOGY_TERM_FTS_DDL:
+    event.listen(
+        OntologyTermTable.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,183 @@
+import logging
+import os
+import shutil
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from kink import inject
+
+from server.service_protocols.config_service_protocol import (
+    ConfigServiceProtocol,
+)
+from server.service_protocols.temp_file_service_protocol import (
+    TempFileServiceProtocol,
+)
+
+
+@dataclass
+class _TempFile:
+    refs: int
+    last_used: float
+
+
+@inject(alias=TempFileServiceProtocol)
+class TempFileService(TempFileServiceProtocol):
+    QUOTA_CONFIG_KEY = "temp_quota_mb"
+    DEFAULT_QUOTA_MB = 2048
+    MAX_AGE_CONFIG_KEY = "temp_max_age_hours"
+    DEFAULT_MAX_AGE_HOURS = 24
+
+    def __init__(self, config_service: ConfigServiceProtocol, TEMP_DIR: Path):
+        self.logger = logging.getLogger(__name__)
+        self._config_service = config_service
+        self.temp_dir = TEMP_DIR.absolute()
+        self._lock = threading.Lock()
+        # Files created or used since startup, files missing here have no references
+        self._files: dict[Path, _TempFile] = {}
+
+        self.logger.info("TempFileService initialized")
+
+    def _get_number(self, key: str, default: float) -> float:
+        return max(0.0, self._config_service.get_typed(key, float, default))
+
+    def _key(self, path: Path) -> Path | None:
+        path = path.absolute()
+        if path.parent != self.temp_dir:
+            return None
+        return path
+
+    def create_file(self, name: str) -> Path:
+        path = self.temp_dir / name
+        with self._lock:
+            temp_file = self._files.get(path)
+            if temp_file is None:
+                self._files[path] = _TempFile(refs=1, last_used=time.time())
+            else:
+                temp_file.refs += 1
+                temp_file.last_used = time.time()
+        return path
+
+    def acquire(self, path: Path) -> None:
+        key = self._key(path)
+        if key is None:
+            return
+        with self._lock:
+            temp_file = self._files.setdefault(key, _TempFile(refs=0, last_used=0))
+            temp_file.refs += 1
+            temp_file.last_used = time.time()
+
+    def release(self, path: Path, keep: bool = False) -> None:
+        key = self._key(path)
+        if key is None:
+            return
+        with self._lock:
+            temp_file = self._files.get(key)
+            if temp_file is not None:
+                temp_file.refs = max(0, temp_file.refs - 1)
+                temp_file.last_used = time.time()
+                if temp_file.refs > 0:
+                    return
+            if not keep:
+                self._files.pop(key, None)
+                self._delete(key)
+                return
+        self.enforce_quota()
+
+    def _delete(self, path: Path) -> bool:
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                try:
+                    path.unlink(missing_ok=True)
+                except PermissionError:
+                    # Windows does not delete read-only files, like linked sources
+                    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+                    path.unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Failed to delete temporary file {path}: {e}")
+            return False
+
+    def _unreferenced(self) -> list[tuple[float, int, Path]]:
+        # (last use, size, path) of entries without references, caller holds the lock
+        entries = []
+        for entry in os.scandir(self.temp_dir):
+            path = Path(entry.path)
+            temp_file = self._files.get(path)
+            if temp_file is not None and temp_file.refs > 0:
+                continue
+            try:
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            last_used = max(
+                entry_stat.st_mtime,
+                temp_file.last_used if temp_file is not None else 0,
+            )
+            entries.append((last_used, self._disk_size(entry_stat), path))
+        return entries
+
+    @staticmethod
+    def _disk_size(file_stat: os.stat_result) -> int:
+        # Hard links to stored files take no space of their own, they count
+        # once the stored file is gone
+        return file_stat.st_size if file_stat.st_nlink <= 1 else 0
+
+    def enforce_quota(self) -> int:
+        quota = (
+            self._get_number(self.QUOTA_CONFIG_KEY, self.DEFAULT_QUOTA_MB) * 1024 * 1024
+        )
+        evicted = 0
+        with self._lock:
+            if not self.temp_dir.exists():
+                return 0
+            referenced_size = 0
+            for path, temp_file in self._files.items():
+                if temp_file.refs > 0 and path.is_file():
+                    referenced_size += self._disk_size(path.stat())
+            entries = sorted(
+                (entry for entry in self._unreferenced() if entry[2].is_file()),
+                reverse=True,
+            )
+            size = referenced_size + sum(entry[1] for entry in entries)
+            while size > quota and entries:
+                _, file_size, path = entries.pop()
+                if self._delete(path):
+                    self._files.pop(path, None)
+                    size -= file_size
+                    evicted += 1
+        if evicted:
+            self.logger.info(f"Evicted {evicted} temporary files to fit the quota")
+        return evicted
+
+    def sweep(self, max_age: float | None = None) -> int:
+        if max_age is None:
+            max_age = (
+                self._get_number(self.MAX_AGE_CONFIG_KEY, self.DEFAULT_MAX_AGE_HOURS)
+                * 3600
+            )
+        deleted = 0
+        with self._lock:
+            if not self.temp_dir.exists():
+                return 0
+            threshold = time.time() - max_age
+            for last_used, _, path in self._unreferenced():
+                if last_used <= threshold and self._delete(path):
+                    self._files.pop(path, None)
+                    deleted += 1
+            # Forget unreferenced files that were deleted by other means
+            for path in [
+                path
+                for path, temp_file in self._files.items()
+                if temp_file.refs == 0 and not path.exists()
+            ]:
+                del self._files[path]
+        self.logger.info(f"Swept {deleted} temporary files")
+        return deleted
+
+
+__all__ = ["TempFileService"]
@@ -1,13 +1,20 @@
 import logging
+import mmap
+import os
+import shutil
+import stat
 import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from hashlib import sha1
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO
 from uuid import uuid4
 
 from kink import inject
-from sqlalchemy import delete, select
-from sqlalchemy.engine.row import Row
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm.session import Session
 
 from server.const.err_enums import ErrCodes
 from server.exceptions import ServerException
@@ -18,127 +25,322 @@ from server.service_protocols.fs_service_protocol import (
 )
 from server.services.core.sqlite_db_service import DBService
 
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _unlink(path: Path) -> None:
+    # Windows does not delete read-only files, linked blobs are read-only
+    try:
+        path.unlink(missing_ok=True)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        path.unlink(missing_ok=True)
+
 
 @inject(alias=FSServiceProtocol)
 class LocalFSService(FSServiceProtocol):
+    # Contents are stored once per hash under files/blobs. Every file UUID is
+    # a metadata row pointing to a blob by its hash, so the number of rows
+    # with a hash is the reference count of the blob.
+    # Bytes read from upload streams at once
+    CHUNK_SIZE = 1024 * 1024
+    # UUIDs bound to a single IN query, SQLite limits the number of
+    # parameters of a statement
+    QUERY_BATCH_SIZE = 500
+    # Files read at once by bulk downloads
+    READ_WORKERS = 8
+
     def __init__(self, APP_DIR: Path, db_service: DBService):
         self.logger = logging.getLogger(__name__)
         self._FILE_DIR = APP_DIR / "files"
+        self._BLOB_DIR = self._FILE_DIR / "blobs"
         self._db_service = db_service
+        self._lock = threading.Lock()
         self.mutexes: dict[str, threading.Lock] = {}
         if not self._FILE_DIR.exists():
             self.logger.info(
                 f"File directory {self._FILE_DIR} does not exist. Creating..."
             )
             self._FILE_DIR.mkdir()
+        self._BLOB_DIR.mkdir(exist_ok=True)
+        self._migrate_files()
 
         self.logger.info(
             f"LocalFSService initialized with file directory {self._FILE_DIR}"
         )
 
+    def _mutex(self, key: str) -> threading.Lock:
+        with self._lock:
+            if key not in self.mutexes:
+                self.mutexes[key] = threading.Lock()
+            return self.mutexes[key]
+
+    def _blob_path(self, file_hash: str) -> Path:
+        return self._BLOB_DIR / file_hash
+
+    def _migrate_files(self) -> None:
+        # Files used to be stored under their UUID, they are moved to the blob
+        # store and identical contents are stored once
+        for partial in self._BLOB_DIR.glob("*.tmp"):
+            partial.unlink(missing_ok=True)
+        files = [path for path in self._FILE_DIR.iterdir() if path.is_file()]
+        if not files:
+            return
+        self.logger.info(f"Moving {len(files)} files to the blob store")
+        with self._db_service.get_session() as session:
+            for path in files:
+                row = session.get(FileMetadataTable, path.name)
+                if row is None:
+                    self.logger.warning(f"File {path.name} has no metadata, skipping")
+                    continue
+                file_hash = sha1()
+                with open(path, "rb") as f:
+                    while chunk := f.read(self.CHUNK_SIZE):
+                        file_hash.update(chunk)
+                row.hash = file_hash.hexdigest()
+                blob_path = self._blob_path(row.hash)
+                if blob_path.exists():
+                    path.unlink()
+                else:
+                    os.replace(path, blob_path)
+            session.commit()
+
+    def _write_blob(self, file_hash: str, content: bytes) -> None:
+        # Caller holds the mutex of the hash
+        blob_path = self._blob_path(file_hash)
+        if blob_path.exists():
+            self.logger.info(f"Blob {file_hash} already stored")
+            return
+        partial = self._BLOB_DIR / f"{file_hash}.{uuid4().hex}.tmp"
+        try:
+            partial.write_bytes(content)
+            os.replace(partial, blob_path)
+        except Exception:
+            partial.unlink(missing_ok=True)
+            raise
+
+    def _move_blob(self, file_hash: str, partial: Path) -> None:
+        # Caller holds the mutex of the hash
+        blob_path = self._blob_path(file_hash)
+        if blob_path.exists():
+            self.logger.info(f"Blob {file_hash} already stored")
+            return
+        os.replace(partial, blob_path)
+
+    def _release_blob(self, session: Session, file_hash: str) -> None:
+        # Caller holds the mutex of the hash
+        references = session.scalar(
+            select(func.count())
+            .select_from(FileMetadataTable)
+            .where(FileMetadataTable.hash == file_hash)
+        )
+        if not references:
+            self.logger.info(f"Blob {file_hash} is no longer referenced, deleting")
+            _unlink(self._blob_path(file_hash))
+
+    def _get_row(self, session: Session, uuid: str) -> FileMetadataTable:
+        query = (
+            select(FileMetadataTable).filter(FileMetadataTable.uuid == uuid).limit(1)
+        )
+        row = session.scalars(query).first()
+
+        if row is None:
+            raise ServerException(
+                f"File with UUID {uuid} does not exist",
+                code=ErrCodes.FILE_NOT_FOUND,
+            )
+        return row
+
+    def _save_file(
+        self,
+        name: str,
+        file_hash: str,
+        store_blob: Callable[[], None],
+        uuid: str | None,
+        allow_overwrite: bool,
+        format: str | None,
+    ) -> FileMetadata:
+        file_uuid = uuid if uuid is not None else uuid4().hex
+        stem, suffix = name.rsplit(".", 1) if "." in name else (name, "")
+        model = FileMetadata(
+            uuid=file_uuid,
+            name=name,
+            stem=stem,
+            suffix=suffix,
+            hash=file_hash,
+            format=format,
+        )
+        with self._mutex(file_uuid), self._db_service.get_session() as session:
+            existing = session.get(FileMetadataTable, file_uuid)
+            previous_hash = existing.hash if existing is not None else None
+            if existing is not None and not allow_overwrite:
+                raise ServerException(
+                    f"File with UUID {file_uuid} already exists",
+                    code=ErrCodes.FILE_EXISTS,
+                )
+            with self._mutex(file_hash):
+                store_blob()
+                session.merge(model.to_table())
+                session.commit()
+            if previous_hash is not None and previous_hash != file_hash:
+                with self._mutex(previous_hash):
+                    self._release_blob(session, previous_hash)
+        return model
+
     def upload_file(
         self,
         name: str,
         content: bytes,
         uuid: str | None = None,
         allow_overwrite: bool = False,
+        format: str | None = None,
     ) -> FileMetadata:
         self.logger.info(f"Uploading file {name}")
-        with self._db_service.get_session() as session:
-            file_uuid = uuid if uuid is not None else uuid4().hex
-            if file_uuid not in self.mutexes:
-                self.mutexes[file_uuid] = threading.Lock()
-            with self.mutexes[file_uuid]:
-                file_path = self._FILE_DIR / file_uuid
-                stem, suffix = name.rsplit(".", 1) if "." in name else (name, "")
-                file_hash = sha1(content).hexdigest()
-                if file_path.exists():
-                    if not allow_overwrite:
-                        raise ServerException(
-                            f"File with UUID {file_uuid} already exists",
-                            code=ErrCodes.FILE_EXISTS,
-                        )
-                    file_path.unlink()
-                model = FileMetadata(
-                    uuid=file_uuid,
-                    name=name,
-                    stem=stem,
-                    suffix=suffix,
-                    hash=file_hash,
-                )
-                session.merge(model.to_table())
-                try:
-                    file_path.write_bytes(content)
-                except Exception:
-                    session.rollback()
-                else:
-                    session.commit()
-            return model
-
-    def delete_file_with_uuid(self, uuid: str) -> None:
-        self.logger.info(f"Deleting file with UUID {uuid}")
-
-        query = select(FileMetadataTable).filter(FileMetadataTable.uuid == uuid)
+        file_hash = sha1(content).hexdigest()
+        return self._save_file(
+            name,
+            file_hash,
+            lambda: self._write_blob(file_hash, content),
+            uuid,
+            allow_overwrite,
+            format,
+        )
 
-        delete_query = delete(FileMetadataTable).filter(FileMetadataTable.uuid == uuid)
+    def upload_file_stream(
+        self,
+        name: str,
+        stream: BinaryIO,
+        uuid: str | None = None,
+        allow_overwrite: bool = False,
+        format: str | None = None,
+    ) -> FileMetadata:
+        self.logger.info(f"Uploading file {name} from stream")
+        # The hash is only known once the stream is consumed, the content is
+        # written next to the blobs and moved in place afterwards
+        partial = self._BLOB_DIR / f"{uuid4().hex}.tmp"
+        file_hash = sha1()
+        try:
+            with open(partial, "wb") as f:
+                while chunk := stream.read(self.CHUNK_SIZE):
+                    file_hash.update(chunk)
+                    f.write(chunk)
+            digest = file_hash.hexdigest()
+            return self._save_file(
+                name,
+                digest,
+                lambda: self._move_blob(digest, partial),
+                uuid,
+                allow_overwrite,
+                format,
+            )
+        finally:
+            partial.unlink(missing_ok=True)
 
+    def set_file_format(self, uuid: str, format: str | None) -> None:
+        self.logger.info(f"Setting format of file with UUID {uuid} to {format}")
+        query = (
+            update(FileMetadataTable)
+            .where(FileMetadataTable.uuid == uuid)
+            .values(format=format)
+        )
         with self._db_service.get_session() as session:
-            res = session.execute(query).first()
-
-            if not res:
+            if session.execute(query).rowcount == 0:
                 raise ServerException(
                     f"File with UUID {uuid} does not exist",
                     code=ErrCodes.FILE_NOT_FOUND,
                 )
+            session.commit()
 
-            file_path = self._FILE_DIR / uuid
+    def delete_file_with_uuid(self, uuid: str) -> None:
+        self.logger.info(f"Deleting file with UUID {uuid}")
 
-            if not file_path.exists():
-                raise ServerException(
-                    f"File with UUID {uuid} does not exist",
-                    code=ErrCodes.FILE_NOT_FOUND,
-                )
-            file_path.unlink()
-            session.execute(delete_query)
-            session.commit()
+        delete_query = delete(FileMetadataTable).filter(FileMetadataTable.uuid == uuid)
+
+        with self._mutex(uuid), self._db_service.get_session() as session:
+            file_hash = self._get_row(session, uuid).hash
+
+            with self._mutex(file_hash):
+                session.execute(delete_query)
+                session.commit()
+                self._release_blob(session, file_hash)
 
     def download_file_with_uuid(self, uuid: str) -> bytes:
         self.logger.info(f"Downloading file with UUID {uuid}")
+        return self.provide_file_path_of_uuid(uuid).read_bytes()
 
-        query = (
-            select(FileMetadataTable).filter(FileMetadataTable.uuid == uuid).limit(1)
-        )
-        with self._db_service.get_session() as session:
-            res: Row[Tuple[FileMetadataTable]] | None = session.execute(query).first()
+    def download_files_with_uuids(self, uuids: Iterable[str]) -> dict[str, bytes]:
+        files = self.get_file_metadata_by_uuids(uuids)
+        self.logger.info(f"Downloading {len(files)} files")
+        if not files:
+            return {}
 
-            if not res:
-                raise ServerException(
-                    f"File with UUID {uuid} does not exist",
-                    code=ErrCodes.FILE_NOT_FOUND,
-                )
+        def read(file_hashes: list[str]) -> list[bytes | None]:
+            contents: list[bytes | None] = []
+            for file_hash in file_hashes:
+                try:
+                    contents.append(self._blob_path(file_hash).read_bytes())
+                except FileNotFoundError:
+                    contents.append(None)
+            return contents
 
-            # table_hash = res.tuple()[0].hash
-            file_path = self._FILE_DIR / uuid
-            # if (
-            #     table_hash
-            #     != sha1(file_path.read_bytes()).hexdigest()
-            # ):
-            #     raise ServerException(
-            #         f"File with UUID {uuid} is corrupted, please delete and re-upload",
-            #         code=ErrCodes.FILE_CORRUPTED,
-            #     )
-
-            if not file_path.exists():
-                raise ServerException(
-                    f"File with UUID {uuid} does not exist",
-                    code=ErrCodes.FILE_NOT_FOUND,
-                )
+        # Files are read in one slice per worker, a task per file costs more
+        # than reading a small file
+        file_hashes = [file.hash for file in files.values()]
+        workers = min(len(file_hashes), self.READ_WORKERS)
+        slice_size = -(-len(file_hashes) // workers)
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="fs-read",
+        ) as executor:
+            slices = executor.map(
+                read,
+                [
+                    file_hashes[start : start + slice_size]
+                    for start in range(0, len(file_hashes), slice_size)
+                ],
+            )
+            contents = [content for _slice in slices for content in _slice]
+        return {
+            uuid: content
+            for uuid, content in zip(files, contents)
+            if content is not None
+        }
+
+    def open_file_with_uuid(self, uuid: str) -> BinaryIO:
+        self.logger.info(f"Opening file with UUID {uuid}")
+        return open(self.provide_file_path_of_uuid(uuid), "rb")
 
-        return file_path.read_bytes()
+    @contextmanager
+    def map_file_with_uuid(self, uuid: str) -> Iterator[memoryview]:
+        self.logger.info(f"Mapping file with UUID {uuid}")
+        with open(self.provide_file_path_of_uuid(uuid), "rb") as f:
+            # Empty files can not be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    yield view
+
+    def link_file_with_uuid(self, uuid: str, destination: Path) -> None:
+        self.logger.info(f"Linking file with UUID {uuid} to {destination}")
+        path = self.provide_file_path_of_uuid(uuid)
+        _unlink(destination)
+        try:
+            os.link(path, destination)
+        except OSError as e:
+            # Hard links do not cross file systems, copyfile uses the kernel
+            # copy of the platform where available
+            self.logger.info(f"Hard link failed, copying instead: {e}")
+            shutil.copyfile(path, destination)
+        # A link shares its inode with the blob of every file with this
+        # content, it is made read-only so a write can not change them
+        os.chmod(destination, READ_ONLY)
 
     def provide_file_path_of_uuid(self, uuid: str) -> Path:
         self.logger.info(f"Providing file path of UUID {uuid}")
-        path = self._FILE_DIR / uuid
+        with self._db_service.get_session() as session:
+            path = self._blob_path(self._get_row(session, uuid).hash)
         if not path.exists():
             raise ServerException(
                 f"File with UUID {uuid} does not exist",
@@ -149,19 +351,24 @@ class LocalFSService(FSServiceProtocol):
 
     def get_file_metadata_by_uuid(self, uuid: str) -> FileMetadata:
         self.logger.info(f"Getting file metadata by UUID {uuid}")
-        query = (
-            select(FileMetadataTable).filter(FileMetadataTable.uuid == uuid).limit(1)
-        )
         with self._db_service.get_session() as session:
-            res: Row[Tuple[FileMetadataTable]] | None = session.execute(query).first()
+            return FileMetadata.from_table(self._get_row(session, uuid))
 
-            if not res:
-                raise ServerException(
-                    f"File with UUID {uuid} does not exist",
-                    code=ErrCodes.FILE_NOT_FOUND,
+    def get_file_metadata_by_uuids(
+        self, uuids: Iterable[str]
+    ) -> dict[str, FileMetadata]:
+        uuids = list(dict.fromkeys(uuids))
+        self.logger.info(f"Getting file metadata of {len(uuids)} UUIDs")
+        files: dict[str, FileMetadata] = {}
+        with self._db_service.get_session() as session:
+            for start in range(0, len(uuids), self.QUERY_BATCH_SIZE):
+                batch = uuids[start : start + self.QUERY_BATCH_SIZE]
+                rows = session.scalars(
+                    select(FileMetadataTable).where(FileMetadataTable.uuid.in_(batch))
                 )
-
-            return FileMetadata.from_table(res.tuple()[0])
+                for row in rows:
+                    files[row.uuid] = FileMetadata.from_table(row)
+        return files
 
 
 __all__ = ["LocalFSService"]
@@ -1,5 +1,6 @@
 import json
 import logging
+from hashlib import sha1
 from uuid import uuid4
 
 from kink import inject
@@ -11,19 +12,31 @@ from server.service_protocols.mapping_service_protocol import (
     MappingServiceProtocol,
 )
 from server.services import LocalFSService
+from server.utils.object_cache import ObjectCache
 
 
 @inject(alias=MappingServiceProtocol)
 class LocalMappingService(MappingServiceProtocol):
+    # Number of parsed mappings kept in memory
+    CACHE_SIZE = 64
+
     def __init__(self, fs_service: LocalFSService):
         self.logger = logging.getLogger(__name__)
         self._fs_service: LocalFSService = fs_service
+        # Parsed mappings keyed by uuid and versioned by the hash of their
+        # file, a stale entry is never served
+        self._cache: ObjectCache[MappingGraph] = ObjectCache(self.CACHE_SIZE)
 
         self.logger.info("LocalMappingService initialized")
 
     def get_mapping(self, mapping_id: str) -> MappingGraph:
         self.logger.info(f"Getting mapping {mapping_id}")
         try:
+            file_metadata = self._fs_service.get_file_metadata_by_uuid(mapping_id)
+            cached = self._cache.get(mapping_id, file_metadata.hash)
+            if cached is not None:
+                self.logger.info(f"Mapping {mapping_id} found in cache")
+                return cached
             raw_mapping = self._fs_service.download_file_with_uuid(mapping_id)
         except ServerException as e:
             if e.code == ErrCodes.FILE_NOT_FOUND:
@@ -46,6 +59,7 @@ class LocalMappingService(MappingServiceProtocol):
 
         self.logger.info(f"Mapping {mapping_id} found, parsing")
         mapping = MappingGraph.from_dict(json.loads(raw_mapping.decode("utf-8")))
+        self._cache.put(mapping_id, sha1(raw_mapping).hexdigest(), mapping)
         self.logger.info(f"Mapping {mapping_id} parsed successfully")
         return mapping
 
@@ -62,12 +76,14 @@ class LocalMappingService(MappingServiceProtocol):
             )
 
         self.logger.info(f"Updating mapping {mapping_id}")
-        self._fs_service.upload_file(
+        self._cache.invalidate(mapping_id)
+        file_metadata = self._fs_service.upload_file(
             name=mapping_id,
             content=json.dumps(graph.to_dict()).encode("utf-8"),
             uuid=mapping_id,
             allow_overwrite=True,
         )
+        self._cache.put(mapping_id, file_metadata.hash, graph)
 
         self.logger.info(f"Mapping {mapping_id} updated successfully")
 
@@ -81,13 +97,14 @@ class LocalMappingService(MappingServiceProtocol):
             edges=[],
         )
         self.logger.info(f"Creating mapping {graph.uuid}")
-        self._fs_service.upload_file(
+        file_metadata = self._fs_service.upload_file(
             graph.name,
             json.dumps(graph.to_dict()).encode(
                 "utf-8",
             ),
             graph.uuid,
         )
+        self._cache.put(graph.uuid, file_metadata.hash, graph)
 
         self.logger.info(f"Mapping {graph.uuid} created successfully")
         return graph.uuid
@@ -97,4 +114,5 @@ class LocalMappingService(MappingServiceProtocol):
         self.get_mapping(
             mapping_id
         )  # This will raise an exception if the mapping does not exist
+        self._cache.invalidate(mapping_id)
         self._fs_service.delete_file_with_uuid(mapping_id)
@@ -1,42 +1,101 @@
 import json
 import logging
+import re
+from dataclasses import replace
+from typing import Any, BinaryIO, ClassVar
 from uuid import uuid4
 
 from kink import inject
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, insert, or_, select, text, update
+from sqlalchemy.orm import InstrumentedAttribute
 
 from server.exceptions import ErrCodes, ServerException
 from server.models.file_metadata import FileMetadata
-from server.models.ontology import Ontology
+from server.models.ontology import (
+    Class,
+    Individual,
+    NamedNode,
+    NamedNodeType,
+    Ontology,
+    OntologyIndex,
+    OntologyInput,
+    OntologySummary,
+    OntologyTermPage,
+    Property,
+)
 from server.service_protocols.fs_service_protocol import (
     FSServiceProtocol,
 )
+from server.service_protocols.job_service_protocol import (
+    JobServiceProtocol,
+)
+from server.service_protocols.ontology_indexing_service_protocol import (
+    OntologyIndexingServiceProtocol,
+)
 from server.service_protocols.ontology_service_protocol import (
     OntologyServiceProtocol,
 )
 from server.services.core.sqlite_db_service import (
+    ONTOLOGY_TERM_FTS_TABLE,
     DBService,
+    FileMetadataTable,
+    OntologyIndexCacheTable,
     OntologyTable,
+    OntologyTermTable,
 )
 from server.services.local.local_fs_service import (
     LocalFSService,
 )
 from server.utils.ontology_indexer import OntologyIndexer
-from server.utils.rdf_loader import RDFLoader
 
 
 @inject(alias=OntologyServiceProtocol)
 class LocalOntologyService(OntologyServiceProtocol):
+    TERM_MODELS: ClassVar[dict[str, type[NamedNode]]] = {
+        NamedNodeType.CLASS: Class,
+        NamedNodeType.PROPERTY: Property,
+        NamedNodeType.INDIVIDUAL: Individual,
+    }
+
+    # Fields of term pages, fields with a column of their own are read
+    # without decoding the JSON of the term
+    TERM_FIELDS = (
+        "ontology_uuid",
+        "belongs_to",
+        "type",
+        "full_uri",
+        "label",
+        "description",
+        "is_deprecated",
+        "super_classes",
+        "property_type",
+        "range",
+        "domain",
+    )
+    TERM_COLUMNS: ClassVar[dict[str, InstrumentedAttribute[Any]]] = {
+        "ontology_uuid": OntologyTermTable.ontology_uuid,
+        "type": OntologyTermTable.term_type,
+        "full_uri": OntologyTermTable.full_uri,
+        "is_deprecated": OntologyTermTable.is_deprecated,
+    }
+
+    _SEARCH_TOKEN = re.compile(r"\w+")
+
+    # Raised by indexes that are not JSON or do not load as an OntologyIndex
+    _INDEX_ERRORS = (ValueError, KeyError, TypeError, AttributeError)
+
     def __init__(
         self,
         fs_service: LocalFSService,
-        ontology_indexer: OntologyIndexer,
+        indexing_service: OntologyIndexingServiceProtocol,
         db_service: DBService,
+        job_service: JobServiceProtocol,
     ):
         self.logger = logging.getLogger(__name__)
-        self.ontology_indexer: OntologyIndexer = ontology_indexer
+        self.indexing_service: OntologyIndexingServiceProtocol = indexing_service
         self.fs_service: FSServiceProtocol = fs_service
         self.db_service: DBService = db_service
+        self.job_service: JobServiceProtocol = job_service
 
         self.logger.info("LocalOntologyService initialized")
 
@@ -136,71 +195,581 @@ class LocalOntologyService(OntologyServiceProtocol):
                 ErrCodes.DB_ERROR,
             )
 
+    def get_ontology_summaries(self, ids: list[str]) -> list[OntologySummary]:
+        self.logger.info(f"Getting summaries of ontologies with ids: {ids}")
+        query = select(OntologyTable).where(OntologyTable.uuid.in_(ids))
+        with self.db_service.get_session() as session:
+            rows = {row.uuid: row for row in session.scalars(query)}
+
+        summaries = []
+        for ontology_id in ids:
+            row = rows.get(ontology_id)
+            if row is None:
+                self.logger.error(f"Ontology with id: {ontology_id} not found")
+                raise ServerException(
+                    "Ontology not found",
+                    ErrCodes.ONTOLOGY_NOT_FOUND,
+                )
+            if row.description is None or row.base_uri is None:
+                # Ontologies created before the summary columns read them
+                # from their JSON file once
+                ontology = self.get_ontology(ontology_id)
+                with self.db_service.get_session() as session:
+                    session.execute(
+                        update(OntologyTable)
+                        .where(OntologyTable.uuid == ontology_id)
+                        .values(
+                            description=ontology.description,
+                            base_uri=ontology.base_uri,
+                        )
+                    )
+                    session.commit()
+                description, base_uri = ontology.description, ontology.base_uri
+            else:
+                description, base_uri = row.description, row.base_uri
+            summaries.append(
+                OntologySummary(
+                    uuid=row.uuid,
+                    file_uuid=row.ontology_file_uuid,
+                    name=row.name,
+                    description=description,
+                    base_uri=base_uri,
+                )
+            )
+        return summaries
+
     def create_ontology(
         self,
         name: str,
         description: str,
         base_uri: str,
-        content: bytes,
+        content: bytes | BinaryIO,
+        file_name: str | None = None,
     ) -> Ontology:
-        self.logger.info(f"Creating ontology: {name}")
+        return self.create_ontologies(
+            [
+                OntologyInput(
+                    name=name,
+                    description=description,
+                    base_uri=base_uri,
+                    content=content,
+                    file_name=file_name,
+                )
+            ]
+        )[0]
+
+    def create_ontologies(
+        self,
+        ontologies: list[OntologyInput],
+    ) -> list[Ontology]:
+        self.logger.info(
+            f"Creating ontologies: {[ontology.name for ontology in ontologies]}"
+        )
+        uploaded_files: list[FileMetadata] = []
+        created: list[Ontology] = []
         try:
-            self.logger.info("Parsing ontology content")
-            g = RDFLoader.load_rdf_bytes(content)
-            self.logger.info(f"Indexing ontology: {name}")
+            self.logger.info("Uploading ontology files")
+            for ontology in ontologies:
+                if ontology.file_uuid is not None:
+                    uploaded_files.append(
+                        self.fs_service.get_file_metadata_by_uuid(ontology.file_uuid)
+                    )
+                elif isinstance(ontology.content, bytes):
+                    uploaded_files.append(
+                        self.fs_service.upload_file(
+                            ontology.file_name or ontology.name,
+                            ontology.content,
+                        )
+                    )
+                else:
+                    uploaded_files.append(
+                        self.fs_service.upload_file_stream(
+                            ontology.file_name or ontology.name,
+                            ontology.content,
+                        )
+                    )
 
-            all_classes = self.ontology_indexer.get_classes(base_uri, g)
+            # Uploaded files are hashed with sha1 of their content
+            content_hashes = [file_metadata.hash for file_metadata in uploaded_files]
+            indexes = self._get_cached_indexes(set(content_hashes))
+            self.logger.info(f"Found {len(indexes)} cached ontology indexes")
+
+            to_index: dict[str, OntologyInput] = {}
+            for content_hash, ontology, file_metadata in zip(
+                content_hashes, ontologies, uploaded_files
+            ):
+                if content_hash not in indexes and content_hash not in to_index:
+                    # Workers read the stored file instead of receiving the
+                    # content, line based formats are never fully loaded
+                    to_index[content_hash] = replace(
+                        ontology,
+                        file_path=self.fs_service.provide_file_path_of_uuid(
+                            file_metadata.uuid
+                        ),
+                    )
 
-            all_properties = self.ontology_indexer.get_properties(base_uri, g)
+            # Indexing a content counts as a step, as does saving an ontology
+            steps = len(to_index) + len(ontologies)
+            if to_index:
+                self.logger.info("Parsing and indexing ontology contents")
+                self.job_service.report_progress(
+                    0.0, f"Indexing {len(to_index)} ontology contents"
+                )
+                new_indexes = self.indexing_service.index_ontologies(
+                    list(to_index.values())
+                )
+                self.logger.info("Indexing complete")
+                for content_hash, index in zip(to_index, new_indexes):
+                    indexes[content_hash] = index.to_dict()
+                    self._cache_index(content_hash, indexes[content_hash])
+
+            for content_hash, ontology, file_metadata in zip(
+                content_hashes, ontologies, uploaded_files
+            ):
+                created.append(
+                    self._save_ontology(
+                        ontology,
+                        file_metadata,
+                        self._index_for_base_uri(
+                            indexes[content_hash], ontology.base_uri
+                        ),
+                    )
+                )
+                self.job_service.report_progress(
+                    (len(to_index) + len(created)) / steps,
+                    f"Created ontology {ontology.name}",
+                )
+            return created
+        except Exception as e:
+            self.logger.error(
+                f"Error creating ontology: {e}",
+                exc_info=e,
+            )
+            for file_metadata in uploaded_files[len(created) :]:
+                self._delete_file_if_exists(file_metadata.uuid)
+            raise ServerException(
+                "Error creating ontology",
+                ErrCodes.UNKNOWN_ERROR,
+            )
 
-            all_individuals = self.ontology_indexer.get_individuals(base_uri, g)
+    def get_index_file_uuids(self, content_hashes: list[str]) -> dict[str, str]:
+        query = select(
+            OntologyIndexCacheTable.content_hash,
+            OntologyIndexCacheTable.index_file_uuid,
+        ).where(
+            OntologyIndexCacheTable.content_hash.in_(set(content_hashes)),
+            OntologyIndexCacheTable.indexer_version == OntologyIndexer.VERSION,
+        )
+        with self.db_service.get_session() as session:
+            return {
+                content_hash: index_file_uuid
+                for content_hash, index_file_uuid in session.execute(query).all()
+            }
+
+    def import_index(
+        self, content_hash: str, index: BinaryIO, indexer_version: int
+    ) -> None:
+        if indexer_version != OntologyIndexer.VERSION:
+            self.logger.error(
+                f"Ontology index of {content_hash} was built by indexer version "
+                f"{indexer_version}, expected {OntologyIndexer.VERSION}"
+            )
+            raise ServerException(
+                f"Ontology index of {content_hash} was built by another indexer",
+                ErrCodes.ONTOLOGY_INDEX_INVALID,
+            )
+        if content_hash in self.get_index_file_uuids([content_hash]):
+            self.logger.info(f"Ontology index of {content_hash} is already cached")
+            return
+        self.logger.info(f"Importing ontology index of {content_hash}")
+        index_bytes = index.read()
+        try:
+            self._decode_index(index_bytes)
+        except self._INDEX_ERRORS as e:
+            self.logger.error(f"Ontology index of {content_hash} is invalid: {e}")
+            raise ServerException(
+                f"Ontology index of {content_hash} is invalid",
+                ErrCodes.ONTOLOGY_INDEX_INVALID,
+            ) from e
+        index_file = self.fs_service.upload_file(
+            f"{content_hash}.index.json",
+            index_bytes,
+        )
+        with self.db_service.get_session() as session:
+            session.merge(
+                OntologyIndexCacheTable(
+                    content_hash=content_hash,
+                    indexer_version=OntologyIndexer.VERSION,
+                    index_file_uuid=index_file.uuid,
+                )
+            )
+            session.commit()
+
+    def _decode_index(self, index_bytes: bytes) -> dict:
+        # Indexes are validated by loading them as an OntologyIndex
+        index_data = json.loads(index_bytes.decode("utf-8"))
+        OntologyIndex.from_dict(index_data)
+        return index_data
+
+    def _get_cached_indexes(self, content_hashes: set[str]) -> dict[str, dict]:
+        query = select(OntologyIndexCacheTable).where(
+            OntologyIndexCacheTable.content_hash.in_(content_hashes),
+            OntologyIndexCacheTable.indexer_version == OntologyIndexer.VERSION,
+        )
+        with self.db_service.get_session() as session:
+            cache_entries = [row[0] for row in session.execute(query).all()]
+
+        indexes: dict[str, dict] = {}
+        for cache_entry in cache_entries:
+            try:
+                file_bytes = self.fs_service.download_file_with_uuid(
+                    cache_entry.index_file_uuid
+                )
+            except ServerException as e:
+                if e.code != ErrCodes.FILE_NOT_FOUND:
+                    raise e
+                self.logger.warning(
+                    f"Cached index of {cache_entry.content_hash} is missing, re-indexing"
+                )
+                continue
+            try:
+                indexes[cache_entry.content_hash] = self._decode_index(file_bytes)
+            except self._INDEX_ERRORS as e:
+                self.logger.warning(
+                    f"Cached index of {cache_entry.content_hash} is invalid, "
+                    f"re-indexing: {e}"
+                )
+                self._drop_cache_entry(cache_entry)
+        return indexes
+
+    def _drop_cache_entry(self, cache_entry: OntologyIndexCacheTable) -> None:
+        with self.db_service.get_session() as session:
+            session.execute(
+                delete(OntologyIndexCacheTable).where(
+                    OntologyIndexCacheTable.content_hash == cache_entry.content_hash,
+                    OntologyIndexCacheTable.indexer_version
+                    == cache_entry.indexer_version,
+                )
+            )
+            session.commit()
+        self._delete_file_if_exists(cache_entry.index_file_uuid)
+
+    def _cache_index(self, content_hash: str, index_data: dict) -> None:
+        self.logger.info(f"Caching ontology index of {content_hash}")
+        index_file = self.fs_service.upload_file(
+            f"{content_hash}.index.json",
+            json.dumps(index_data).encode("utf-8"),
+        )
+        with self.db_service.get_session() as session:
+            replaced = session.get(
+                OntologyIndexCacheTable,
+                (content_hash, OntologyIndexer.VERSION),
+            )
+            replaced_file_uuid = replaced.index_file_uuid if replaced else None
+            session.merge(
+                OntologyIndexCacheTable(
+                    content_hash=content_hash,
+                    indexer_version=OntologyIndexer.VERSION,
+                    index_file_uuid=index_file.uuid,
+                )
+            )
+            session.commit()
+        if replaced_file_uuid is not None:
+            self._delete_file_if_exists(replaced_file_uuid)
+
+    def _index_for_base_uri(self, index_data: dict, base_uri: str) -> OntologyIndex:
+        # Cached indexes are shared by every ontology with the same content,
+        # terms are re-attributed to the base URI of the ontology being created
+        index = OntologyIndex.from_dict(index_data)
+        for term in (*index.classes, *index.individuals, *index.properties):
+            term.belongs_to = base_uri
+        return index
+
+    def _collect_index_cache(self) -> None:
+        referenced_hashes = select(FileMetadataTable.hash).join(
+            OntologyTable,
+            OntologyTable.ontology_file_uuid == FileMetadataTable.uuid,
+        )
+        query = select(OntologyIndexCacheTable).where(
+            or_(
+                OntologyIndexCacheTable.indexer_version != OntologyIndexer.VERSION,
+                OntologyIndexCacheTable.content_hash.not_in(referenced_hashes),
+            )
+        )
+        with self.db_service.get_session() as session:
+            stale_entries = [row[0] for row in session.execute(query).all()]
+            for cache_entry in stale_entries:
+                self.logger.info(
+                    f"Removing cached ontology index of {cache_entry.content_hash}"
+                )
+                self._delete_file_if_exists(cache_entry.index_file_uuid)
+                session.delete(cache_entry)
+            session.commit()
 
-            self.logger.info("Indexing complete")
-            self.logger.info("Uploading ontology file")
-            file_metadata = self.fs_service.upload_file(name, content)
-            self.logger.info("File uploaded")
+    def _delete_file_if_exists(self, file_uuid: str) -> None:
+        try:
+            self.fs_service.delete_file_with_uuid(file_uuid)
+        except ServerException as e:
+            if e.code != ErrCodes.FILE_NOT_FOUND:
+                raise e
 
-            ontology = Ontology(
-                uuid=uuid4().hex,
-                file_uuid=file_metadata.uuid,
-                name=name,
-                description=description,
-                base_uri=base_uri,
-                classes=all_classes,
-                individuals=all_individuals,
-                properties=all_properties,
+    def _save_ontology(
+        self,
+        ontology_input: OntologyInput,
+        file_metadata: FileMetadata,
+        index: OntologyIndex,
+    ) -> Ontology:
+        name = ontology_input.name
+        if index.format is not None:
+            self.fs_service.set_file_format(file_metadata.uuid, index.format)
+
+        ontology = Ontology(
+            uuid=uuid4().hex,
+            file_uuid=file_metadata.uuid,
+            name=name,
+            description=ontology_input.description,
+            base_uri=ontology_input.base_uri,
+            classes=index.classes,
+            individuals=index.individuals,
+            properties=index.properties,
+        )
+
+        self.logger.info("Saving ontology to filesystem")
+
+        json_data = ontology.to_dict()
+
+        ontology_json_file = self.fs_service.upload_file(
+            f"{name}.json",
+            json.dumps(json_data).encode("utf-8"),
+        )
+        self.logger.info("Ontology saved to filesystem")
+
+        term_rows = self._term_rows(ontology.uuid, index)
+        with self.db_service.get_session() as session:
+            session.add(
+                OntologyTable(
+                    uuid=ontology.uuid,
+                    name=ontology.name,
+                    json_file_uuid=ontology_json_file.uuid,
+                    ontology_file_uuid=file_metadata.uuid,
+                    term_count=len(term_rows),
+                    description=ontology.description,
+                    base_uri=ontology.base_uri,
+                )
+            )
+            if term_rows:
+                session.execute(insert(OntologyTermTable), term_rows)
+            session.commit()
+
+        return ontology
+
+    @staticmethod
+    def _local_name(full_uri: str) -> str:
+        return re.split(r"[#/:]", full_uri.rstrip("#/"))[-1]
+
+    def _term_rows(self, ontology_uuid: str, index: OntologyIndex) -> list[dict]:
+        return [
+            {
+                "ontology_uuid": ontology_uuid,
+                "term_type": str(term.type),
+                "full_uri": term.full_uri,
+                "local_name": self._local_name(term.full_uri),
+                "label": "\n".join(str(label.value) for label in term.label),
+                "description": "\n".join(
+                    str(description.value) for description in term.description
+                ),
+                "is_deprecated": term.is_deprecated,
+                "data": json.dumps(term.to_dict()),
+            }
+            for term in (*index.classes, *index.properties, *index.individuals)
+        ]
+
+    def _term_from_json(self, data: str) -> NamedNode:
+        term = json.loads(data)
+        return self.TERM_MODELS[term["type"]].from_dict(term)
+
+    def _store_missing_terms(self, ids: list[str]) -> None:
+        # Ontologies created before terms were stored in the database only
+        # have their JSON file, their terms are stored the first time they
+        # are queried
+        query = select(OntologyTable.uuid).where(
+            OntologyTable.uuid.in_(ids),
+            OntologyTable.term_count.is_(None),
+        )
+        with self.db_service.get_session() as session:
+            missing_ids = list(session.execute(query).scalars())
+
+        for ontology_id in missing_ids:
+            self.logger.info(f"Storing terms of ontology {ontology_id}")
+            ontology = self.get_ontology(ontology_id)
+            term_rows = self._term_rows(
+                ontology_id,
+                OntologyIndex(
+                    classes=ontology.classes,
+                    individuals=ontology.individuals,
+                    properties=ontology.properties,
+                ),
             )
+            with self.db_service.get_session() as session:
+                claimed = session.execute(
+                    update(OntologyTable)
+                    .where(
+                        OntologyTable.uuid == ontology_id,
+                        OntologyTable.term_count.is_(None),
+                    )
+                    .values(term_count=len(term_rows))
+                )
+                if claimed.rowcount == 0:
+                    continue
+                if term_rows:
+                    session.execute(insert(OntologyTermTable), term_rows)
+                session.commit()
 
-            self.logger.info("Saving ontology to filesystem")
+    def _decode_cursor(self, cursor: str | None) -> int:
+        if cursor is None:
+            return 0
+        try:
+            return int(cursor)
+        except ValueError:
+            raise ServerException(
+                f"Invalid cursor: {cursor}",
+                ErrCodes.ONTOLOGY_INVALID_CURSOR,
+            )
 
-            json_data = ontology.to_dict()
+    def get_ontology_terms(
+        self,
+        ids: list[str],
+        term_type: NamedNodeType | None = None,
+        fields: list[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 500,
+    ) -> OntologyTermPage:
+        self.logger.info(
+            f"Getting {term_type or 'all'} terms of ontologies: {ids}, cursor: {cursor}"
+        )
+        if fields is not None:
+            unknown_fields = set(fields) - set(self.TERM_FIELDS)
+            if unknown_fields:
+                raise ServerException(
+                    f"Unknown term fields: {sorted(unknown_fields)}",
+                    ErrCodes.ONTOLOGY_INVALID_FIELD,
+                )
+        after_id = self._decode_cursor(cursor)
+        if not ids:
+            return OntologyTermPage(items=[])
+
+        needs_data = fields is None or any(
+            field not in self.TERM_COLUMNS for field in fields
+        )
+        columns = [
+            OntologyTermTable.id,
+            *(column.label(field) for field, column in self.TERM_COLUMNS.items()),
+        ]
+        if needs_data:
+            columns.append(OntologyTermTable.data)
+        query = (
+            select(*columns)
+            .where(
+                OntologyTermTable.ontology_uuid.in_(ids),
+                OntologyTermTable.id > after_id,
+            )
+            .order_by(OntologyTermTable.id)
+            .limit(limit + 1)
+        )
+        if term_type:
+            query = query.where(OntologyTermTable.term_type == str(term_type))
 
-            ontology_json_file = self.fs_service.upload_file(
-                f"{name}.json",
-                json.dumps(json_data).encode("utf-8"),
+        try:
+            self._store_missing_terms(ids)
+            with self.db_service.get_session() as session:
+                rows = session.execute(query).all()
+        except ServerException as e:
+            raise e
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching ontology terms: {e}",
+                exc_info=e,
+            )
+            raise ServerException(
+                "Error fetching ontology terms",
+                ErrCodes.DB_ERROR,
             )
-            self.logger.info("Ontology saved to filesystem")
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return OntologyTermPage(
+            items=[self._project_term(row._mapping, fields) for row in rows],
+            next_cursor=str(rows[-1].id) if has_more else None,
+        )
+
+    def _project_term(self, row, fields: list[str] | None) -> dict:
+        term = json.loads(row["data"]) if "data" in row else {}
+        for field in self.TERM_COLUMNS:
+            term[field] = row[field]
+        if fields is None:
+            return term
+        return {field: term[field] for field in fields if field in term}
+
+    def _fts_query(self, query: str) -> str | None:
+        # Every token of the user input is quoted, so FTS5 operators in the
+        # input are matched literally, and used as a prefix
+        tokens = self._SEARCH_TOKEN.findall(query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def search_terms(
+        self,
+        ids: list[str],
+        query: str,
+        term_type: NamedNodeType | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[NamedNode]:
+        self.logger.info(f"Searching terms matching '{query}' in ontologies: {ids}")
+        fts_query = self._fts_query(query)
+        if fts_query is None or not ids:
+            return []
+
+        try:
+            self._store_missing_terms(ids)
+
+            type_filter = "AND term.term_type = :term_type" if term_type else ""
+            statement = text(
+                f"""
+                SELECT term.data
+                FROM {ONTOLOGY_TERM_FTS_TABLE}
+                JOIN ontology_term AS term ON term.id = {ONTOLOGY_TERM_FTS_TABLE}.rowid
+                WHERE {ONTOLOGY_TERM_FTS_TABLE} MATCH :match
+                    AND term.ontology_uuid IN :ids
+                    {type_filter}
+                ORDER BY bm25({ONTOLOGY_TERM_FTS_TABLE}, 10.0, 5.0, 1.0), term.id
+                LIMIT :limit OFFSET :offset
+                """
+            ).bindparams(bindparam("ids", expanding=True))
+            parameters = {
+                "match": fts_query,
+                "ids": ids,
+                "limit": limit,
+                "offset": offset,
+            }
+            if term_type:
+                parameters["term_type"] = str(term_type)
 
             with self.db_service.get_session() as session:
-                session.add(
-                    OntologyTable(
-                        uuid=ontology.uuid,
-                        name=ontology.name,
-                        json_file_uuid=ontology_json_file.uuid,
-                        ontology_file_uuid=file_metadata.uuid,
-                    )
-                )
-                session.commit()
+                rows = session.execute(statement, parameters).scalars().all()
 
-            return ontology
+            return [self._term_from_json(row) for row in rows]
+        except ServerException as e:
+            raise e
         except Exception as e:
             self.logger.error(
-                f"Error creating ontology: {e}",
+                f"Error searching ontology terms: {e}",
                 exc_info=e,
             )
             raise ServerException(
-                "Error creating ontology",
-                ErrCodes.UNKNOWN_ERROR,
+                "Error searching ontology terms",
+                ErrCodes.DB_ERROR,
             )
 
     def update_ontology(
@@ -228,9 +797,16 @@ class LocalOntologyService(OntologyServiceProtocol):
             self.fs_service.delete_file_with_uuid(ontology_table.ontology_file_uuid)
 
             with self.db_service.get_session() as session:
+                session.execute(
+                    delete(OntologyTermTable).where(
+                        OntologyTermTable.ontology_uuid == ontology_id
+                    )
+                )
                 session.delete(ontology_table)
                 session.commit()
 
+            self._collect_index_cache()
+
             self.logger.info(f"Ontology with id: {ontology_id} deleted")
 
             return None
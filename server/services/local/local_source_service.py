@@ -1,5 +1,6 @@
 import json
 import logging
+from typing import BinaryIO
 from uuid import uuid4
 
 import jsonpath_ng
@@ -62,10 +63,16 @@ class LocalSourceService(SourceServiceProtocol):
         source_file_raw = self.fs_service.download_file_with_uuid(source.file_uuid)
         return source_file_raw
 
-    def adjust_json_source(self, content: bytes, json_path: str) -> bytes:
+    def adjust_json_source(
+        self, content: bytes | memoryview | BinaryIO, json_path: str
+    ) -> bytes:
         try:
             json_path_exp = jsonpath_ng.parse(json_path)
-            json_data = json.loads(content.decode("utf-8"))
+            json_data = (
+                json.loads(str(content, "utf-8"))
+                if isinstance(content, (bytes, memoryview))
+                else json.load(content)
+            )
             # This should match to single array element
             matches = json_path_exp.find(json_data)
             if len(matches) == 0:
@@ -87,26 +94,9 @@ class LocalSourceService(SourceServiceProtocol):
                 ErrCodes.FILE_CORRUPTED,
             )
 
-    def create_source(
-        self,
-        type: SourceType,
-        content: bytes,
-        extra: dict = {},
-    ) -> str:
-        self.logger.info(f"Creating source of type {type}")
-
-        schema_content = content
-
-        if type == SourceType.JSON:
-            if "json_path" not in extra:
-                raise ServerException(
-                    "JSON path is required for JSON source",
-                    ErrCodes.JSON_PATH_NOT_PROVIDED,
-                )
-            schema_content = self.adjust_json_source(content, extra["json_path"])
-
+    def _extract_schema(self, content: bytes | BinaryIO, type: SourceType) -> list[str]:
         try:
-            references = self.schema_extractor.extract_schema(schema_content, type)
+            return self.schema_extractor.extract_schema(content, type)
         except KeyError:
             self.logger.error(
                 f"Unsupported file type {type}",
@@ -124,14 +114,59 @@ class LocalSourceService(SourceServiceProtocol):
                 "Unexpected error",
                 ErrCodes.UNKNOWN_ERROR,
             )
-        self.logger.info(f"Extracted references: {references}")
+
+    def _extract_references(
+        self,
+        type: SourceType,
+        file_uuid: str,
+        extra: dict,
+    ) -> list[str]:
+        if type == SourceType.JSON:
+            # JSON is parsed as a whole, the mapped file is decoded in place
+            # instead of being read into bytes first
+            with self.fs_service.map_file_with_uuid(file_uuid) as view:
+                schema_content = self.adjust_json_source(view, extra["json_path"])
+            return self._extract_schema(schema_content, type)
+
+        with self.fs_service.open_file_with_uuid(file_uuid) as f:
+            return self._extract_schema(f, type)
+
+    def create_source(
+        self,
+        type: SourceType,
+        content: bytes | BinaryIO,
+        extra: dict = {},
+    ) -> str:
+        self.logger.info(f"Creating source of type {type}")
+
+        if type == SourceType.JSON and "json_path" not in extra:
+            raise ServerException(
+                "JSON path is required for JSON source",
+                ErrCodes.JSON_PATH_NOT_PROVIDED,
+            )
+
         source_uuid = str(uuid4())
-        file_metadata = self.fs_service.upload_file(
-            f"{source_uuid}_file",
-            content,
-        )
+        # The content is stored first and its schema is read back from the
+        # stored file, so streamed content is never held in memory
+        if isinstance(content, bytes):
+            file_metadata = self.fs_service.upload_file(
+                f"{source_uuid}_file",
+                content,
+            )
+        else:
+            file_metadata = self.fs_service.upload_file_stream(
+                f"{source_uuid}_file",
+                content,
+            )
         self.logger.info(f"Uploaded file with uuid {file_metadata.uuid}")
 
+        try:
+            references = self._extract_references(type, file_metadata.uuid, extra)
+        except Exception:
+            self.fs_service.delete_file_with_uuid(file_metadata.uuid)
+            raise
+        self.logger.info(f"Extracted references: {references}")
+
         source = Source(
             uuid=source_uuid,
             type=type,
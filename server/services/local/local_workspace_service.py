@@ -1,5 +1,6 @@
 import json
 import logging
+from hashlib import sha1
 
 from kink import inject
 
@@ -9,25 +10,39 @@ from server.service_protocols.workspace_service_protocol import (
     WorkspaceServiceProtocol,
 )
 from server.services import LocalFSService
+from server.utils.object_cache import ObjectCache
 
 
 @inject(alias=WorkspaceServiceProtocol)
 class LocalWorkspaceService(
     WorkspaceServiceProtocol,
 ):
+    # Number of parsed workspaces kept in memory, workspaces are small and
+    # listing them reads every one of them
+    CACHE_SIZE = 1024
+
     def __init__(self, fs_service: LocalFSService):
         self.logger = logging.getLogger(__name__)
         self._fs_service: LocalFSService = fs_service
+        # Parsed workspaces keyed by location and versioned by the hash of
+        # their file, a stale entry is never served
+        self._cache: ObjectCache[WorkspaceModel] = ObjectCache(self.CACHE_SIZE)
 
         self.logger.info("LocalWorkspaceService initialized")
 
     def get_workspace(self, location: str) -> WorkspaceModel:
         self.logger.info(f"Getting workspace at {location}")
         try:
+            file_metadata = self._fs_service.get_file_metadata_by_uuid(location)
+            cached = self._cache.get(location, file_metadata.hash)
+            if cached is not None:
+                return cached
+
             workspace_json_raw = self._fs_service.download_file_with_uuid(location)
             workspace = WorkspaceModel.from_dict(
                 json.loads(workspace_json_raw.decode("utf-8"))
             )
+            self._cache.put(location, sha1(workspace_json_raw).hexdigest(), workspace)
 
             return workspace
         except ServerException as e:
@@ -60,30 +75,72 @@ class LocalWorkspaceService(
                 ErrCodes.UNKNOWN_ERROR,
             )
 
+    def get_workspaces(self, locations: list[str]) -> list[WorkspaceModel]:
+        self.logger.info(f"Getting {len(locations)} workspaces")
+        files = self._fs_service.get_file_metadata_by_uuids(locations)
+        workspaces: dict[str, WorkspaceModel] = {}
+        uncached: list[str] = []
+        for location in locations:
+            file_metadata = files.get(location)
+            if file_metadata is None:
+                self.logger.error(f"Workspace at {location} not found, skipping")
+                continue
+            cached = self._cache.get(location, file_metadata.hash)
+            if cached is not None:
+                workspaces[location] = cached
+            else:
+                uncached.append(location)
+
+        contents = self._fs_service.download_files_with_uuids(uncached)
+        for location in uncached:
+            if location not in contents:
+                self.logger.error(f"Workspace at {location} not found, skipping")
+                continue
+            try:
+                workspace = WorkspaceModel.from_dict(
+                    json.loads(contents[location].decode("utf-8"))
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"Workspace at {location} can not be parsed, skipping",
+                    exc_info=e,
+                )
+                continue
+            self._cache.put(location, sha1(contents[location]).hexdigest(), workspace)
+            workspaces[location] = workspace
+
+        return [
+            workspaces[location] for location in locations if location in workspaces
+        ]
+
     def create_workspace(self, workspace: WorkspaceModel) -> None:
         self.logger.info(f"Creating workspace {workspace.name}")
         if workspace.location == "":
             workspace = workspace.copy_with(location=workspace.uuid)
         workspace_json = json.dumps(workspace.to_dict())
-        self._fs_service.upload_file(
+        file_metadata = self._fs_service.upload_file(
             workspace.name,
             workspace_json.encode("utf-8"),
             workspace.location,
         )
+        self._cache.put(workspace.location, file_metadata.hash, workspace)
         self.logger.info(
             f"Workspace {workspace.name} created with location {workspace.location}"
         )
 
     def update_workspace(self, workspace: WorkspaceModel) -> None:
         workspace_json = json.dumps(workspace.to_dict())
-        self._fs_service.upload_file(
+        self._cache.invalidate(workspace.location)
+        file_metadata = self._fs_service.upload_file(
             workspace.name,
             workspace_json.encode("utf-8"),
             workspace.location,
             allow_overwrite=True,
         )
+        self._cache.put(workspace.location, file_metadata.hash, workspace)
 
     def delete_workspace(self, location: str) -> None:
+        self._cache.invalidate(location)
         try:
             self._fs_service.delete_file_with_uuid(location)
         except ServerException as e:
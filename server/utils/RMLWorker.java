@@ -0,0 +1,83 @@
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * Long lived RMLMapper process, started with the mapper jar on the class path
+ * in source file mode: java -cp mapper.jar RMLWorker.java
+ *
+ * Jobs are read from stdin, one per line:
+ *   <job id> TAB <mapping file> TAB <output file> TAB <serialization>
+ * and answered on stdout with "OK <job id>" or "ERR <job id> <message>".
+ * "PING" is answered with "PONG" and "READY" is written once the mapper is
+ * loaded. Anything the mapper itself prints is redirected to stderr.
+ */
+public class RMLWorker {
+    private static volatile String currentJob = null;
+
+    public static void main(String[] args) throws Exception {
+        PrintStream protocol = new PrintStream(
+            new FileOutputStream(FileDescriptor.out), true, StandardCharsets.UTF_8
+        );
+        System.setOut(System.err);
+
+        Method mapper = Class.forName("be.ugent.rml.cli.Main")
+            .getMethod("main", String[].class);
+
+        // The mapper exits the JVM on some errors, the running job is failed
+        // before the process goes away
+        Runtime.getRuntime().addShutdownHook(new Thread(() -> {
+            String job = currentJob;
+            if (job != null) {
+                protocol.println("ERR " + job + " Mapper exited while running the job");
+            }
+        }));
+
+        BufferedReader reader = new BufferedReader(
+            new InputStreamReader(System.in, StandardCharsets.UTF_8)
+        );
+        protocol.println("READY");
+
+        String line;
+        while ((line = reader.readLine()) != null) {
+            if (line.isEmpty()) {
+                continue;
+            }
+            if (line.equals("PING")) {
+                protocol.println("PONG");
+                continue;
+            }
+            String[] job = line.split("\t", -1);
+            if (job.length != 4) {
+                protocol.println("ERR - Malformed job: " + singleLine(line));
+                continue;
+            }
+
+            currentJob = job[0];
+            String response;
+            try {
+                mapper.invoke(
+                    null,
+                    (Object) new String[] {"-m", job[1], "-o", job[2], "-s", job[3]}
+                );
+                response = "OK " + job[0];
+            } catch (InvocationTargetException e) {
+                Throwable cause = e.getCause() != null ? e.getCause() : e;
+                response = "ERR " + job[0] + " " + singleLine(cause.toString());
+            } catch (Throwable e) {
+                response = "ERR " + job[0] + " " + singleLine(e.toString());
+            }
+            currentJob = null;
+            protocol.println(response);
+        }
+    }
+
+    private static String singleLine(String message) {
+        return message.replace('\r', ' ').replace('\n', ' ');
+    }
+}
@@ -0,0 +1,316 @@
+import os
+import tarfile
+import tempfile
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from typing import BinaryIO, ClassVar
+
+from server.exceptions import ErrCodes, ServerException
+
+try:
+    import zstandard
+except ImportError:  # zstd archives need the zstd extra
+    zstandard = None
+
+
+class ArchiveCodec(StrEnum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+    NONE = "none"
+
+    @property
+    def suffix(self) -> str:
+        return {
+            ArchiveCodec.GZIP: ".tar.gz",
+            ArchiveCodec.ZSTD: ".tar.zst",
+            ArchiveCodec.NONE: ".tar",
+        }[self]
+
+    @property
+    def media_type(self) -> str:
+        return {
+            ArchiveCodec.GZIP: "application/gzip",
+            ArchiveCodec.ZSTD: "application/zstd",
+            ArchiveCodec.NONE: "application/x-tar",
+        }[self]
+
+
+class _Compressor:
+    # Compresses the tar stream and keeps the output until it is drained
+
+    def __init__(self, codec: ArchiveCodec, level: int):
+        self.offset = 0
+        self._chunks: list[bytes] = []
+        self._size = 0
+        if codec == ArchiveCodec.GZIP:
+            # wbits of 31 writes a gzip header and trailer around the deflate data
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif codec == ArchiveCodec.ZSTD:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()  # type: ignore
+        else:
+            self._compressor = None
+
+    def write(self, data: bytes) -> None:
+        self.offset += len(data)
+        chunk = (
+            self._compressor.compress(data) if self._compressor is not None else data
+        )
+        if chunk:
+            self._chunks.append(chunk)
+            self._size += len(chunk)
+
+    def finish(self) -> None:
+        if self._compressor is not None:
+            self._chunks.append(self._compressor.flush())
+
+    def drain(self, min_size: int = 0) -> Iterator[bytes]:
+        if self._size < min_size or not self._chunks:
+            return
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self._size = 0
+        yield data
+
+
+_Member = Callable[[_Compressor], Iterator[None]]
+
+
+class ArchiveStream:
+    """
+    ArchiveStream is a tar archive that is planned member by member and only
+    written while it is iterated, so it can be sent as it is produced without
+    being stored first. Files are opened when their member is reached and
+    copied in chunks.
+
+    Archives are compressed with gzip, zstd (when the zstandard package is
+    installed) or not at all.
+    """
+
+    # Compressed bytes collected before a chunk is yielded, also the size of
+    # the reads from added files
+    CHUNK_SIZE = 64 * 1024
+
+    # Minimum, maximum and default compression level of every codec
+    LEVELS: ClassVar[dict[ArchiveCodec, tuple[int, int, int]]] = {
+        ArchiveCodec.GZIP: (0, 9, 6),
+        ArchiveCodec.ZSTD: (1, 22, 3),
+        ArchiveCodec.NONE: (0, 0, 0),
+    }
+
+    def __init__(
+        self,
+        name: str,
+        codec: ArchiveCodec = ArchiveCodec.GZIP,
+        level: int | None = None,
+    ):
+        """
+        Plan an empty archive
+
+        Parameters:
+            name (str): File name of the archive without its suffix
+            codec (ArchiveCodec): Compression of the archive
+            level (int | None): Compression level, the default of the codec if None
+        """
+        if codec == ArchiveCodec.ZSTD and zstandard is None:
+            raise ServerException(
+                "zstd compression is not available",
+                ErrCodes.ARCHIVE_CODEC_NOT_AVAILABLE,
+            )
+        min_level, max_level, default_level = self.LEVELS[codec]
+        if level is None or codec == ArchiveCodec.NONE:
+            level = default_level
+        if not min_level <= level <= max_level:
+            raise ServerException(
+                f"Compression level of {codec} must be between {min_level} and {max_level}",
+                ErrCodes.ARCHIVE_LEVEL_INVALID,
+            )
+
+        self.codec = codec
+        self.level = level
+        self.filename = f"{name}{codec.suffix}"
+        self.media_type = codec.media_type
+        # Members without a stored timestamp of their own are dated to the
+        # planning of the archive
+        self.mtime = int(time.time())
+        self._members: list[_Member] = []
+
+    def _tarinfo(
+        self, name: str, mode: int, mtime: int | None = None
+    ) -> tarfile.TarInfo:
+        tarinfo = tarfile.TarInfo(name)
+        tarinfo.mode = mode
+        tarinfo.mtime = self.mtime if mtime is None else mtime
+        return tarinfo
+
+    @staticmethod
+    def _header(tarinfo: tarfile.TarInfo) -> bytes:
+        return tarinfo.tobuf(
+            tarfile.DEFAULT_FORMAT, tarfile.ENCODING, "surrogateescape"
+        )
+
+    @staticmethod
+    def _padding(size: int) -> bytes:
+        return tarfile.NUL * (-size % tarfile.BLOCKSIZE)
+
+    def add_directory(self, name: str) -> None:
+        """
+        Add a directory
+
+        Parameters:
+            name (str): Name of the directory in the archive
+        """
+        tarinfo = self._tarinfo(name, 0o777)
+        tarinfo.type = tarfile.DIRTYPE
+
+        def write(out: _Compressor) -> Iterator[None]:
+            out.write(self._header(tarinfo))
+            yield
+
+        self._members.append(write)
+
+    def add_bytes(self, name: str, content: bytes) -> None:
+        """
+        Add a file with the given content
+
+        Parameters:
+            name (str): Name of the file in the archive
+            content (bytes): Content of the file
+        """
+        tarinfo = self._tarinfo(name, 0o666)
+        tarinfo.size = len(content)
+
+        def write(out: _Compressor) -> Iterator[None]:
+            out.write(self._header(tarinfo))
+            out.write(content)
+            out.write(self._padding(len(content)))
+            yield
+
+        self._members.append(write)
+
+    def add_file(self, name: str, open_file: Callable[[], BinaryIO]) -> None:
+        """
+        Add a file that is copied into the archive in chunks
+
+        Parameters:
+            name (str): Name of the file in the archive
+            open_file (Callable[[], BinaryIO]): Opens the file, called when the member is written
+        """
+
+        def write(out: _Compressor) -> Iterator[None]:
+            with open_file() as f:
+                file_stat = os.fstat(f.fileno())
+                tarinfo = self._tarinfo(name, 0o666, int(file_stat.st_mtime))
+                tarinfo.size = file_stat.st_size
+                out.write(self._header(tarinfo))
+
+                remaining = tarinfo.size
+                while remaining > 0:
+                    chunk = f.read(min(self.CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise OSError(f"{name} ended before its size was read")
+                    out.write(chunk)
+                    remaining -= len(chunk)
+                    yield
+                out.write(self._padding(tarinfo.size))
+            yield
+
+        self._members.append(write)
+
+    def add_link(self, name: str, target: str) -> None:
+        """
+        Add a hard link to a member added before
+
+        Parameters:
+            name (str): Name of the link in the archive
+            target (str): Name of the member linked to
+        """
+        tarinfo = self._tarinfo(name, 0o666)
+        tarinfo.type = tarfile.LNKTYPE
+        tarinfo.linkname = target
+
+        def write(out: _Compressor) -> Iterator[None]:
+            out.write(self._header(tarinfo))
+            yield
+
+        self._members.append(write)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._write()
+
+    def _write(
+        self, progress: Callable[[int, int], None] | None = None
+    ) -> Iterator[bytes]:
+        out = _Compressor(self.codec, self.level)
+        for written, write in enumerate(self._members, start=1):
+            for _ in write(out):
+                yield from out.drain(self.CHUNK_SIZE)
+            if progress is not None:
+                progress(written, len(self._members))
+
+        # The archive ends with two empty blocks and is padded to a full record
+        out.write(tarfile.NUL * tarfile.BLOCKSIZE * 2)
+        out.write(tarfile.NUL * (-out.offset % tarfile.RECORDSIZE))
+        out.finish()
+        yield from out.drain()
+
+    def write_to(
+        self, path: Path, progress: Callable[[int, int], None] | None = None
+    ) -> None:
+        """
+        Write the archive to a file
+
+        Parameters:
+            path (Path): Path of the file
+            progress (Callable[[int, int], None] | None): Called with the number of written members and the number of members after every member
+        """
+        with open(path, "wb") as f:
+            f.writelines(self._write(progress))
+
+
+@contextmanager
+def open_archive(fileobj: BinaryIO, stream: bool = False) -> Iterator[tarfile.TarFile]:
+    """
+    Open an archive written by ArchiveStream, or any tar archive tarfile reads.
+    The archive is closed when the context exits, fileobj is left open.
+
+    Parameters:
+        fileobj (BinaryIO): Seekable archive
+        stream (bool): Read the members in a single forward pass, members can then only be read in order
+
+    Returns:
+        Iterator[tarfile.TarFile]: Context of the opened archive
+    """
+    magic = fileobj.read(4)
+    fileobj.seek(0)
+    if magic != b"\x28\xb5\x2f\xfd":
+        with tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r:*") as tar:
+            yield tar
+        return
+
+    if zstandard is None:
+        raise ServerException(
+            "zstd compression is not available",
+            ErrCodes.ARCHIVE_CODEC_NOT_AVAILABLE,
+        )
+    decompressor = zstandard.ZstdDecompressor()  # type: ignore
+    if stream:
+        with (
+            decompressor.stream_reader(fileobj, closefd=False) as reader,
+            tarfile.open(fileobj=reader, mode="r|") as tar,
+        ):
+            yield tar
+        return
+    # Members are read by name, which needs a seekable archive, so it is
+    # decompressed into an anonymous file
+    with tempfile.TemporaryFile() as decompressed:
+        decompressor.copy_stream(fileobj, decompressed)
+        decompressed.seek(0)
+        with tarfile.open(fileobj=decompressed) as tar:
+            yield tar
+
+
+__all__ = ["ArchiveCodec", "ArchiveStream", "open_archive"]
@@ -0,0 +1,188 @@
+from array import array
+from collections.abc import Hashable, Iterable, Mapping
+
+from rdflib import BNode
+
+from server.models import ontology
+
+
+class ClassHierarchy:
+    """
+    ClassHierarchy is an integer indexed rdfs:subClassOf graph with a memoized
+    transitive closure. Every class is interned to an integer id once and the
+    ancestors of every class are computed bottom-up, reusing the ancestors of its
+    super classes. Cycles are collapsed into strongly connected components, all
+    members of a cycle share the same ancestors.
+
+    The ancestors of a component are kept as an insertion ordered dict, so
+    subsumption checks are a single hash lookup and ancestors keep their
+    nearest first order.
+
+    Blank nodes take part in the closure (a class can inherit through an
+    anonymous class expression) but are never reported as ancestors.
+    """
+
+    def __init__(self, super_classes: Mapping[Hashable, Iterable[Hashable]]):
+        """
+        Build the hierarchy
+
+        Parameters:
+            super_classes (Mapping[Hashable, Iterable[Hashable]]): Direct super classes of every class
+        """
+        self._ids: dict[Hashable, int] = {}
+        self._terms: list[Hashable] = []
+        self._parents: list[array] = []
+
+        for child, parents in super_classes.items():
+            child_id = self._intern(child)
+            parent_ids = [self._intern(parent) for parent in parents]
+            self._parents[child_id] = array("I", parent_ids)
+
+        self._ancestors: list[dict[int, None]] = self._compute_ancestors()
+
+    @classmethod
+    def from_classes(cls, classes: Iterable[ontology.Class]) -> "ClassHierarchy":
+        """
+        Rebuild a hierarchy from indexed classes, for example classes loaded from
+        a stored ontology
+
+        Parameters:
+            classes (Iterable[ontology.Class]): Indexed classes
+
+        Returns:
+            ClassHierarchy: The hierarchy
+        """
+        return cls({_cls.full_uri: _cls.super_classes for _cls in classes})
+
+    @staticmethod
+    def _key(term: Hashable) -> Hashable:
+        # Named nodes are interned by their string form, so the hierarchy can be
+        # queried with plain URIs
+        return term if isinstance(term, BNode) else str(term)
+
+    def _intern(self, term: Hashable) -> int:
+        key = self._key(term)
+        term_id = self._ids.get(key)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._ids[key] = term_id
+            self._terms.append(key)
+            self._parents.append(array("I"))
+        return term_id
+
+    def _strongly_connected_components(self) -> list[list[int]]:
+        # Iterative Tarjan, components are emitted after every component they
+        # reach, i.e. super classes come before their sub classes
+        index_of = [-1] * len(self._terms)
+        low_link = [0] * len(self._terms)
+        on_stack = [False] * len(self._terms)
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+
+        for root in range(len(self._terms)):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    index_of[node] = low_link[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                parents = self._parents[node]
+                while edge < len(parents):
+                    parent = parents[edge]
+                    edge += 1
+                    if index_of[parent] == -1:
+                        work.append((node, edge))
+                        work.append((parent, 0))
+                        break
+                    if on_stack[parent]:
+                        low_link[node] = min(low_link[node], index_of[parent])
+                else:
+                    if low_link[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        caller = work[-1][0]
+                        low_link[caller] = min(low_link[caller], low_link[node])
+        return components
+
+    def _compute_ancestors(self) -> list[dict[int, None]]:
+        # Members of a component share one closure, which holds the members
+        # themselves when they form a cycle
+        ancestors: list[dict[int, None]] = [{}] * len(self._terms)
+        for component in self._strongly_connected_components():
+            members = set(component)
+            closure: dict[int, None] = {}
+            for member in component:
+                for parent in self._parents[member]:
+                    if self._is_named(parent):
+                        closure[parent] = None
+            for member in component:
+                for parent in self._parents[member]:
+                    if parent not in members:
+                        closure.update(ancestors[parent])
+            for member in component:
+                ancestors[member] = closure
+        return ancestors
+
+    def _is_named(self, term_id: int) -> bool:
+        return not isinstance(self._terms[term_id], BNode)
+
+    def __contains__(self, term: Hashable) -> bool:
+        return self._key(term) in self._ids
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def ancestors(self, term: Hashable) -> list[str]:
+        """
+        Get all named super classes of a class, nearest first
+
+        Parameters:
+            term (Hashable): The class
+
+        Returns:
+            list[str]: Full URIs of the super classes, the class itself is excluded
+        """
+        term_id = self._ids.get(self._key(term))
+        if term_id is None:
+            return []
+        return [
+            str(self._terms[ancestor])
+            for ancestor in self._ancestors[term_id]
+            if ancestor != term_id
+        ]
+
+    def is_subclass_of(self, sub_class: Hashable, super_class: Hashable) -> bool:
+        """
+        Check whether a class is subsumed by another class. Every class is a
+        subclass of itself.
+
+        Parameters:
+            sub_class (Hashable): The candidate sub class
+            super_class (Hashable): The candidate super class
+
+        Returns:
+            bool: True if sub_class is equal to or a descendant of super_class
+        """
+        sub_key, super_key = self._key(sub_class), self._key(super_class)
+        if sub_key == super_key:
+            return True
+        sub_id = self._ids.get(sub_key)
+        super_id = self._ids.get(super_key)
+        if sub_id is None or super_id is None:
+            return False
+        return super_id in self._ancestors[sub_id]
+
+
+__all__ = ["ClassHierarchy"]
@@ -0,0 +1,95 @@
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ObjectCache(Generic[T]):
+    """
+    ObjectCache is a bounded, thread safe LRU cache of parsed objects. Every
+    entry is stored under a key together with a version (for example the hash
+    of the file the object was parsed from), a lookup only hits when the
+    version still matches.
+
+    Entries are kept as pickled snapshots and every hit unpickles a fresh
+    copy, so callers are free to mutate what they get without touching the
+    cache or each other. Unpickling is several times faster than a deepcopy
+    and faster than parsing the JSON the objects are stored as.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Create the cache
+
+        Parameters:
+            maxsize (int): Maximum number of entries, least recently used entries are dropped first
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: str) -> T | None:
+        """
+        Get a copy of the object stored under the key
+
+        Parameters:
+            key (str): Key of the object
+            version (str): Expected version of the object
+
+        Returns:
+            T | None: A copy of the object, None if it is missing or stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(entry[1])
+
+    def put(self, key: str, version: str, value: T) -> None:
+        """
+        Store a snapshot of the object, later changes to the object are not
+        seen by the cache
+
+        Parameters:
+            key (str): Key of the object
+            version (str): Version of the object
+            value (T): The object
+        """
+        if self.maxsize <= 0:
+            return
+        snapshot = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (version, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop the object stored under the key, if any
+
+        Parameters:
+            key (str): Key of the object
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every object
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+__all__ = ["ObjectCache"]
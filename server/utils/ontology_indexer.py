@@ -1,137 +1,216 @@
-from typing import cast
-
 from kink import inject
-from rdflib import Graph, Literal
-from rdflib.query import ResultRow
+from rdflib import OWL, RDF, RDFS, BNode, Graph, Literal
+from rdflib.term import Node
 
 from server.models import (
     ontology,
 )
+from server.utils.class_hierarchy import ClassHierarchy
 
 
-@inject
-class OntologyIndexer:
+class OntologyTermAccumulator:
     """
-    OntologyIndexer is an utility class that provides methods to index the ontology
+    OntologyTermAccumulator collects the triples that are relevant for indexing
+    an ontology into compact lookup tables. Triples are fed one by one through
+    `add`, so the accumulator can be filled from an rdflib graph or from any
+    other triple source.
+
+    Labels, comments and deprecation flags are only kept for subjects that are
+    already typed as a class, property or individual, so the annotations of
+    instance data do not pile up. The type triples have to be added before
+    the annotations, e.g. in a second pass over ANNOTATION_PREDICATES.
     """
 
-    PREFIXES = """
-    PREFIX owl: <http://www.w3.org/2002/07/owl#>
-    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    """
+    CLASS_TYPES = (OWL.Class, RDFS.Class)
+
+    PROPERTY_TYPES = (
+        OWL.ObjectProperty,
+        OWL.DatatypeProperty,
+        OWL.AnnotationProperty,
+        RDF.Property,
+    )
+
+    INDIVIDUAL_TYPE = OWL.NamedIndividual
+
+    STRUCTURE_PREDICATES = (
+        RDF.type,
+        RDFS.subClassOf,
+        RDFS.domain,
+        RDFS.range,
+        OWL.unionOf,
+        OWL.intersectionOf,
+        RDF.first,
+        RDF.rest,
+    )
+
+    ANNOTATION_PREDICATES = (
+        RDFS.label,
+        RDFS.comment,
+        OWL.deprecated,
+    )
+
+    # Type triples come first, annotations are then kept for known terms only
+    INDEXED_PREDICATES = STRUCTURE_PREDICATES + ANNOTATION_PREDICATES
+
+    def __init__(self):
+        # dicts with None values are used as insertion ordered sets
+        self.classes: dict[Node, None] = {}
+        self.property_types: dict[Node, list[Node]] = {}
+        self.individuals: dict[Node, None] = {}
+        self.labels: dict[Node, dict[Literal, None]] = {}
+        self.descriptions: dict[Node, dict[Literal, None]] = {}
+        self.deprecated: dict[Node, Literal] = {}
+        self.super_classes: dict[Node, dict[Node, None]] = {}
+        self.domains: dict[Node, dict[Node, None]] = {}
+        self.ranges: dict[Node, dict[Node, None]] = {}
+        self.union_of: dict[Node, Node] = {}
+        self.intersection_of: dict[Node, Node] = {}
+        self.list_first: dict[Node, Node] = {}
+        self.list_rest: dict[Node, Node] = {}
+
+    def add(self, s: Node, p: Node, o: Node) -> None:
+        """
+        Add a single triple to the accumulator, triples with predicates that
+        are not indexed are ignored.
 
-    GET_CLASS_SPARQL = f"""
-    {PREFIXES}
-
-    SELECT DISTINCT ?class ?label ?description ?isDeprecated
-    WHERE {{
-        ?class a ?type .
-        FILTER (?type = owl:Class || ?type = rdfs:Class)
-        FILTER (!isBlank(?class))
-        OPTIONAL {{ ?class rdfs:label ?label }}
-        OPTIONAL {{ ?class rdfs:comment ?description }}
-        OPTIONAL {{ ?class owl:deprecated ?isDeprecated }}
-    }}
-    """
+        Parameters:
+            s (Node): Subject of the triple
+            p (Node): Predicate of the triple
+            o (Node): Object of the triple
+        """
+        if p == RDF.type:
+            self._add_type(s, o)
+        elif p in self.ANNOTATION_PREDICATES:
+            if isinstance(o, Literal) and self.is_term(s):
+                self._add_annotation(s, p, o)
+        elif p == RDFS.subClassOf:
+            self.super_classes.setdefault(s, {})[o] = None
+        elif p == RDFS.domain:
+            self.domains.setdefault(s, {})[o] = None
+        elif p == RDFS.range:
+            self.ranges.setdefault(s, {})[o] = None
+        elif p == OWL.unionOf:
+            self.union_of[s] = o
+        elif p == OWL.intersectionOf:
+            self.intersection_of[s] = o
+        elif p == RDF.first:
+            self.list_first[s] = o
+        elif p == RDF.rest:
+            self.list_rest[s] = o
+
+    def add_graph(self, g: Graph) -> None:
+        """
+        Add all indexed triples of a graph, using the predicate index of the
+        graph so that every relevant triple is visited exactly once.
 
-    GET_SUPER_CLASSES_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?superClass
-    WHERE {{
-        <___class_uri___> rdfs:subClassOf* ?superClass .
-        FILTER (!isBlank(?superClass)) .
-    }}
-    """
+        Parameters:
+            g (Graph): The ontology graph
+        """
+        for predicate in self.INDEXED_PREDICATES:
+            for s, o in g.subject_objects(predicate):
+                self.add(s, predicate, o)
 
-    GET_PROPERTY_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?property ?label ?description ?isDeprecated ?propertyType
-    WHERE {{
-        ?property a ?propertyType .
-        FILTER (?propertyType = owl:ObjectProperty || ?propertyType = owl:DatatypeProperty || ?propertyType = owl:AnnotationProperty || ?propertyType = rdf:Property)
-        FILTER (!isBlank(?property))
-        OPTIONAL {{ ?property rdfs:label ?label }}
-        OPTIONAL {{ ?property rdfs:comment ?description }}
-        OPTIONAL {{ ?property owl:deprecated ?isDeprecated }}
-    }}
-    """
+    def is_term(self, s: Node) -> bool:
+        """
+        Check whether a subject was typed as a class, property or individual
 
-    GET_PROPERTY_RANGE_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?range
-    WHERE {{
-        <___property_uri___> rdfs:range ?range .
-        FILTER (!isBlank(?range)) .
-    }}
-    """
+        Parameters:
+            s (Node): The subject
 
-    GET_PROPERTY_RANGE_OWL_UNION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?range
-    WHERE {{
-        <___property_uri___> rdfs:range ?rangeValue .
-        ?rangeValue owl:unionOf ?list .
-        ?list rdf:rest*/rdf:first ?range .
-        FILTER (!isBlank(?range)) .
-    }}
-    """
+        Returns:
+            bool: True if the subject is indexed as a term
+        """
+        return s in self.classes or s in self.property_types or s in self.individuals
+
+    def _add_annotation(self, s: Node, p: Node, o: Literal) -> None:
+        if p == RDFS.label:
+            self.labels.setdefault(s, {})[o] = None
+        elif p == RDFS.comment:
+            self.descriptions.setdefault(s, {})[o] = None
+        elif s not in self.deprecated:
+            self.deprecated[s] = o
+
+    def _add_type(self, s: Node, o: Node) -> None:
+        if isinstance(s, BNode):
+            return
+        if o in self.CLASS_TYPES:
+            self.classes[s] = None
+        elif o in self.PROPERTY_TYPES:
+            self.property_types.setdefault(s, []).append(o)
+        elif o == self.INDIVIDUAL_TYPE:
+            self.individuals[s] = None
+
+    def list_items(self, head: Node) -> list[Node]:
+        """
+        Resolve an RDF collection into its members
 
-    GET_PROPERTY_RANGE_OWL_INTERSECTION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?range
-    WHERE {{
-        <___property_uri___> rdfs:range ?rangeValue .
-        ?rangeValue owl:intersectionOf ?list .
-        ?list rdf:rest*/rdf:first ?range .
-        FILTER (!isBlank(?range)) .
-    }}
-    """
+        Parameters:
+            head (Node): The first cell of the collection
 
-    GET_PROPERTY_DOMAIN_SPARQL = f"""
-    {PREFIXES}
+        Returns:
+            list[Node]: Members of the collection, in order
+        """
+        items: list[Node] = []
+        visited: set[Node] = set()
+        cell: Node | None = head
+        while cell is not None and cell != RDF.nil and cell not in visited:
+            visited.add(cell)
+            if cell in self.list_first:
+                items.append(self.list_first[cell])
+            cell = self.list_rest.get(cell)
+        return items
+
+    def class_hierarchy(self) -> ClassHierarchy:
+        """
+        Build the rdfs:subClassOf hierarchy of the accumulated triples
 
-    SELECT DISTINCT ?domain
-    WHERE {{
-        <___property_uri___> rdfs:domain ?domain .
-        FILTER (!isBlank(?domain)) .
-    }}
-    """
+        Returns:
+            ClassHierarchy: The hierarchy with its transitive closure
+        """
+        return ClassHierarchy(self.super_classes)
 
-    GET_PROPERTY_DOMAIN_OWL_UNION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?domain
-    WHERE {{
-        <___property_uri___> rdfs:domain ?domainValue .
-        ?domainValue owl:unionOf ?list .
-        ?list rdf:rest*/rdf:first ?domain .
-        FILTER (!isBlank(?domain)) .
-    }}
-    """
+    def expand_class_expressions(self, values: dict[Node, None]) -> list[str]:
+        """
+        Expand domain or range values into named classes. Named values are kept
+        as is, owl:unionOf and owl:intersectionOf expressions are resolved to
+        their named members.
 
-    GET_PROPERTY_DOMAIN_OWL_INTERSECTION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?domain
-    WHERE {{
-        <___property_uri___> rdfs:domain ?domainValue .
-        ?domainValue owl:intersectionOf ?list .
-        ?list rdf:rest*/rdf:first ?domain .
-        FILTER (!isBlank(?domain)) .
-    }}
-    """
+        Parameters:
+            values (dict[Node, None]): Domain or range values of a property
 
-    GET_INDIVIDUAL_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?individual ?label ?description ?isDeprecated
-    WHERE {{
-        ?individual a owl:NamedIndividual .
-        FILTER (!isBlank(?individual))
-        OPTIONAL {{ ?individual rdfs:label ?label }}
-        OPTIONAL {{ ?individual rdfs:comment ?description }}
-        OPTIONAL {{ ?individual owl:deprecated ?isDeprecated }}
-    }}
+        Returns:
+            list[str]: Full URIs of the expanded values
+        """
+        expanded: dict[str, None] = {
+            str(value): None for value in values if not isinstance(value, BNode)
+        }
+        for expressions in (self.union_of, self.intersection_of):
+            for value in values:
+                if value not in expressions:
+                    continue
+                for member in self.list_items(expressions[value]):
+                    if not isinstance(member, BNode):
+                        expanded[str(member)] = None
+        return list(expanded)
+
+
+@inject
+class OntologyIndexer:
+    """
+    OntologyIndexer is an utility class that provides methods to index the ontology
     """
 
+    # Bump whenever the produced index changes, cached indexes of older
+    # versions are then ignored and re-created
+    VERSION = 1
+
+    PROPERTY_TYPE_PRIORITY = (
+        (OWL.ObjectProperty, ontology.PropertyType.OBJECT),
+        (OWL.DatatypeProperty, ontology.PropertyType.DATATYPE),
+        (OWL.AnnotationProperty, ontology.PropertyType.ANNOTATION),
+        (RDF.Property, ontology.PropertyType.ANY),
+    )
+
     def _create_literal_from_rdflib_literal(
         self, rdflib_literal: Literal
     ) -> ontology.Literal:
@@ -141,6 +220,45 @@ class OntologyIndexer:
             datatype=rdflib_literal.datatype or "",
         )
 
+    def _accumulate(self, g: Graph) -> OntologyTermAccumulator:
+        accumulator = OntologyTermAccumulator()
+        accumulator.add_graph(g)
+        return accumulator
+
+    def index(self, ontology_uri: str, g: Graph) -> ontology.OntologyIndex:
+        """
+        Get classes, properties and individuals from the ontology, walking the
+        graph only once
+
+        Parameters:
+            ontology_uri (str): The URI of the ontology
+            g (Graph): The ontology graph
+
+        Returns:
+            models.OntologyIndex: The indexed classes, properties and individuals
+        """
+        return self.index_accumulator(ontology_uri, self._accumulate(g))
+
+    def index_accumulator(
+        self, ontology_uri: str, accumulator: OntologyTermAccumulator
+    ) -> ontology.OntologyIndex:
+        """
+        Get classes, properties and individuals from triples that were already
+        collected, e.g. while streaming a file
+
+        Parameters:
+            ontology_uri (str): The URI of the ontology
+            accumulator (OntologyTermAccumulator): The collected triples
+
+        Returns:
+            models.OntologyIndex: The indexed classes, properties and individuals
+        """
+        return ontology.OntologyIndex(
+            classes=self._create_class_models(ontology_uri, accumulator),
+            individuals=self._create_individual_models(ontology_uri, accumulator),
+            properties=self._create_property_models(ontology_uri, accumulator),
+        )
+
     def get_classes(self, ontology_uri: str, g: Graph) -> list[ontology.Class]:
         """
         Get classes from the ontology
@@ -152,74 +270,19 @@ class OntologyIndexer:
         Returns:
             list[models.Class]: The list of classes
         """
-        classes_result = g.query(self.GET_CLASS_SPARQL)
-        classes: dict[str, dict] = {}
-        for class_result in classes_result:
-            class_result = cast(ResultRow, class_result)
-            class_uri = class_result["class"]
-            if class_uri not in classes:
-                classes[class_uri] = self._initialize_class_data(
-                    g, class_uri, class_result
-                )
-            self._update_class_labels_and_descriptions(classes, class_uri, class_result)
-        return self._create_class_models(ontology_uri, classes)
-
-    def _initialize_class_data(
-        self,
-        g: Graph,
-        class_uri: str,
-        class_result: ResultRow,
-    ) -> dict:
-        super_classes_result = g.query(
-            self.GET_SUPER_CLASSES_SPARQL.replace("___class_uri___", class_uri)
-        )
-        super_classes = [
-            str(cast(ResultRow, super_class_result)["superClass"])
-            for super_class_result in super_classes_result
-        ]
-        try:
-            super_classes.remove(str(class_uri))
-        except ValueError:
-            pass
-        is_deprecated = cast(Literal, class_result["isDeprecated"])
-        return {
-            "super_classes": super_classes,
-            "label": [],
-            "description": [],
-            "is_deprecated": is_deprecated.toPython() if is_deprecated else False,
-        }
+        return self._create_class_models(ontology_uri, self._accumulate(g))
 
-    def _update_class_labels_and_descriptions(
-        self,
-        classes: dict,
-        class_uri: str,
-        class_result: ResultRow,
-    ) -> None:
-        result_label = cast(Literal, class_result["label"])
-        result_description = cast(Literal, class_result["description"])
-        if label := result_label:
-            classes[class_uri]["label"].append(
-                self._create_literal_from_rdflib_literal(label)
-            )
-        if description := result_description:
-            classes[class_uri]["description"].append(
-                self._create_literal_from_rdflib_literal(description)
-            )
+    def get_class_hierarchy(self, g: Graph) -> ClassHierarchy:
+        """
+        Get the class hierarchy of the ontology, for subsumption checks
 
-    def _create_class_models(
-        self, ontology_uri: str, classes: dict
-    ) -> list[ontology.Class]:
-        return [
-            ontology.Class(
-                belongs_to=ontology_uri,
-                full_uri=str(class_uri),
-                label=class_data["label"],
-                description=class_data["description"],
-                super_classes=class_data["super_classes"],
-                is_deprecated=class_data["is_deprecated"],
-            )
-            for class_uri, class_data in classes.items()
-        ]
+        Parameters:
+            g (Graph): The ontology graph
+
+        Returns:
+            ClassHierarchy: The class hierarchy
+        """
+        return self._accumulate(g).class_hierarchy()
 
     def get_properties(self, ontology_uri: str, g: Graph) -> list[ontology.Property]:
         """
@@ -232,192 +295,102 @@ class OntologyIndexer:
         Returns:
             list[models.Property]: The list of properties
         """
-        properties_result = g.query(self.GET_PROPERTY_SPARQL)
-        properties: dict[str, dict] = {}
-        for property_result in properties_result:
-            property_result = cast(ResultRow, property_result)
-            property_uri = property_result["property"]
-
-            if property_uri not in properties:
-                properties[property_uri] = self._initialize_property_data(
-                    g, property_uri, property_result
-                )
-
-            self._update_property_labels_and_descriptions(
-                properties, property_uri, property_result
-            )
-
-        return self._create_property_models(ontology_uri, properties)
+        return self._create_property_models(ontology_uri, self._accumulate(g))
 
-    def _initialize_property_data(
-        self,
-        g: Graph,
-        property_uri: str,
-        property_result: ResultRow,
-    ) -> dict:
-        range_result = g.query(
-            self.GET_PROPERTY_RANGE_SPARQL.replace("___property_uri___", property_uri)
-        )
-        range_union_result = g.query(
-            self.GET_PROPERTY_RANGE_OWL_UNION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
-        range_intersection_result = g.query(
-            self.GET_PROPERTY_RANGE_OWL_INTERSECTION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
-        range_values = [
-            str(cast(ResultRow, range_row)["range"])
-            for range_row in [
-                *range_result,
-                *range_union_result,
-                *range_intersection_result,
-            ]
-        ]
+    def get_individuals(self, ontology_uri: str, g: Graph) -> list[ontology.Individual]:
+        """
+        Get individuals from the ontology
 
-        domain_result = g.query(
-            self.GET_PROPERTY_DOMAIN_SPARQL.replace("___property_uri___", property_uri)
-        )
+        Parameters:
+            ontology_uri (str): The URI of the ontology
+            g (Graph): The ontology graph
 
-        domain_union_result = g.query(
-            self.GET_PROPERTY_DOMAIN_OWL_UNION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
+        Returns:
+            list[models.Individual]: The list of individuals
+        """
+        return self._create_individual_models(ontology_uri, self._accumulate(g))
 
-        domain_intersection_result = g.query(
-            self.GET_PROPERTY_DOMAIN_OWL_INTERSECTION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
+    def _get_labels(
+        self, accumulator: OntologyTermAccumulator, uri: Node
+    ) -> list[ontology.Literal]:
+        return [
+            self._create_literal_from_rdflib_literal(label)
+            for label in accumulator.labels.get(uri, ())
+        ]
 
-        domain_values = [
-            str(cast(ResultRow, domain_row)["domain"])
-            for domain_row in [
-                *domain_result,
-                *domain_union_result,
-                *domain_intersection_result,
-            ]
+    def _get_descriptions(
+        self, accumulator: OntologyTermAccumulator, uri: Node
+    ) -> list[ontology.Literal]:
+        return [
+            self._create_literal_from_rdflib_literal(description)
+            for description in accumulator.descriptions.get(uri, ())
         ]
-        is_deprecated = cast(Literal, property_result["isDeprecated"])
-        property_type = cast(ResultRow, property_result)["propertyType"]
-        return {
-            "label": [],
-            "description": [],
-            "property_type": self._get_property_type(str(property_type)),
-            "range": range_values,
-            "domain": domain_values,
-            "is_deprecated": is_deprecated.toPython() if is_deprecated else False,
-        }
 
-    def _update_property_labels_and_descriptions(
-        self,
-        properties: dict,
-        property_uri: str,
-        property_result: ResultRow,
-    ) -> None:
-        if label := cast(Literal, property_result["label"]):
-            properties[property_uri]["label"].append(
-                self._create_literal_from_rdflib_literal(label)
-            )
-        if description := cast(Literal, property_result["description"]):
-            properties[property_uri]["description"].append(
-                self._create_literal_from_rdflib_literal(description)
+    def _is_deprecated(self, accumulator: OntologyTermAccumulator, uri: Node) -> bool:
+        is_deprecated = accumulator.deprecated.get(uri)
+        if is_deprecated is None:
+            return False
+        value = is_deprecated.toPython()
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "1")
+        return bool(value)
+
+    def _create_class_models(
+        self, ontology_uri: str, accumulator: OntologyTermAccumulator
+    ) -> list[ontology.Class]:
+        hierarchy = accumulator.class_hierarchy()
+        return [
+            ontology.Class(
+                belongs_to=ontology_uri,
+                full_uri=str(class_uri),
+                label=self._get_labels(accumulator, class_uri),
+                description=self._get_descriptions(accumulator, class_uri),
+                super_classes=hierarchy.ancestors(class_uri),
+                is_deprecated=self._is_deprecated(accumulator, class_uri),
             )
+            for class_uri in accumulator.classes
+        ]
 
     def _create_property_models(
-        self, ontology_uri: str, properties: dict
+        self, ontology_uri: str, accumulator: OntologyTermAccumulator
     ) -> list[ontology.Property]:
         return [
             ontology.Property(
                 belongs_to=str(ontology_uri),
                 full_uri=str(property_uri),
-                label=property_data["label"],
-                description=property_data["description"],
-                property_type=property_data["property_type"],
-                range=property_data["range"],
-                domain=property_data["domain"],
-                is_deprecated=property_data["is_deprecated"],
+                label=self._get_labels(accumulator, property_uri),
+                description=self._get_descriptions(accumulator, property_uri),
+                property_type=self._get_property_type(property_types),
+                range=accumulator.expand_class_expressions(
+                    accumulator.ranges.get(property_uri, {})
+                ),
+                domain=accumulator.expand_class_expressions(
+                    accumulator.domains.get(property_uri, {})
+                ),
+                is_deprecated=self._is_deprecated(accumulator, property_uri),
             )
-            for property_uri, property_data in properties.items()
+            for property_uri, property_types in accumulator.property_types.items()
         ]
 
-    def _get_property_type(self, property_type: str) -> ontology.PropertyType:
-        match property_type:
-            case "http://www.w3.org/2002/07/owl#ObjectProperty":
-                return ontology.PropertyType.OBJECT
-            case "http://www.w3.org/2002/07/owl#DatatypeProperty":
-                return ontology.PropertyType.DATATYPE
-            case "http://www.w3.org/2002/07/owl#AnnotationProperty":
-                return ontology.PropertyType.ANNOTATION
-            case _:
-                raise ValueError(f"Unknown property type: {property_type}")
-
-    def get_individuals(self, ontology_uri: str, g: Graph) -> list[ontology.Individual]:
-        """
-        Get individuals from the ontology
-
-        Parameters:
-            ontology_uri (str): The URI of the ontology
-            g (Graph): The ontology graph
-
-        Returns:
-            list[models.Individual]: The list of individuals
-        """
-        individuals_result = g.query(self.GET_INDIVIDUAL_SPARQL)
-        individuals: dict[str, dict] = {}
-        for individual_result in individuals_result:
-            individual_result = cast(ResultRow, individual_result)
-            individual_uri = individual_result["individual"]
-
-            if individual_uri not in individuals:
-                individuals[individual_uri] = {
-                    "label": [],
-                    "description": [],
-                    "is_deprecated": False,
-                }
-
-            self._update_individual_labels_and_descriptions(
-                individuals,
-                individual_uri,
-                individual_result,
-            )
-
-        return self._create_individual_models(ontology_uri, individuals)
-
-    def _update_individual_labels_and_descriptions(
-        self,
-        individuals: dict,
-        individual_uri: str,
-        individual_result: ResultRow,
-    ) -> None:
-        result_label = cast(Literal, individual_result["label"])
-        result_description = cast(Literal, individual_result["description"])
-        is_deprecated = cast(Literal, individual_result["isDeprecated"])
-
-        if result_label:
-            individuals[individual_uri]["label"].append(
-                self._create_literal_from_rdflib_literal(result_label)
-            )
-        if result_description:
-            individuals[individual_uri]["description"].append(
-                self._create_literal_from_rdflib_literal(result_description)
-            )
-        if is_deprecated:
-            individuals[individual_uri]["is_deprecated"] = is_deprecated.toPython()
+    def _get_property_type(self, property_types: list[Node]) -> ontology.PropertyType:
+        for rdf_type, property_type in self.PROPERTY_TYPE_PRIORITY:
+            if rdf_type in property_types:
+                return property_type
+        raise ValueError(f"Unknown property type: {property_types}")
 
     def _create_individual_models(
-        self, ontology_uri: str, individuals: dict
+        self, ontology_uri: str, accumulator: OntologyTermAccumulator
     ) -> list[ontology.Individual]:
         return [
             ontology.Individual(
                 belongs_to=ontology_uri,
                 full_uri=str(individual_uri),
-                label=individual_data["label"],
-                description=individual_data["description"],
-                is_deprecated=individual_data["is_deprecated"],
+                label=self._get_labels(accumulator, individual_uri),
+                description=self._get_descriptions(accumulator, individual_uri),
+                is_deprecated=self._is_deprecated(accumulator, individual_uri),
             )
-            for individual_uri, individual_data in individuals.items()
+            for individual_uri in accumulator.individuals
         ]
+
+
+__all__ = ["OntologyIndexer", "OntologyTermAccumulator"]
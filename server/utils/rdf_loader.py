@@ -1,52 +1,325 @@
+import codecs
+import gzip
+import json
 import logging
+import re
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import BinaryIO, ClassVar
 
-from rdflib import Graph
+from rdflib import BNode, Dataset, Graph
+from rdflib.plugins.parsers.ntriples import (
+    ParseError,
+    W3CNTriplesParser,
+    r_nodeid,
+    r_tail,
+    r_wspace,
+)
+from rdflib.term import Node
+
+
+class _LineTripleParser(W3CNTriplesParser):
+    """
+    N-Triples and N-Quads parser that hands triples to a callback instead of
+    adding them to a graph. Graph names are dropped, blank node labels are used
+    as is so no label mapping is kept, and lines with a predicate outside of
+    `predicates` are skipped without parsing their object.
+    """
+
+    __slots__ = ("_callback", "_predicates", "_quads")
+
+    def __init__(
+        self,
+        callback: Callable[[Node, Node, Node], None],
+        quads: bool,
+        predicates: frozenset[Node] | None,
+    ):
+        super().__init__()
+        self._callback = callback
+        self._quads = quads
+        self._predicates = predicates
+
+    def nodeid(self, bnode_context=None):
+        if self.peek("_"):
+            return BNode(self.eat(r_nodeid).group(1))
+        return False
+
+    def parseline(self, bnode_context=None) -> None:
+        self.eat(r_wspace)
+        if (not self.line) or self.line.startswith("#"):
+            return
+
+        subject = self.subject()
+        self.eat(r_wspace)
+        predicate = self.predicate()
+        if self._predicates is not None and predicate not in self._predicates:
+            return
+        self.eat(r_wspace)
+        obj = self.object()
+        self.eat(r_wspace)
+        if self._quads:
+            self.uriref() or self.nodeid()
+        self.eat(r_tail)
+
+        if self.line:
+            raise ParseError(f"Trailing garbage: {self.line}")
+        self._callback(subject, predicate, obj)
 
 
 class RDFLoader:
-    PARSER_LIST = [
+    PARSER_LIST: ClassVar[list[str]] = [
+        "turtle",
+        "xml",
         "json-ld",
-        "hext",
-        "n3",
-        "nquads",
-        "patch",
         "nt",
+        "nquads",
+        "trig",
+        "n3",
         "trix",
-        "turtle",
-        "xml",
+        "hext",
+        "patch",
     ]
 
+    # Formats that carry named graphs, they are parsed into a dataset whose
+    # default graph is the union of all graphs
+    QUAD_FORMATS = ("nquads", "trig", "trix", "patch")
+
+    EXTENSION_FORMATS: ClassVar[dict[str, str]] = {
+        "ttl": "turtle",
+        "turtle": "turtle",
+        "n3": "n3",
+        "nt": "nt",
+        "ntriples": "nt",
+        "nq": "nquads",
+        "nquads": "nquads",
+        "trig": "trig",
+        "trix": "trix",
+        "rdf": "xml",
+        "owl": "xml",
+        "xml": "xml",
+        "jsonld": "json-ld",
+        "json": "json-ld",
+        "hext": "hext",
+        "rdfp": "patch",
+    }
+
+    # Formats that are only told apart from turtle by their file extension
+    TURTLE_FAMILY = ("turtle", "n3", "trig")
+
+    # Line based formats that can be parsed without building a graph
+    STREAMING_FORMATS = ("nt", "nquads")
+
+    SNIFF_SIZE = 8192
+
+    _BOMS = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+    _XML_ELEMENT = re.compile(rb"^<(?:[A-Za-z_][\w.\-]*:)?[A-Za-z_][\w.\-]*[\s/>]")
+    _TURTLE_DIRECTIVE = re.compile(
+        rb"^\s*(@prefix|@base|PREFIX|BASE)\b", re.MULTILINE | re.IGNORECASE
+    )
+    _TERM = rb'(?:<[^>\s]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9\-]+|\^\^<[^>\s]*>)?)'
+    _NT_LINE = re.compile(rb"^\s*(?:%s\s*){3}\.\s*$" % _TERM)
+    _NQ_LINE = re.compile(rb"^\s*(?:%s\s*){4}\.\s*$" % _TERM)
+
     logger = logging.getLogger(__name__)
 
     @staticmethod
-    def load_rdf_bytes(
+    def _format_from_file_name(file_name: str | None) -> str | None:
+        if not file_name or "." not in file_name:
+            return None
+        return RDFLoader.EXTENSION_FORMATS.get(file_name.rsplit(".", 1)[1].lower())
+
+    @staticmethod
+    def _sniff_line_format(head: bytes, truncated: bool) -> str | None:
+        # The last line of a truncated head may be cut off
+        lines = head.splitlines()
+        if truncated:
+            lines = lines[:-1]
+        lines = [
+            line
+            for line in lines
+            if line.strip() and not line.lstrip().startswith(b"#")
+        ][:20]
+        if not lines:
+            return None
+        if all(RDFLoader._NT_LINE.match(line) for line in lines):
+            return "nt"
+        if all(
+            RDFLoader._NT_LINE.match(line) or RDFLoader._NQ_LINE.match(line)
+            for line in lines
+        ):
+            return "nquads"
+        return None
+
+    @staticmethod
+    def _sniff_json_format(head: bytes) -> str | None:
+        if head.startswith(b"["):
+            first_line = head.split(b"\n", 1)[0]
+            try:
+                row = json.loads(first_line)
+            except ValueError:
+                row = None
+            if isinstance(row, list) and len(row) == 6:
+                return "hext"
+        return "json-ld"
+
+    @staticmethod
+    def guess_format(rdf_bytes: bytes, file_name: str | None = None) -> str:
+        """
+        Guess the serialization of RDF bytes from their first bytes. The file
+        name extension is used when the content alone is ambiguous, e.g. to
+        tell turtle, n3 and trig apart.
+
+        Parameters:
+            rdf_bytes (bytes): RDF bytes
+            file_name (str | None): Name of the file the bytes come from
+
+        Returns:
+            str: An rdflib parser name
+        """
+        extension_format = RDFLoader._format_from_file_name(file_name)
+        head = rdf_bytes[: RDFLoader.SNIFF_SIZE]
+        for bom in RDFLoader._BOMS:
+            if head.startswith(bom):
+                head = head[len(bom) :]
+                break
+        head = head.lstrip()
+
+        # N-Triples lines start with an IRI as well, e.g. <urn:a>, which looks
+        # like an XML element, so lines are matched before bare elements
+        line_format = RDFLoader._sniff_line_format(
+            head, len(rdf_bytes) >= RDFLoader.SNIFF_SIZE
+        )
+        if line_format is not None:
+            return line_format
+        if head.startswith((b"<?xml", b"<!")) or RDFLoader._XML_ELEMENT.match(head):
+            if b"<TriX" in head or extension_format == "trix":
+                return "trix"
+            return "xml"
+        if head.startswith((b"{", b"[")):
+            return RDFLoader._sniff_json_format(head)
+        if RDFLoader._TURTLE_DIRECTIVE.search(head):
+            if extension_format in RDFLoader.TURTLE_FAMILY:
+                return extension_format
+            return "turtle"
+        return extension_format or "turtle"
+
+    @staticmethod
+    def _open(file_path: Path) -> BinaryIO:
+        with open(file_path, "rb") as f:
+            compressed = f.read(2) == b"\x1f\x8b"
+        return gzip.open(file_path, "rb") if compressed else open(file_path, "rb")
+
+    @staticmethod
+    def guess_file_format(file_path: Path, file_name: str | None = None) -> str:
+        """
+        Guess the serialization of an RDF file from its first bytes
+
+        Parameters:
+            file_path (Path): Path of the RDF file
+            file_name (str | None): Original name of the file, used as a format hint
+
+        Returns:
+            str: An rdflib parser name
+        """
+        if file_name and file_name.lower().endswith(".gz"):
+            file_name = file_name[:-3]
+        with RDFLoader._open(file_path) as f:
+            return RDFLoader.guess_format(f.read(RDFLoader.SNIFF_SIZE), file_name)
+
+    @staticmethod
+    def stream_triples(
+        file_path: Path,
+        format: str,
+        callback: Callable[[Node, Node, Node], None],
+        predicates: Iterable[Node] | None = None,
+    ) -> None:
+        """
+        Parse a line based RDF file incrementally, without building a graph.
+        Only the current line of the file is held in memory.
+
+        Parameters:
+            file_path (Path): Path of the RDF file, may be gzip compressed
+            format (str): One of STREAMING_FORMATS
+            callback (Callable[[Node, Node, Node], None]): Called with every parsed triple
+            predicates (Iterable[Node] | None): Only triples with these predicates are parsed, all if None
+        """
+        if format not in RDFLoader.STREAMING_FORMATS:
+            raise ValueError(f"Format {format} can not be streamed")
+        parser = _LineTripleParser(
+            callback,
+            quads=format == "nquads",
+            predicates=frozenset(predicates) if predicates is not None else None,
+        )
+        with RDFLoader._open(file_path) as f:
+            parser.parse(codecs.getreader("utf-8-sig")(f))
+
+    @staticmethod
+    def _parse(rdf_bytes: bytes, format: str) -> Graph:
+        graph: Graph = (
+            Dataset(default_union=True) if format in RDFLoader.QUAD_FORMATS else Graph()
+        )
+        try:
+            graph.parse(data=rdf_bytes, format=format)
+        except Exception:
+            graph.close()
+            raise
+        return graph
+
+    @staticmethod
+    def load_rdf_bytes_with_format(
         rdf_bytes: bytes,
-    ) -> Graph:
+        file_name: str | None = None,
+    ) -> tuple[Graph, str]:
         """
-        Load RDF bytes into a graph
+        Load RDF bytes into a graph, parsing them with the guessed format first.
+        The remaining parsers are only tried, each on a fresh graph, when the
+        guessed format fails. Gzip compressed bytes are decompressed first.
 
         Parameters:
             rdf_bytes (bytes): RDF bytes
+            file_name (str | None): Name of the file the bytes come from, used as a format hint
 
         Returns:
-            Graph: RDF graph
+            tuple[Graph, str]: RDF graph and the format it was parsed with
         """
-        graph = Graph()
+        if rdf_bytes.startswith(b"\x1f\x8b"):
+            rdf_bytes = gzip.decompress(rdf_bytes)
+            if file_name and file_name.lower().endswith(".gz"):
+                file_name = file_name[:-3]
+
+        guessed_format = RDFLoader.guess_format(rdf_bytes, file_name)
         try:
-            graph.parse(data=rdf_bytes, format="ttl")
-            return graph
+            return RDFLoader._parse(rdf_bytes, guessed_format), guessed_format
         except Exception as e:
             RDFLoader.logger.warning(
-                f"Failed to parse RDF bytes: {e}, trying other parsers"
+                f"Failed to parse RDF bytes as {guessed_format}: {e}, trying other parsers"
             )
 
         for parser in RDFLoader.PARSER_LIST:
+            if parser == guessed_format:
+                continue
             try:
-                graph.parse(data=rdf_bytes, format=parser)
-                return graph
+                return RDFLoader._parse(rdf_bytes, parser), parser
             except Exception as e:
                 RDFLoader.logger.warning(
                     f"Failed to parse RDF bytes with parser {parser}: {e}"
                 )
 
         raise ValueError("Failed to parse RDF bytes with any parser")
+
+    @staticmethod
+    def load_rdf_bytes(
+        rdf_bytes: bytes,
+        file_name: str | None = None,
+    ) -> Graph:
+        """
+        Load RDF bytes into a graph
+
+        Parameters:
+            rdf_bytes (bytes): RDF bytes
+            file_name (str | None): Name of the file the bytes come from, used as a format hint
+
+        Returns:
+            Graph: RDF graph
+        """
+        return RDFLoader.load_rdf_bytes_with_format(rdf_bytes, file_name)[0]
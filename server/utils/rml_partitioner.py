@@ -0,0 +1,179 @@
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from rdflib import Graph, Literal, Namespace
+
+RML = Namespace("http://semweb.mmlab.be/ns/rml#")
+RR = Namespace("http://www.w3.org/ns/r2rml#")
+
+# A literal or an IRI, skipped as is, or a blank node label of an N-Quads line
+_LITERAL_IRI_OR_BNODE = re.compile(rb'("(?:[^"\\]|\\.)*"|<[^>]*>)|_:(\S+)')
+
+
+class RMLPartitioner:
+    """
+    Helpers to run an RML mapping over a large CSV source in partitions. The
+    source is split into row aligned partitions that repeat the header, a
+    mapping document is written for each partition and the N-Quads outputs of
+    the partitions are merged afterwards.
+    """
+
+    @staticmethod
+    def find_partitionable_source(rml: Graph) -> str | None:
+        """
+        Find the CSV file a mapping can be partitioned over. A mapping can be
+        partitioned when all of its logical sources read the same CSV file and
+        no join condition relates rows that may end up in different partitions.
+
+        Parameters:
+            rml (Graph): The RML mapping
+
+        Returns:
+            str | None: Path of the CSV file, None if the mapping can not be partitioned
+        """
+        if any(rml.triples((None, RR.joinCondition, None))):
+            return None
+        sources = set(rml.objects(None, RML.source))
+        if len(sources) != 1:
+            return None
+        (source,) = sources
+        if not isinstance(source, Literal) or not str(source).lower().endswith(".csv"):
+            return None
+        if not Path(str(source)).is_file():
+            return None
+        return str(source)
+
+    @staticmethod
+    def _records(f: BinaryIO) -> Iterator[bytes]:
+        # A record ends at a line break outside of quotes, escaped quotes are
+        # doubled so an odd number of quotes means the record continues
+        record = b""
+        for line in f:
+            record += line
+            if record.count(b'"') % 2 == 0:
+                yield record
+                record = b""
+        if record:
+            yield record
+
+    @staticmethod
+    def split_csv(
+        csv_file: Path,
+        output_dir: Path,
+        rows_per_partition: int,
+    ) -> list[Path]:
+        """
+        Split a CSV file into partitions of at most rows_per_partition rows,
+        each starting with the header of the file. Quoted fields spanning
+        several lines are kept within one partition.
+
+        Parameters:
+            csv_file (Path): The CSV file
+            output_dir (Path): Directory the partitions are written to
+            rows_per_partition (int): Maximum number of rows of a partition
+
+        Returns:
+            list[Path]: The partitions in row order
+        """
+        partitions: list[Path] = []
+        with open(csv_file, "rb") as f:
+            records = RMLPartitioner._records(f)
+            header = next(records, None)
+            if header is None:
+                return partitions
+            if not header.endswith(b"\n"):
+                header += b"\n"
+            out: BinaryIO | None = None
+            rows = 0
+            try:
+                for record in records:
+                    if out is None or rows == rows_per_partition:
+                        if out is not None:
+                            out.close()
+                        partition = (
+                            output_dir / f"{csv_file.stem}_part{len(partitions)}.csv"
+                        )
+                        partitions.append(partition)
+                        out = open(partition, "wb")
+                        out.write(header)
+                        rows = 0
+                    out.write(record)
+                    rows += 1
+            finally:
+                if out is not None:
+                    out.close()
+        return partitions
+
+    @staticmethod
+    def write_partition_mapping(
+        rml: Graph,
+        source: str,
+        partition: Path,
+        output_file: Path,
+    ) -> None:
+        """
+        Write a copy of a mapping that reads a partition instead of the source
+
+        Parameters:
+            rml (Graph): The RML mapping
+            source (str): Path of the partitioned CSV file
+            partition (Path): The partition
+            output_file (Path): File the mapping is written to
+        """
+        partition_rml = Graph()
+        for prefix, namespace in rml.namespaces():
+            partition_rml.bind(prefix, namespace)
+        source_literal = Literal(source)
+        partition_literal = Literal(str(partition))
+        for s, p, o in rml:
+            if p == RML.source and o == source_literal:
+                o = partition_literal
+            partition_rml.add((s, p, o))
+        partition_rml.serialize(destination=output_file, format="turtle")
+
+    @staticmethod
+    def _rename_blank_nodes(line: bytes, prefix: bytes) -> bytes:
+        if b"_:" not in line:
+            return line
+        return _LITERAL_IRI_OR_BNODE.sub(
+            lambda m: m.group(1) or b"_:" + prefix + m.group(2),
+            line,
+        )
+
+    @staticmethod
+    def merge_nquads(
+        outputs: list[Path],
+        output_file: Path,
+    ) -> int:
+        """
+        Concatenate the N-Quads outputs of the partitions. Blank node labels
+        are prefixed with the partition index since every mapper run numbers
+        its blank nodes from scratch. Repeated lines are kept, they are the
+        same triple to any RDF consumer.
+
+        Parameters:
+            outputs (list[Path]): N-Quads outputs in partition order
+            output_file (Path): File the merged output is written to
+
+        Returns:
+            int: Number of written lines
+        """
+        written = 0
+        with open(output_file, "wb") as out:
+            for index, output in enumerate(outputs):
+                prefix = f"p{index}x".encode()
+                with open(output, "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        if not line.endswith(b"\n"):
+                            line += b"\n"
+                        line = RMLPartitioner._rename_blank_nodes(line, prefix)
+                        out.write(line)
+                        written += 1
+        return written
+
+
+__all__ = ["RML", "RR", "RMLPartitioner"]
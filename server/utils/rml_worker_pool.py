@@ -0,0 +1,425 @@
+import logging
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+
+class RMLWorkerError(Exception):
+    """
+    Raised when a worker could not run a job, the worker may have died
+    """
+
+
+class RMLWorkerStartError(RMLWorkerError):
+    """
+    Raised when a worker process does not come up
+    """
+
+
+class RMLWorker:
+    """
+    A long lived mapper JVM running RMLWorker.java. Jobs are sent over stdin
+    and answered over stdout, see RMLWorker.java for the protocol.
+    """
+
+    WORKER_SOURCE = Path(__file__).parent / "RMLWorker.java"
+
+    # Number of stderr lines kept to explain failed jobs
+    STDERR_LINES = 50
+
+    @staticmethod
+    def java_command(java_path: str, java_memory: str, mapper_bin: Path) -> list[str]:
+        """
+        Command starting RMLWorker.java in source file mode, which needs a JDK 11+
+
+        Args:
+            java_path (str): Java executable
+            java_memory (str): Maximum heap size, e.g. 2G
+            mapper_bin (Path): RMLMapper jar
+
+        Returns:
+            list[str]: The command
+        """
+        return [
+            java_path,
+            f"-Xmx{java_memory}",
+            "-cp",
+            str(mapper_bin),
+            str(RMLWorker.WORKER_SOURCE),
+        ]
+
+    def __init__(
+        self,
+        command: list[str],
+        startup_timeout: float = 60,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._stderr: deque[str] = deque(maxlen=self.STDERR_LINES)
+        self.last_used = time.monotonic()
+        # Set once stdout is closed, the process may not be reaped yet
+        self._exited = threading.Event()
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        except OSError as e:
+            raise RMLWorkerStartError(f"Failed to start mapper worker: {e}")
+
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+        try:
+            line = self._read(startup_timeout)
+        except TimeoutError:
+            line = None
+        if line != "READY":
+            self.kill()
+            raise RMLWorkerStartError(
+                f"Mapper worker did not start: {self._stderr_tail()}"
+            )
+        self.logger.info(f"Mapper worker {self.process.pid} started")
+
+    def _read_stdout(self) -> None:
+        assert self.process.stdout is not None
+        with self.process.stdout:
+            for line in self.process.stdout:
+                self._lines.put(line.rstrip("\r\n"))
+        self._exited.set()
+        self._lines.put(None)
+
+    def _read_stderr(self) -> None:
+        assert self.process.stderr is not None
+        with self.process.stderr:
+            for line in self.process.stderr:
+                self._stderr.append(line.rstrip("\r\n"))
+
+    def _read(self, timeout: float) -> str | None:
+        try:
+            return self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError
+
+    def _write(self, line: str) -> None:
+        assert self.process.stdin is not None
+        try:
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            raise RMLWorkerError(f"Mapper worker is not reachable: {e}")
+
+    def _stderr_tail(self) -> str:
+        return "\n".join(self._stderr)
+
+    def is_alive(self) -> bool:
+        return not self._exited.is_set() and self.process.poll() is None
+
+    def ping(self, timeout: float = 5) -> bool:
+        try:
+            self._write("PING")
+            while True:
+                line = self._read(timeout)
+                if line is None:
+                    return False
+                if line == "PONG":
+                    return True
+        except (RMLWorkerError, TimeoutError):
+            return False
+
+    def run(
+        self,
+        mapping_file: Path,
+        output_file: Path,
+        serialization: str,
+        timeout: float,
+    ) -> None:
+        """
+        Run a mapping on the worker
+
+        Args:
+            mapping_file (Path): RML mapping file
+            output_file (Path): File the RDF output is written to
+            serialization (str): Mapper serialization, e.g. turtle
+            timeout (float): Seconds to wait for the job
+
+        Raises:
+            TimeoutError: The job did not finish in time, the worker is still busy
+            RMLWorkerError: The job failed
+        """
+        job_id = uuid4().hex
+        self._stderr.clear()
+        self._write(f"{job_id}\t{mapping_file}\t{output_file}\t{serialization}")
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                line = self._read(max(0.0, deadline - time.monotonic()))
+                if line is None:
+                    raise RMLWorkerError(f"Mapper worker exited: {self._stderr_tail()}")
+                status, _, rest = line.partition(" ")
+                response_job_id, _, message = rest.partition(" ")
+                if response_job_id != job_id:
+                    continue
+                if status == "OK" and output_file.exists():
+                    return
+                raise RMLWorkerError(
+                    "\n".join(
+                        part
+                        for part in (message or "No output", self._stderr_tail())
+                        if part
+                    )
+                )
+        finally:
+            self.last_used = time.monotonic()
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        self.process.wait()
+        # stdout and stderr are closed by their reader threads
+        try:
+            assert self.process.stdin is not None
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        assert self.process.stdin is not None
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+
+@dataclass
+class RMLWorkerPoolStats:
+    """
+    Usage statistics of a worker pool
+
+    Attributes:
+        size (int): maximum number of workers
+        workers (int): number of started workers
+        busy (int): number of workers running a job
+        queued (int): number of jobs waiting for a worker
+        completed (int): number of succeeded jobs
+        failed (int): number of failed jobs, timeouts included
+        timeouts (int): number of jobs that ran out of time
+        restarts (int): number of workers started to replace a dead one
+        avg_wait_seconds (float): average time jobs waited for a worker
+        avg_run_seconds (float): average time jobs ran on a worker
+    """
+
+    size: int
+    workers: int
+    busy: int
+    queued: int
+    completed: int
+    failed: int
+    timeouts: int
+    restarts: int
+    avg_wait_seconds: float
+    avg_run_seconds: float
+
+    def to_dict(self):
+        return {
+            "size": self.size,
+            "workers": self.workers,
+            "busy": self.busy,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "avg_wait_seconds": self.avg_wait_seconds,
+            "avg_run_seconds": self.avg_run_seconds,
+        }
+
+
+class RMLWorkerPool:
+    """
+    Bounded pool of mapper workers. Workers are started on demand and kept
+    warm between jobs. A dead worker is replaced on its next checkout, an idle
+    worker is pinged before it gets a job, and a worker whose job times out is
+    killed since the mapper can not be interrupted.
+    """
+
+    # Idle seconds after which a worker is pinged before it gets a job
+    HEALTH_CHECK_INTERVAL = 30
+
+    def __init__(
+        self,
+        size: int,
+        worker_factory: Callable[[], RMLWorker],
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.size = size
+        self._worker_factory = worker_factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: list[RMLWorker] = []
+        self._workers = 0
+        self._busy = 0
+        self._queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._restarts = 0
+        self._lost = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+        self._closed = False
+
+    def _start_worker(self) -> RMLWorker:
+        worker = self._worker_factory()
+        with self._lock:
+            self._workers += 1
+            if self._lost:
+                self._lost -= 1
+                self._restarts += 1
+        return worker
+
+    def _discard(self, worker: RMLWorker) -> None:
+        worker.kill()
+        with self._lock:
+            self._workers -= 1
+            self._lost += 1
+
+    def _checkout(self) -> RMLWorker:
+        while True:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None:
+                return self._start_worker()
+            idle_time = time.monotonic() - worker.last_used
+            if worker.is_alive() and (
+                idle_time < self.HEALTH_CHECK_INTERVAL or worker.ping()
+            ):
+                return worker
+            self.logger.warning(
+                f"Mapper worker {worker.process.pid} is unhealthy, replacing it"
+            )
+            self._discard(worker)
+
+    def _checkin(self, worker: RMLWorker) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def warm_up(self) -> None:
+        """
+        Start all workers of the pool, workers that fail to start are skipped
+        """
+        started = []
+        for _ in range(self.size):
+            if not self._slots.acquire(blocking=False):
+                break
+            try:
+                started.append(self._checkout())
+            except RMLWorkerError as e:
+                self.logger.warning(f"Failed to warm up mapper worker: {e}")
+                self._slots.release()
+                break
+        for worker in started:
+            self._checkin(worker)
+            self._slots.release()
+
+    def run(
+        self,
+        mapping_file: Path,
+        output_file: Path,
+        serialization: str,
+        timeout: float,
+    ) -> None:
+        """
+        Run a mapping on the next free worker, waiting for one if all are busy
+
+        Raises:
+            TimeoutError: The job did not finish in time
+            RMLWorkerError: The job failed or no worker could be started
+        """
+        queued_at = time.monotonic()
+        with self._lock:
+            self._queued += 1
+        self._slots.acquire()
+        started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._busy += 1
+            self._wait_time += started_at - queued_at
+        succeeded = False
+        try:
+            worker = self._checkout()
+            try:
+                worker.run(mapping_file, output_file, serialization, timeout)
+                succeeded = True
+            except TimeoutError:
+                self.logger.error(
+                    f"Mapping timed out after {timeout}s, killing worker {worker.process.pid}"
+                )
+                with self._lock:
+                    self._timeouts += 1
+                self._discard(worker)
+                raise
+            except RMLWorkerError:
+                if not worker.is_alive():
+                    self._discard(worker)
+                else:
+                    self._checkin(worker)
+                raise
+            self._checkin(worker)
+        finally:
+            with self._lock:
+                self._busy -= 1
+                self._run_time += time.monotonic() - started_at
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            self._slots.release()
+
+    def stats(self) -> RMLWorkerPoolStats:
+        with self._lock:
+            finished = self._completed + self._failed
+            return RMLWorkerPoolStats(
+                size=self.size,
+                workers=self._workers,
+                busy=self._busy,
+                queued=self._queued,
+                completed=self._completed,
+                failed=self._failed,
+                timeouts=self._timeouts,
+                restarts=self._restarts,
+                avg_wait_seconds=self._wait_time / finished if finished else 0.0,
+                avg_run_seconds=self._run_time / finished if finished else 0.0,
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+__all__ = [
+    "RMLWorker",
+    "RMLWorkerError",
+    "RMLWorkerPool",
+    "RMLWorkerPoolStats",
+    "RMLWorkerStartError",
+]
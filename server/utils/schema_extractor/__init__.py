@@ -1,3 +1,5 @@
+from typing import BinaryIO
+
 from kink import inject
 
 from server.utils.schema_extractor.i_schema_extractor import (
@@ -27,7 +29,7 @@ class SchemaExtractor:
 
     def extract_schema(
         self,
-        file: bytes,
+        file: bytes | BinaryIO,
         file_extension: str,
     ):
         if file_extension not in self.type_mapping:
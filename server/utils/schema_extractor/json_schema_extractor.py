@@ -1,5 +1,6 @@
 import json
 from io import BytesIO
+from typing import BinaryIO
 
 from kink import inject
 
@@ -16,16 +17,15 @@ class JSONSchemaExtractor(ISchemaExtractor):
     ):
         super().__init__("JSON Schema Extractor", ["json"])
 
-    def read_file(self, file: bytes) -> list[dict]:
-        with BytesIO(file) as f:
-            data = json.load(f)
+    def read_file(self, file: bytes | BinaryIO) -> list[dict]:
+        data = json.load(BytesIO(file) if isinstance(file, bytes) else file)
 
-            if isinstance(data, dict):
-                raise ValueError(
-                    "The root path you provided does not return an array of" " objects"
-                )
+        if isinstance(data, dict):
+            raise ValueError(
+                "The root path you provided does not return an array of objects"
+            )
 
-            return data
+        return data
 
     def getPaths(self, obj, parent="") -> set:
         result = set()
@@ -41,7 +41,7 @@ class JSONSchemaExtractor(ISchemaExtractor):
 
     def extract_schema(
         self,
-        file: bytes,
+        file: bytes | BinaryIO,
         file_extension: str,
         name_prefix: str,
     ):
@@ -1,4 +1,5 @@
 from io import BytesIO
+from typing import BinaryIO
 
 import pandas as pd
 from kink import inject
@@ -24,21 +25,26 @@ class TabularSchemaExtractor(ISchemaExtractor):
             ],
         )
 
-    def read_file(self, file: bytes, file_extension: str) -> pd.DataFrame:
+    def read_file(self, file: bytes | BinaryIO, file_extension: str) -> pd.DataFrame:
+        buffer = BytesIO(file) if isinstance(file, bytes) else file
+
+        # Only the columns are used, rows of delimited files are not read
         if file_extension == "csv":
             return pd.read_csv(
-                BytesIO(file),
+                buffer,
+                nrows=0,
             )
 
         if file_extension == "tsv":
             return pd.read_csv(
-                BytesIO(file),
+                buffer,
                 sep="\t",
+                nrows=0,
             )
 
         if file_extension == "xls" or file_extension == "xlsx":
             df = pd.read_excel(
-                BytesIO(file),
+                buffer,
             )
 
             if len(df.sheet_names) > 1:
@@ -50,7 +56,7 @@ class TabularSchemaExtractor(ISchemaExtractor):
 
     def extract_schema(
         self,
-        file: bytes,
+        file: bytes | BinaryIO,
         file_extension: str,
         name_prefix: str,
     ):
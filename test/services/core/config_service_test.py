@@ -26,3 +26,18 @@ class ConfigServiceTestCases(TestCase):
         self.assertEqual("value", self.config_service.get("key"))
         self.config_service.delete("key")
         self.assertIsNone(self.config_service.get("key"))
+
+    def test_values_are_loaded_at_startup(self):
+        self.config_service.set("key", "value")
+
+        config_service = ConfigService(db_service=self.db_service)
+
+        self.assertEqual("value", config_service.get("key"))
+
+    def test_get_typed(self):
+        self.config_service.set("workers", "4")
+        self.config_service.set("invalid", "four")
+
+        self.assertEqual(4, self.config_service.get_typed("workers", int, 2))
+        self.assertEqual(2, self.config_service.get_typed("invalid", int, 2))
+        self.assertEqual(2, self.config_service.get_typed("missing", int, 2))
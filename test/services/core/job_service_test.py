@@ -0,0 +1,131 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from server.exceptions import ErrCodes, ServerException
+from server.models.job import Job
+from server.services.core.job_service import JobService
+from server.services.core.sqlite_db_service import DBService, JobStatus
+
+
+class TestJobService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # Jobs run on other threads, an in-memory database would not be shared
+        self.db_service = DBService.from_connection_string(
+            f"sqlite:///{Path(self.temp_dir.name) / 'db.sqlite'}"
+        )
+        config_service = MagicMock()
+        config_service.get_typed.return_value = 2
+        self.temp_file_service = MagicMock()
+        self.service = JobService(
+            self.db_service, config_service, self.temp_file_service
+        )
+        # Blocks jobs until the test is done with them
+        self.release = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.service.shutdown(wait=True)
+        self.db_service.dispose()
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def _wait(self, job: Job) -> Job:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            job = self.service.get_job(job.uuid)
+            if job.status.is_finished:
+                return job
+            time.sleep(0.01)
+        self.fail(f"Job {job.uuid} did not finish")
+
+    def test_succeeded_job_result(self):
+        def work(a, b):
+            self.service.report_progress(0.5, "halfway")
+            return {"sum": a + b}
+
+        job = self._wait(self.service.submit("sum", work, 1, b=2))
+
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.progress, 1.0)
+        self.assertIsNone(job.message)
+        self.assertEqual(self.service.get_job_result(job.uuid).value, {"sum": 3})
+
+    def test_nested_progress(self):
+        self.service.PROGRESS_INTERVAL = 0
+        reported = threading.Event()
+
+        def work():
+            with self.service.progress_range(0.5, 1.0):
+                with self.service.progress_range(0.0, 0.5):
+                    self.service.report_progress(0.5, "nested")
+            reported.set()
+            self.release.wait()
+
+        job = self.service.submit("nested", work)
+        self.assertTrue(reported.wait(10))
+
+        job = self.service.get_job(job.uuid)
+        self.assertEqual(job.progress, 0.625)
+        self.assertEqual(job.message, "nested")
+
+    def test_progress_is_throttled(self):
+        reported = threading.Event()
+
+        def work():
+            self.service.report_progress(0.25, "first")
+            self.service.report_progress(0.5, "second")
+            reported.set()
+            self.release.wait()
+
+        job = self.service.submit("throttled", work)
+        self.assertTrue(reported.wait(10))
+
+        job = self.service.get_job(job.uuid)
+        self.assertEqual((job.progress, job.message), (0.25, "first"))
+
+    def test_path_result(self):
+        path = Path(self.temp_dir.name) / "result.txt"
+
+        job = self._wait(self.service.submit("file", lambda: path))
+
+        self.assertEqual(self.service.get_job_result(job.uuid).path, path)
+        self.temp_file_service.release.assert_called_once_with(path, keep=True)
+
+    def test_failed_job(self):
+        def work():
+            raise ServerException("Workspace not found", ErrCodes.WORKSPACE_NOT_FOUND)
+
+        job = self._wait(self.service.submit("fail", work))
+
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.message, "Workspace not found")
+        self.assertEqual(job.err_code, ErrCodes.WORKSPACE_NOT_FOUND.value)
+        with self.assertRaises(ServerException) as context:
+            self.service.get_job_result(job.uuid)
+        self.assertEqual(context.exception.code, ErrCodes.JOB_NOT_FINISHED)
+
+    def test_fail_interrupted_jobs(self):
+        running = [self.service.submit("running", self.release.wait) for _ in range(2)]
+        pending = self.service.submit("pending", lambda: None)
+
+        self.assertEqual(self.service.fail_interrupted_jobs(), 3)
+
+        # Workers that start or finish afterwards do not flip the jobs back
+        self.release.set()
+        self.service.shutdown(wait=True)
+        for job in [*running, pending]:
+            self.assertEqual(self.service.get_job(job.uuid).status, JobStatus.FAILED)
+
+    def test_unknown_job(self):
+        with self.assertRaises(ServerException) as context:
+            self.service.get_job("unknown")
+        self.assertEqual(context.exception.code, ErrCodes.JOB_NOT_FOUND)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from server.services.core.config_service import ConfigService
+from server.services.core.temp_file_service import TempFileService
+from test import create_in_memory_db_service
+
+
+class TestTempFileService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_service = create_in_memory_db_service()
+        config_service = ConfigService(self.db_service)
+        config_service.set("temp_quota_mb", "1")
+        config_service.set("temp_max_age_hours", "1")
+        self.service = TempFileService(config_service, Path(self.temp_dir.name))
+
+    def tearDown(self) -> None:
+        self.db_service.dispose()
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def _create(self, name: str, size: int = 1) -> Path:
+        path = self.service.create_file(name)
+        path.write_bytes(b"x" * size)
+        return path
+
+    def test_release_deletes_file(self):
+        path = self._create("a.txt")
+
+        self.service.release(path)
+
+        self.assertFalse(path.exists())
+
+    def test_release_keep_retains_file(self):
+        path = self._create("a.txt")
+
+        self.service.release(path, keep=True)
+
+        self.assertTrue(path.exists())
+
+    def test_referenced_file_is_not_deleted(self):
+        path = self._create("a.txt")
+        self.service.acquire(path)
+
+        self.service.release(path)
+        self.assertTrue(path.exists())
+        self.assertEqual(self.service.sweep(max_age=0), 0)
+
+        self.service.release(path)
+        self.assertFalse(path.exists())
+
+    def test_quota_evicts_least_recently_used(self):
+        size = 400 * 1024
+        old = self._create("old.bin", size)
+        self.service.release(old, keep=True)
+        os.utime(old, (time.time() - 60, time.time() - 60))
+        time.sleep(0.01)
+        recent = self._create("recent.bin", size)
+        self.service.release(recent, keep=True)
+
+        self._create("new.bin", size)
+        evicted = self.service.enforce_quota()
+
+        self.assertEqual(evicted, 1)
+        self.assertFalse(old.exists())
+        self.assertTrue(recent.exists())
+
+    def test_hard_links_do_not_count_against_quota(self):
+        store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(store_dir.cleanup)
+        stored = Path(store_dir.name) / "stored.bin"
+        stored.write_bytes(b"x" * 800 * 1024)
+        linked = self.service.create_file("linked.bin")
+        os.link(stored, linked)
+        self.service.release(linked, keep=True)
+
+        self._create("new.bin", 800 * 1024)
+
+        self.assertEqual(self.service.enforce_quota(), 0)
+        self.assertTrue(linked.exists())
+
+    def test_sweep_removes_old_files(self):
+        old = Path(self.temp_dir.name) / "leftover.txt"
+        old.write_text("old")
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        recent = Path(self.temp_dir.name) / "recent.txt"
+        recent.write_text("recent")
+
+        self.assertEqual(self.service.sweep(), 1)
+
+        self.assertFalse(old.exists())
+        self.assertTrue(recent.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
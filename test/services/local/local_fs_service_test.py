@@ -1,149 +1,161 @@
-# import unittest
-# from hashlib import sha1
-# from pathlib import Path
-
-# from server.const.err_enums import ErrCodes
-# from server.exceptions import ServerException
-# from server.service_protocols.fs_service_protocol import (
-#     FileMetadata,
-# )
-# from server.services.local.local_fs_service import (
-#     LocalFSService,
-# )
-
-
-# class TestLocalFSService(unittest.TestCase):
-#     def setUp(self):
-#         self.app_dir = Path("./tmp")
-#         if self.app_dir.exists():
-#             raise Exception(
-#                 "The temporary directory already exists"
-#             )
-#         self.app_dir.mkdir(parents=True, exist_ok=True)
-#         self.service = LocalFSService(APP_DIR=self.app_dir)
-#         self.service._FILE_DIR = self.app_dir / "files"
-#         self.service._FILE_DIR.mkdir(
-#             parents=True, exist_ok=True
-#         )
-
-#     def tearDown(self):
-#         for file in self.service._FILE_DIR.iterdir():
-#             file.unlink()
-#         self.service._FILE_DIR.rmdir()
-#         self.app_dir.rmdir()
-
-#     def test_upload_file(self):
-#         name = "test.txt"
-#         content = b"Hello, World!"
-#         metadata = self.service.upload_file(name, content)
-
-#         self.assertEqual(metadata.name, name)
-#         self.assertEqual(metadata.stem, "test")
-#         self.assertEqual(metadata.suffix, "txt")
-#         self.assertEqual(
-#             metadata.hash, sha1(content).hexdigest()
-#         )
-#         self.assertTrue(
-#             (
-#                 self.service._FILE_DIR / metadata.uuid
-#             ).exists()
-#         )
-
-#     def test_delete_file_with_uuid(self):
-#         name = "test.txt"
-#         content = b"Hello, World!"
-#         metadata = self.service.upload_file(name, content)
-
-#         self.service.delete_file_with_uuid(metadata.uuid)
-#         self.assertFalse(
-#             (
-#                 self.service._FILE_DIR / metadata.uuid
-#             ).exists()
-#         )
-
-#     def test_delete_file_with_uuid_not_found(self):
-#         with self.assertRaises(ServerException) as context:
-#             self.service.delete_file_with_uuid(
-#                 "nonexistent_uuid"
-#             )
-#         self.assertEqual(
-#             context.exception.code, ErrCodes.FILE_NOT_FOUND
-#         )
-
-#     def test_download_file_with_uuid(self):
-#         name = "test.txt"
-#         content = b"Hello, World!"
-#         metadata = self.service.upload_file(name, content)
-
-#         downloaded_content = (
-#             self.service.download_file_with_uuid(
-#                 metadata.uuid
-#             )
-#         )
-#         self.assertEqual(downloaded_content, content)
-
-#     def test_download_file_with_uuid_not_found(self):
-#         with self.assertRaises(ServerException) as context:
-#             self.service.download_file_with_uuid(
-#                 "nonexistent_uuid"
-#             )
-#         self.assertEqual(
-#             context.exception.code, ErrCodes.FILE_NOT_FOUND
-#         )
-
-#     def test_download_file_with_metadata(self):
-#         name = "test.txt"
-#         content = b"Hello, World!"
-#         metadata = self.service.upload_file(name, content)
-
-#         downloaded_content = (
-#             self.service.download_file_with_metadata(
-#                 metadata
-#             )
-#         )
-#         self.assertEqual(downloaded_content, content)
-
-#     def test_download_file_with_metadata_not_found(
-#         self,
-#     ):
-#         metadata = FileMetadata(
-#             uuid="nonexistent_uuid",
-#             name="test.txt",
-#             stem="test",
-#             suffix="txt",
-#             hash="dummyhash",
-#         )
-#         with self.assertRaises(ServerException) as context:
-#             self.service.download_file_with_metadata(
-#                 metadata
-#             )
-#         self.assertEqual(
-#             context.exception.code,
-#             ErrCodes.FILE_NOT_FOUND,
-#         )
-
-#     def test_download_file_with_metadata_corrupted(
-#         self,
-#     ):
-#         name = "test.txt"
-#         content = b"Hello, World!"
-#         metadata = self.service.upload_file(name, content)
-
-#         # Corrupt the file
-#         with open(
-#             self.service._FILE_DIR / metadata.uuid, "wb"
-#         ) as f:
-#             f.write(b"Corrupted content")
-
-#         with self.assertRaises(ServerException) as context:
-#             self.service.download_file_with_metadata(
-#                 metadata
-#             )
-#         self.assertEqual(
-#             context.exception.code,
-#             ErrCodes.FILE_CORRUPTED,
-#         )
-
-
-# if __name__ == "__main__":
-#     unittest.main()
+import tempfile
+import unittest
+from hashlib import sha1
+from io import BytesIO
+from pathlib import Path
+
+from server.const.err_enums import ErrCodes
+from server.exceptions import ServerException
+from server.services.core.sqlite_db_service import DBService
+from server.services.local.local_fs_service import (
+    LocalFSService,
+)
+
+
+class TestLocalFSService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.app_dir = Path(self.temp_dir.name)
+        self.db_service = DBService.from_connection_string("sqlite:///:memory:")
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+
+    def tearDown(self):
+        self.db_service.dispose()
+        self.temp_dir.cleanup()
+
+    def _blobs(self) -> list[Path]:
+        return list((self.app_dir / "files" / "blobs").iterdir())
+
+    def test_upload_file(self):
+        name = "test.txt"
+        content = b"Hello, World!"
+        metadata = self.service.upload_file(name, content)
+
+        self.assertEqual(metadata.name, name)
+        self.assertEqual(metadata.stem, "test")
+        self.assertEqual(metadata.suffix, "txt")
+        self.assertEqual(metadata.hash, sha1(content).hexdigest())
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), content)
+
+    def test_upload_file_stream(self):
+        content = b"a,b\n" + b"1,2\n" * 1000
+        self.service.CHUNK_SIZE = 64
+
+        metadata = self.service.upload_file_stream("big.csv", BytesIO(content))
+
+        self.assertEqual(metadata.hash, sha1(content).hexdigest())
+        with self.service.open_file_with_uuid(metadata.uuid) as f:
+            self.assertEqual(f.read(), content)
+
+    def test_stream_of_stored_content_is_not_stored_again(self):
+        first = self.service.upload_file("a.csv", b"shared")
+
+        second = self.service.upload_file_stream("b.csv", BytesIO(b"shared"))
+
+        self.assertEqual(first.hash, second.hash)
+        self.assertEqual(len(self._blobs()), 1)
+
+    def test_map_file_with_uuid(self):
+        metadata = self.service.upload_file("a.json", b'[{"a": 1}]')
+        empty = self.service.upload_file("empty.json", b"")
+
+        with self.service.map_file_with_uuid(metadata.uuid) as view:
+            self.assertEqual(str(view, "utf-8"), '[{"a": 1}]')
+        with self.service.map_file_with_uuid(empty.uuid) as view:
+            self.assertEqual(len(view), 0)
+
+    def test_link_file_with_uuid(self):
+        metadata = self.service.upload_file("a.csv", b"a,b\n1,2\n")
+        destination = self.app_dir / "source.csv"
+        destination.write_bytes(b"stale")
+
+        self.service.link_file_with_uuid(metadata.uuid, destination)
+
+        self.assertEqual(destination.read_bytes(), b"a,b\n1,2\n")
+        self.assertTrue(
+            destination.samefile(self.service.provide_file_path_of_uuid(metadata.uuid))
+        )
+        self.assertEqual(destination.stat().st_mode & 0o222, 0)
+
+        self.service.delete_file_with_uuid(metadata.uuid)
+        self.assertEqual(self._blobs(), [])
+
+    def test_bulk_downloads(self):
+        self.service.QUERY_BATCH_SIZE = 2
+        files = [
+            self.service.upload_file(f"{i}.txt", f"{i}".encode()) for i in range(5)
+        ]
+        uuids = [file.uuid for file in files]
+
+        metadata = self.service.get_file_metadata_by_uuids([*uuids, "missing"])
+        contents = self.service.download_files_with_uuids([*uuids, "missing"])
+
+        self.assertEqual(metadata, {file.uuid: file for file in files})
+        self.assertEqual(contents, {file.uuid: file.name[0].encode() for file in files})
+        self.assertEqual(self.service.download_files_with_uuids([]), {})
+
+    def test_identical_contents_share_a_blob(self):
+        first = self.service.upload_file("a.csv", b"a,b\n1,2\n")
+        second = self.service.upload_file("b.csv", b"a,b\n1,2\n")
+
+        self.assertNotEqual(first.uuid, second.uuid)
+        self.assertEqual(len(self._blobs()), 1)
+        self.assertEqual(
+            self.service.provide_file_path_of_uuid(first.uuid),
+            self.service.provide_file_path_of_uuid(second.uuid),
+        )
+
+    def test_blob_is_deleted_with_its_last_reference(self):
+        first = self.service.upload_file("a.csv", b"shared")
+        second = self.service.upload_file("b.csv", b"shared")
+
+        self.service.delete_file_with_uuid(first.uuid)
+        self.assertEqual(self.service.download_file_with_uuid(second.uuid), b"shared")
+
+        self.service.delete_file_with_uuid(second.uuid)
+        self.assertEqual(self._blobs(), [])
+
+    def test_overwrite_releases_previous_blob(self):
+        metadata = self.service.upload_file("a.txt", b"old")
+
+        self.service.upload_file(
+            "a.txt", b"new", uuid=metadata.uuid, allow_overwrite=True
+        )
+
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), b"new")
+        self.assertEqual(len(self._blobs()), 1)
+
+    def test_upload_existing_uuid_without_overwrite(self):
+        metadata = self.service.upload_file("a.txt", b"content")
+
+        with self.assertRaises(ServerException) as context:
+            self.service.upload_file("a.txt", b"other", uuid=metadata.uuid)
+        self.assertEqual(context.exception.code, ErrCodes.FILE_EXISTS)
+
+    def test_delete_file_with_uuid_not_found(self):
+        with self.assertRaises(ServerException) as context:
+            self.service.delete_file_with_uuid("nonexistent_uuid")
+        self.assertEqual(context.exception.code, ErrCodes.FILE_NOT_FOUND)
+
+    def test_download_file_with_uuid_not_found(self):
+        with self.assertRaises(ServerException) as context:
+            self.service.download_file_with_uuid("nonexistent_uuid")
+        self.assertEqual(context.exception.code, ErrCodes.FILE_NOT_FOUND)
+
+    def test_files_stored_by_uuid_are_migrated(self):
+        first = self.service.upload_file("a.txt", b"legacy")
+        second = self.service.upload_file("b.txt", b"legacy")
+        for blob in self._blobs():
+            blob.unlink()
+        (self.app_dir / "files" / first.uuid).write_bytes(b"legacy")
+        (self.app_dir / "files" / second.uuid).write_bytes(b"legacy")
+
+        service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+
+        self.assertEqual(len(self._blobs()), 1)
+        self.assertFalse((self.app_dir / "files" / first.uuid).exists())
+        self.assertEqual(service.download_file_with_uuid(second.uuid), b"legacy")
+
+
+if __name__ == "__main__":
+    unittest.main()
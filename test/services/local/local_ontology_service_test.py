@@ -0,0 +1,351 @@
+import json
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from sqlalchemy import select, update
+
+from server.exceptions import ErrCodes, ServerException
+from server.models.ontology import NamedNodeType, OntologyIndex, OntologyInput
+from server.service_protocols.job_service_protocol import JobServiceProtocol
+from server.service_protocols.ontology_indexing_service_protocol import (
+    OntologyIndexingServiceProtocol,
+)
+from server.services.core.ontology_indexing_service import _index_ontology_worker
+from server.services.core.sqlite_db_service import (
+    OntologyIndexCacheTable,
+    OntologyTable,
+    OntologyTermTable,
+)
+from server.services.local.local_fs_service import LocalFSService
+from server.services.local.local_ontology_service import LocalOntologyService
+from server.utils.ontology_indexer import OntologyIndexer
+from test import create_in_memory_db_service
+
+
+def _index_in_process(ontologies: list[OntologyInput]) -> list[OntologyIndex]:
+    return [
+        OntologyIndex.from_dict(
+            json.loads(
+                _index_ontology_worker(
+                    ontology.base_uri,
+                    ontology.content,
+                    str(ontology.file_path) if ontology.file_path else None,
+                    ontology.file_name,
+                )
+            )
+        )
+        for ontology in ontologies
+    ]
+
+
+class TestLocalOntologyService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_service = create_in_memory_db_service()
+        self.fs_service = LocalFSService(Path(self.temp_dir.name), self.db_service)
+        self.indexing_service = MagicMock(spec=OntologyIndexingServiceProtocol)
+        self.indexing_service.index_ontologies.side_effect = _index_in_process
+        self.job_service = MagicMock(spec=JobServiceProtocol)
+        self.service = LocalOntologyService(
+            self.fs_service, self.indexing_service, self.db_service, self.job_service
+        )
+        self.content = Path("test/test_assets/test_ontology.ttl").read_bytes()
+
+    def tearDown(self) -> None:
+        self.db_service.dispose()
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def _cache_entries(self) -> list[OntologyIndexCacheTable]:
+        with self.db_service.get_session() as session:
+            return [row[0] for row in session.execute(select(OntologyIndexCacheTable))]
+
+    def test_index_is_reused_for_same_content(self):
+        first = self.service.create_ontology(
+            "first", "", "http://example.org/ontology", self.content
+        )
+        second = self.service.create_ontology(
+            "second", "", "http://example.org/other", self.content
+        )
+
+        self.indexing_service.index_ontologies.assert_called_once()
+        self.assertEqual(len(self._cache_entries()), 1)
+        self.assertEqual(
+            [cls.full_uri for cls in first.classes],
+            [cls.full_uri for cls in second.classes],
+        )
+        self.assertTrue(
+            all(cls.belongs_to == "http://example.org/other" for cls in second.classes)
+        )
+
+    def test_duplicate_contents_are_indexed_once(self):
+        ontologies = self.service.create_ontologies(
+            [
+                OntologyInput(
+                    name=name,
+                    description="",
+                    base_uri="http://example.org/ontology",
+                    content=self.content,
+                )
+                for name in ("first", "second")
+            ]
+        )
+
+        self.assertEqual(len(ontologies), 2)
+        (ontologies_to_index,) = self.indexing_service.index_ontologies.call_args.args
+        self.assertEqual(len(ontologies_to_index), 1)
+        # One content is indexed, then both ontologies are saved
+        self.assertEqual(
+            [c.args for c in self.job_service.report_progress.call_args_list],
+            [
+                (0.0, "Indexing 1 ontology contents"),
+                (2 / 3, "Created ontology first"),
+                (1.0, "Created ontology second"),
+            ],
+        )
+
+    def test_stored_file_is_used_as_ontology_file(self):
+        stored = self.fs_service.upload_file("ontology.ttl", self.content)
+
+        (ontology,) = self.service.create_ontologies(
+            [
+                OntologyInput(
+                    name="ontology",
+                    description="",
+                    base_uri="http://example.org/ontology",
+                    file_name="ontology.ttl",
+                    file_uuid=stored.uuid,
+                )
+            ]
+        )
+
+        self.assertEqual(ontology.file_uuid, stored.uuid)
+        self.assertGreater(len(ontology.classes), 0)
+
+    def test_imported_index_is_used_instead_of_indexing(self):
+        exported = self.service.create_ontology(
+            "exported", "", "http://example.org/ontology", self.content
+        )
+        content_hash = self.fs_service.get_file_metadata_by_uuid(
+            exported.file_uuid
+        ).hash
+        (index_file_uuid,) = self.service.get_index_file_uuids([content_hash]).values()
+        index = self.fs_service.download_file_with_uuid(index_file_uuid)
+        self.service.delete_ontology(exported.uuid)
+        self.assertEqual(self.service.get_index_file_uuids([content_hash]), {})
+        self.indexing_service.index_ontologies.reset_mock()
+
+        self.service.import_index(content_hash, BytesIO(index), OntologyIndexer.VERSION)
+        imported = self.service.create_ontology(
+            "imported", "", "http://example.org/other", self.content
+        )
+
+        self.indexing_service.index_ontologies.assert_not_called()
+        self.assertEqual(
+            [c.full_uri for c in imported.classes],
+            [c.full_uri for c in exported.classes],
+        )
+        self.assertTrue(
+            all(c.belongs_to == "http://example.org/other" for c in imported.classes)
+        )
+
+    def test_invalid_imported_index_is_rejected(self):
+        content_hash = "0" * 40
+        index = json.dumps({"classes": [], "individuals": [], "properties": []})
+
+        for payload, version in [
+            (b"{", OntologyIndexer.VERSION),
+            (b'{"classes": [{}]}', OntologyIndexer.VERSION),
+            (index.encode("utf-8"), OntologyIndexer.VERSION + 1),
+        ]:
+            with self.subTest(payload=payload, version=version):
+                with self.assertRaises(ServerException) as context:
+                    self.service.import_index(content_hash, BytesIO(payload), version)
+                self.assertEqual(
+                    context.exception.code, ErrCodes.ONTOLOGY_INDEX_INVALID
+                )
+
+        self.assertEqual(self._cache_entries(), [])
+
+    def test_corrupt_cached_index_is_reindexed(self):
+        self.service.create_ontology(
+            "first", "", "http://example.org/ontology", self.content
+        )
+        self.assertEqual(len(self._cache_entries()), 1)
+        corrupt = self.fs_service.upload_file("corrupt.index.json", b'{"classes"')
+        with self.db_service.get_session() as session:
+            session.execute(
+                update(OntologyIndexCacheTable).values(index_file_uuid=corrupt.uuid)
+            )
+            session.commit()
+        self.indexing_service.index_ontologies.reset_mock()
+
+        second = self.service.create_ontology(
+            "second", "", "http://example.org/ontology", self.content
+        )
+
+        self.indexing_service.index_ontologies.assert_called_once()
+        self.assertGreater(len(second.classes), 0)
+        (reindexed,) = self._cache_entries()
+        self.assertNotEqual(reindexed.index_file_uuid, corrupt.uuid)
+        with self.assertRaises(ServerException):
+            self.fs_service.get_file_metadata_by_uuid(corrupt.uuid)
+
+    def test_unreferenced_index_is_collected(self):
+        first = self.service.create_ontology(
+            "first", "", "http://example.org/ontology", self.content
+        )
+        second = self.service.create_ontology(
+            "second", "", "http://example.org/ontology", self.content
+        )
+
+        self.service.delete_ontology(first.uuid)
+        self.assertEqual(len(self._cache_entries()), 1)
+
+        self.service.delete_ontology(second.uuid)
+        self.assertEqual(len(self._cache_entries()), 0)
+
+    def test_search_terms(self):
+        ontology = self.service.create_ontology(
+            "ontology", "", "http://example.org/ontology", self.content
+        )
+
+        terms = self.service.search_terms([ontology.uuid], "hasN")
+        self.assertEqual(
+            [term.full_uri for term in terms],
+            ["http://example.org/ontology#hasName"],
+        )
+
+        terms = self.service.search_terms(
+            [ontology.uuid], "ev", term_type=NamedNodeType.CLASS
+        )
+        self.assertEqual(
+            [term.full_uri for term in terms],
+            ["http://example.org/ontology#House"],
+        )
+
+        self.assertEqual(self.service.search_terms([ontology.uuid], '" OR *'), [])
+        self.assertEqual(self.service.search_terms(["unknown"], "house"), [])
+
+    def test_search_pages_results(self):
+        ontology = self.service.create_ontology(
+            "ontology", "", "http://example.org/ontology", self.content
+        )
+
+        first_page = self.service.search_terms([ontology.uuid], "has", limit=2)
+        second_page = self.service.search_terms(
+            [ontology.uuid], "has", limit=2, offset=2
+        )
+
+        self.assertEqual(len(first_page), 2)
+        self.assertEqual(len(second_page), 1)
+        self.assertNotIn(
+            second_page[0].full_uri, [term.full_uri for term in first_page]
+        )
+
+    def test_terms_of_existing_ontologies_are_stored_on_search(self):
+        ontology = self.service.create_ontology(
+            "ontology", "", "http://example.org/ontology", self.content
+        )
+        with self.db_service.get_session() as session:
+            session.query(OntologyTermTable).delete()
+            session.execute(update(OntologyTable).values(term_count=None))
+            session.commit()
+
+        terms = self.service.search_terms([ontology.uuid], "john")
+
+        self.assertEqual(
+            [term.full_uri for term in terms],
+            ["http://example.org/ontology#John"],
+        )
+
+    def test_get_ontology_summaries(self):
+        first = self.service.create_ontology(
+            "first", "First", "http://example.org/first", self.content
+        )
+        second = self.service.create_ontology(
+            "second", "Second", "http://example.org/second", self.content
+        )
+        # Ontologies created before the summary columns read them once
+        with self.db_service.get_session() as session:
+            session.execute(
+                update(OntologyTable)
+                .where(OntologyTable.uuid == second.uuid)
+                .values(description=None, base_uri=None)
+            )
+            session.commit()
+
+        summaries = self.service.get_ontology_summaries([second.uuid, first.uuid])
+
+        self.assertEqual(
+            [(s.uuid, s.file_uuid, s.description, s.base_uri) for s in summaries],
+            [
+                (second.uuid, second.file_uuid, "Second", "http://example.org/second"),
+                (first.uuid, first.file_uuid, "First", "http://example.org/first"),
+            ],
+        )
+        with self.db_service.get_session() as session:
+            self.assertEqual(
+                session.get(OntologyTable, second.uuid).base_uri,
+                "http://example.org/second",
+            )
+        with self.assertRaises(ServerException) as context:
+            self.service.get_ontology_summaries(["unknown"])
+        self.assertEqual(context.exception.code, ErrCodes.ONTOLOGY_NOT_FOUND)
+
+    def test_terms_are_deleted_with_ontology(self):
+        ontology = self.service.create_ontology(
+            "ontology", "", "http://example.org/ontology", self.content
+        )
+
+        self.service.delete_ontology(ontology.uuid)
+
+        with self.db_service.get_session() as session:
+            self.assertEqual(session.query(OntologyTermTable).count(), 0)
+
+    def test_get_ontology_terms_pages_with_cursor(self):
+        ontology = self.service.create_ontology(
+            "ontology", "", "http://example.org/ontology", self.content
+        )
+
+        full_uris = []
+        cursor = None
+        while True:
+            page = self.service.get_ontology_terms(
+                [ontology.uuid],
+                term_type=NamedNodeType.CLASS,
+                cursor=cursor,
+                limit=4,
+            )
+            full_uris.extend(item["full_uri"] for item in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(full_uris, [cls.full_uri for cls in ontology.classes])
+
+    def test_get_ontology_terms_projects_fields(self):
+        ontology = self.service.create_ontology(
+            "ontology", "", "http://example.org/ontology", self.content
+        )
+
+        page = self.service.get_ontology_terms(
+            [ontology.uuid],
+            term_type=NamedNodeType.PROPERTY,
+            fields=["full_uri", "label"],
+        )
+
+        self.assertEqual(len(page.items), 3)
+        self.assertEqual(set(page.items[0]), {"full_uri", "label"})
+        self.assertIsNone(page.next_cursor)
+
+        with self.assertRaises(ServerException) as context:
+            self.service.get_ontology_terms([ontology.uuid], fields=["unknown"])
+        self.assertEqual(context.exception.code, ErrCodes.ONTOLOGY_INVALID_FIELD)
+
+
+if __name__ == "__main__":
+    unittest.main()
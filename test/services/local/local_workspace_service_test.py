@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from server.models.workspace import WorkspaceModel
+from server.services.core.sqlite_db_service.tables.workspace_metadata import (
+    WorkspaceType,
+)
+from server.services.local.local_fs_service import LocalFSService
+from server.services.local.local_workspace_service import LocalWorkspaceService
+from test import create_in_memory_db_service
+
+
+class TestLocalWorkspaceService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_service = create_in_memory_db_service()
+        self.fs_service = LocalFSService(
+            APP_DIR=Path(self.temp_dir.name), db_service=self.db_service
+        )
+        self.service = LocalWorkspaceService(self.fs_service)
+
+    def tearDown(self):
+        self.db_service.dispose()
+        self.temp_dir.cleanup()
+
+    def _create(self, uuid: str) -> WorkspaceModel:
+        workspace = WorkspaceModel.create_with_defaults(
+            uuid=uuid,
+            name=uuid,
+            description="",
+            type=WorkspaceType.LOCAL,
+            location=uuid,
+        )
+        self.service.create_workspace(workspace)
+        return workspace
+
+    def test_get_workspaces(self):
+        first = self._create("first")
+        second = self._create("second")
+        self.fs_service.upload_file("broken", b"{", uuid="broken")
+        # Workspaces missing from the cache are read from their files
+        self.service._cache.clear()
+        self.service.get_workspace("second")
+
+        workspaces = self.service.get_workspaces(
+            ["second", "missing", "broken", "first"]
+        )
+
+        self.assertEqual(workspaces, [second, first])
+
+    def test_returned_workspaces_are_copies(self):
+        self._create("workspace")
+
+        self.service.get_workspace("workspace").mappings.append("mapping")
+        self.service.get_workspaces(["workspace"])[0].ontologies.append("ontology")
+
+        workspace = self.service.get_workspace("workspace")
+        self.assertEqual(workspace.mappings, [])
+        self.assertEqual(workspace.ontologies, [])
+
+    def test_update_is_seen_by_later_reads(self):
+        workspace = self._create("workspace")
+
+        self.service.update_workspace(workspace.copy_with(name="renamed"))
+
+        self.assertEqual(self.service.get_workspace("workspace").name, "renamed")
+        self.assertEqual(self.service.get_workspaces(["workspace"])[0].name, "renamed")
+
+
+if __name__ == "__main__":
+    unittest.main()
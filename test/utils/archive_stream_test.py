@@ -0,0 +1,112 @@
+import os
+import tarfile
+import tempfile
+import unittest
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+
+from server.exceptions import ErrCodes, ServerException
+from server.utils import archive_stream
+from server.utils.archive_stream import ArchiveCodec, ArchiveStream, open_archive
+
+
+class TestArchiveStream(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.stored = Path(self.temp_dir.name) / "stored.csv"
+        self.stored.write_bytes(os.urandom(300_000))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _archive(self, codec: ArchiveCodec) -> ArchiveStream:
+        archive = ArchiveStream("export", codec=codec)
+        archive.add_bytes("metadata.json", b"{}")
+        archive.add_directory("files/")
+        archive.add_file("files/a", partial(open, self.stored, "rb"))
+        archive.add_link("files/b", "files/a")
+        return archive
+
+    def _assert_members(self, tar: tarfile.TarFile) -> None:
+        self.assertEqual(tar.extractfile("metadata.json").read(), b"{}")  # type: ignore
+        self.assertEqual(
+            tar.extractfile("files/b").read(),  # type: ignore
+            self.stored.read_bytes(),
+        )
+
+    def test_streamed_archives_can_be_opened(self):
+        for codec in (ArchiveCodec.GZIP, ArchiveCodec.NONE):
+            with self.subTest(codec=codec):
+                archive = self._archive(codec)
+                chunks = list(archive)
+
+                self.assertGreater(len(chunks), 1)
+                self.assertTrue(archive.filename.endswith(codec.suffix))
+                with open_archive(BytesIO(b"".join(chunks))) as tar:
+                    self._assert_members(tar)
+
+    def test_write_to(self):
+        path = Path(self.temp_dir.name) / "export.tar.gz"
+
+        self._archive(ArchiveCodec.GZIP).write_to(path)
+
+        with open(path, "rb") as f, open_archive(f) as tar:
+            self._assert_members(tar)
+
+    def test_members_are_dated(self):
+        archive = self._archive(ArchiveCodec.NONE)
+
+        with open_archive(BytesIO(b"".join(archive))) as tar:
+            members = {member.name: member.mtime for member in tar}
+
+        self.assertEqual(members["files/a"], int(self.stored.stat().st_mtime))
+        self.assertTrue(all(mtime > 0 for mtime in members.values()))
+
+    def test_streamed_archives_can_be_read_in_order(self):
+        archive = self._archive(ArchiveCodec.GZIP)
+
+        with open_archive(BytesIO(b"".join(archive)), stream=True) as tar:
+            self.assertEqual(
+                [member.name for member in tar],
+                ["metadata.json", "files", "files/a", "files/b"],
+            )
+
+    def test_write_to_reports_progress(self):
+        path = Path(self.temp_dir.name) / "export.tar"
+        progress = []
+
+        self._archive(ArchiveCodec.NONE).write_to(
+            path, lambda written, members: progress.append((written, members))
+        )
+
+        self.assertEqual(progress, [(1, 4), (2, 4), (3, 4), (4, 4)])
+
+    def test_files_are_opened_when_streamed(self):
+        archive = ArchiveStream("export")
+        archive.add_file("missing", partial(open, self.stored.with_name("x"), "rb"))
+
+        with self.assertRaises(FileNotFoundError):
+            list(archive)
+
+    def test_invalid_level(self):
+        with self.assertRaises(ServerException) as context:
+            ArchiveStream("export", codec=ArchiveCodec.GZIP, level=10)
+        self.assertEqual(context.exception.code, ErrCodes.ARCHIVE_LEVEL_INVALID)
+
+    @unittest.skipIf(archive_stream.zstandard is not None, "zstandard is installed")
+    def test_zstd_without_zstandard(self):
+        with self.assertRaises(ServerException) as context:
+            ArchiveStream("export", codec=ArchiveCodec.ZSTD)
+        self.assertEqual(context.exception.code, ErrCodes.ARCHIVE_CODEC_NOT_AVAILABLE)
+
+    @unittest.skipIf(archive_stream.zstandard is None, "zstandard is not installed")
+    def test_zstd_archives_can_be_opened(self):
+        archive = self._archive(ArchiveCodec.ZSTD)
+
+        with open_archive(BytesIO(b"".join(archive))) as tar:
+            self._assert_members(tar)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from rdflib import BNode
+
+from server.models.ontology import Class
+from server.utils.class_hierarchy import ClassHierarchy
+
+
+class TestClassHierarchy(unittest.TestCase):
+    def test_transitive_ancestors(self):
+        hierarchy = ClassHierarchy(
+            {
+                "D": ["C"],
+                "C": ["B", "E"],
+                "B": ["A"],
+            }
+        )
+
+        self.assertEqual(hierarchy.ancestors("D"), ["C", "B", "E", "A"])
+        self.assertEqual(hierarchy.ancestors("A"), [])
+        self.assertEqual(hierarchy.ancestors("unknown"), [])
+
+    def test_cycles_share_ancestors(self):
+        hierarchy = ClassHierarchy(
+            {
+                "A": ["B"],
+                "B": ["C"],
+                "C": ["A", "Root"],
+                "Leaf": ["A"],
+            }
+        )
+
+        self.assertEqual(set(hierarchy.ancestors("A")), {"B", "C", "Root"})
+        self.assertEqual(set(hierarchy.ancestors("B")), {"A", "C", "Root"})
+        self.assertEqual(set(hierarchy.ancestors("Leaf")), {"A", "B", "C", "Root"})
+        self.assertTrue(hierarchy.is_subclass_of("A", "C"))
+        self.assertTrue(hierarchy.is_subclass_of("C", "A"))
+
+    def test_blank_nodes_are_traversed_but_hidden(self):
+        anonymous = BNode()
+        hierarchy = ClassHierarchy(
+            {
+                "Child": [anonymous],
+                anonymous: ["Parent"],
+            }
+        )
+
+        self.assertEqual(hierarchy.ancestors("Child"), ["Parent"])
+        self.assertTrue(hierarchy.is_subclass_of("Child", "Parent"))
+
+    def test_subsumption(self):
+        hierarchy = ClassHierarchy.from_classes(
+            [
+                Class(
+                    belongs_to="http://example.org/ontology",
+                    full_uri="http://example.org/ontology#Car",
+                    label=[],
+                    description=[],
+                    super_classes=["http://example.org/ontology#Vehicle"],
+                    is_deprecated=False,
+                )
+            ]
+        )
+
+        self.assertTrue(
+            hierarchy.is_subclass_of(
+                "http://example.org/ontology#Car",
+                "http://example.org/ontology#Vehicle",
+            )
+        )
+        self.assertFalse(
+            hierarchy.is_subclass_of(
+                "http://example.org/ontology#Vehicle",
+                "http://example.org/ontology#Car",
+            )
+        )
+        self.assertTrue(
+            hierarchy.is_subclass_of(
+                "http://example.org/ontology#Car",
+                "http://example.org/ontology#Car",
+            )
+        )
+
+    def test_deep_hierarchy(self):
+        depth = 1000
+        hierarchy = ClassHierarchy(
+            {f"C{index}": [f"C{index - 1}"] for index in range(1, depth)}
+        )
+
+        self.assertEqual(len(hierarchy.ancestors(f"C{depth - 1}")), depth - 1)
+        self.assertTrue(hierarchy.is_subclass_of(f"C{depth - 1}", "C0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from server.models.workspace import WorkspaceModel
+from server.services.core.sqlite_db_service.tables.workspace_metadata import (
+    WorkspaceType,
+)
+from server.utils.object_cache import ObjectCache
+
+
+class TestObjectCache(unittest.TestCase):
+    def setUp(self):
+        self.workspace = WorkspaceModel.create_with_defaults(
+            uuid="w",
+            name="Workspace",
+            description="",
+            type=WorkspaceType.LOCAL,
+            location="w",
+        )
+
+    def test_hits_are_copies(self):
+        cache: ObjectCache[WorkspaceModel] = ObjectCache(2)
+        cache.put("w", "v1", self.workspace)
+        self.workspace.mappings.append("changed after put")
+
+        first = cache.get("w", "v1")
+        assert first is not None
+        first.mappings.append("changed by a reader")
+
+        self.assertEqual(cache.get("w", "v1").mappings, [])  # type: ignore
+
+    def test_stale_version_misses(self):
+        cache: ObjectCache[WorkspaceModel] = ObjectCache(2)
+        cache.put("w", "v1", self.workspace)
+
+        self.assertIsNone(cache.get("w", "v2"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_is_dropped(self):
+        cache: ObjectCache[str] = ObjectCache(2)
+        cache.put("a", "v", "a")
+        cache.put("b", "v", "b")
+        cache.get("a", "v")
+        cache.put("c", "v", "c")
+
+        self.assertIsNone(cache.get("b", "v"))
+        self.assertEqual(cache.get("a", "v"), "a")
+        self.assertEqual(cache.get("c", "v"), "c")
+
+    def test_invalidate(self):
+        cache: ObjectCache[str] = ObjectCache(2)
+        cache.put("a", "v", "a")
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        self.assertIsNone(cache.get("a", "v"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,15 @@
+import tempfile
 import unittest
 from pathlib import Path
 
-from rdflib import Graph
+from rdflib import RDFS, Graph, Literal, URIRef
 
 from server.models.ontology import (
     Class,
+    PropertyType,
 )
-from server.utils.ontology_indexer import OntologyIndexer
+from server.services.core.ontology_indexing_service import _index_ontology_file
+from server.utils.ontology_indexer import OntologyIndexer, OntologyTermAccumulator
 from server.utils.rdf_loader import RDFLoader
 
 """
@@ -79,18 +82,16 @@ class TestOntologyIndexer(unittest.TestCase):
         classes: list[Class] = self.indexer.get_classes(self.ontology_uri, self.graph)
         self.assertEqual(len(classes), 6)
 
-        expected_full_uris = set(
-            [
-                "http://example.org/ontology#LivingThing",
-                "http://example.org/ontology#InanimateObject",
-                "http://example.org/ontology#Person",
-                "http://example.org/ontology#Animal",
-                "http://example.org/ontology#Car",
-                "http://example.org/ontology#House",
-            ]
-        )
+        expected_full_uris = {
+            "http://example.org/ontology#LivingThing",
+            "http://example.org/ontology#InanimateObject",
+            "http://example.org/ontology#Person",
+            "http://example.org/ontology#Animal",
+            "http://example.org/ontology#Car",
+            "http://example.org/ontology#House",
+        }
 
-        found_full_uris = set([str(cls.full_uri) for cls in classes])
+        found_full_uris = {str(cls.full_uri) for cls in classes}
 
         self.assertEqual(expected_full_uris, found_full_uris)
 
@@ -98,15 +99,13 @@ class TestOntologyIndexer(unittest.TestCase):
         properties = self.indexer.get_properties(self.ontology_uri, self.graph)
         self.assertEqual(len(properties), 3)
 
-        expected_full_uris = set(
-            [
-                "http://example.org/ontology#hasName",
-                "http://example.org/ontology#hasAge",
-                "http://example.org/ontology#hasColor",
-            ]
-        )
+        expected_full_uris = {
+            "http://example.org/ontology#hasName",
+            "http://example.org/ontology#hasAge",
+            "http://example.org/ontology#hasColor",
+        }
 
-        found_full_uris = set([str(prop.full_uri) for prop in properties])
+        found_full_uris = {str(prop.full_uri) for prop in properties}
 
         self.assertEqual(expected_full_uris, found_full_uris)
 
@@ -119,18 +118,130 @@ class TestOntologyIndexer(unittest.TestCase):
         individuals = self.indexer.get_individuals(self.ontology_uri, self.graph)
         self.assertEqual(len(individuals), 4)
 
-        expected_full_uris = set(
+        expected_full_uris = {
+            "http://example.org/ontology#John",
+            "http://example.org/ontology#Rover",
+            "http://example.org/ontology#Toyota",
+            "http://example.org/ontology#WhiteHouse",
+        }
+
+        found_full_uris = {str(ind.full_uri) for ind in individuals}
+
+        self.assertEqual(expected_full_uris, found_full_uris)
+
+    def test_class_labels_and_deprecation(self):
+        classes = {
+            cls.full_uri: cls
+            for cls in self.indexer.get_classes(self.ontology_uri, self.graph)
+        }
+        house = classes["http://example.org/ontology#House"]
+
+        self.assertTrue(house.is_deprecated)
+        self.assertFalse(classes["http://example.org/ontology#Car"].is_deprecated)
+        self.assertEqual(
+            {(label.value, label.language) for label in house.label},
+            {("House", "en"), ("Ev", "tr")},
+        )
+        self.assertEqual(len(house.description), 2)
+
+    def test_index_matches_individual_getters(self):
+        index = self.indexer.index(self.ontology_uri, self.graph)
+
+        self.assertEqual(
+            [cls.to_dict() for cls in index.classes],
             [
-                "http://example.org/ontology#John",
-                "http://example.org/ontology#Rover",
-                "http://example.org/ontology#Toyota",
-                "http://example.org/ontology#WhiteHouse",
-            ]
+                cls.to_dict()
+                for cls in self.indexer.get_classes(self.ontology_uri, self.graph)
+            ],
         )
+        self.assertEqual(len(index.properties), 3)
+        self.assertEqual(len(index.individuals), 4)
 
-        found_full_uris = set([str(ind.full_uri) for ind in individuals])
+    def test_annotations_are_only_kept_for_terms(self):
+        row = URIRef("http://example.org/data/1")
+        self.graph.add((row, RDFS.label, Literal("row")))
+        accumulator = OntologyTermAccumulator()
 
-        self.assertEqual(expected_full_uris, found_full_uris)
+        accumulator.add_graph(self.graph)
+
+        self.assertNotIn(row, accumulator.labels)
+        self.assertTrue(all(accumulator.is_term(s) for s in accumulator.labels))
+
+    def test_streamed_index_matches_graph_index(self):
+        # Annotations before the type triples are found by the second pass
+        lines = sorted(
+            self.graph.serialize(format="nt").splitlines(),
+            key=lambda line: "rdf-syntax-ns#type" in line,
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "ontology.nt"
+            file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            streamed = _index_ontology_file(self.ontology_uri, file_path, None)
+
+        def summary(classes):
+            return {
+                cls.full_uri: (
+                    sorted((label.value, label.language) for label in cls.label),
+                    len(cls.description),
+                    cls.is_deprecated,
+                    sorted(cls.super_classes),
+                )
+                for cls in classes
+            }
+
+        index = self.indexer.index(self.ontology_uri, self.graph)
+        self.assertEqual(streamed.format, "nt")
+        self.assertEqual(summary(streamed.classes), summary(index.classes))
+        self.assertTrue(any(cls.label for cls in streamed.classes))
+
+    def test_transitive_super_classes_and_class_expressions(self):
+        graph = Graph()
+        graph.parse(
+            data="""
+            @prefix : <http://example.org/ontology#> .
+            @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+            @prefix owl: <http://www.w3.org/2002/07/owl#> .
+            @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+            :A a owl:Class .
+            :B a owl:Class ; rdfs:subClassOf :A .
+            :C a owl:Class ; rdfs:subClassOf :B , [ a owl:Restriction ] .
+            :p a rdf:Property ;
+                rdfs:domain [ a owl:Class ; owl:unionOf ( :A :B ) ] ;
+                rdfs:range [ owl:intersectionOf ( :B :C ) ] .
+            """,
+            format="turtle",
+        )
+
+        classes = {
+            cls.full_uri: cls
+            for cls in self.indexer.get_classes(self.ontology_uri, graph)
+        }
+        properties = self.indexer.get_properties(self.ontology_uri, graph)
+
+        self.assertEqual(len(classes), 3)
+        self.assertEqual(
+            classes["http://example.org/ontology#C"].super_classes,
+            [
+                "http://example.org/ontology#B",
+                "http://example.org/ontology#A",
+            ],
+        )
+        self.assertEqual(properties[0].property_type, PropertyType.ANY)
+        self.assertEqual(
+            properties[0].domain,
+            [
+                "http://example.org/ontology#A",
+                "http://example.org/ontology#B",
+            ],
+        )
+        self.assertEqual(
+            properties[0].range,
+            [
+                "http://example.org/ontology#B",
+                "http://example.org/ontology#C",
+            ],
+        )
 
 
 if __name__ == "__main__":
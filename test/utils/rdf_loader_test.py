@@ -0,0 +1,102 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from rdflib import RDF, RDFS, Dataset, URIRef
+
+from server.utils.rdf_loader import RDFLoader
+
+
+class TestRDFLoader(unittest.TestCase):
+    def setUp(self):
+        self.bytes = Path("test/test_assets/test_ontology.ttl").read_bytes()
+        self.graph = RDFLoader.load_rdf_bytes(self.bytes)
+
+    def tearDown(self) -> None:
+        self.graph.close()
+        return super().tearDown()
+
+    def test_guess_format_from_content(self):
+        for format in ("turtle", "xml", "nt", "json-ld"):
+            with self.subTest(format=format):
+                data = self.graph.serialize(format=format).encode("utf-8")
+                self.assertEqual(RDFLoader.guess_format(data), format)
+
+    def test_guess_format_uses_file_name_for_turtle_family(self):
+        data = self.graph.serialize(format="n3").encode("utf-8")
+
+        self.assertEqual(RDFLoader.guess_format(data, "ontology.n3"), "n3")
+        self.assertEqual(RDFLoader.guess_format(data, "ontology.txt"), "turtle")
+
+    def test_guess_format_of_lines_starting_with_short_iris(self):
+        for data, format in [
+            (b"<urn:a> <urn:p> <urn:o> .\n<urn:b> <urn:p> <urn:o> .\n", "nt"),
+            (b"<a> <p> <o> .\n<b> <p> <o> .\n", "nt"),
+            (b"<a> <p> <o> .\n", "nt"),
+            (b"<a> <p> <o> <g> .\n<b> <p> <o> .\n", "nquads"),
+        ]:
+            with self.subTest(data=data):
+                self.assertEqual(RDFLoader.guess_format(data, "x.nt"), format)
+                self.assertEqual(RDFLoader.guess_format(data), format)
+
+        data = b"<rdf:RDF xmlns:rdf='http://www.w3.org/1999/02/22-rdf-syntax-ns#'/>"
+        self.assertEqual(RDFLoader.guess_format(data), "xml")
+
+    def test_load_quads_into_union_graph(self):
+        dataset = Dataset()
+        named_graph = dataset.graph(URIRef("http://example.org/graph"))
+        for triple in self.graph:
+            named_graph.add(triple)
+        data = dataset.serialize(format="nquads").encode("utf-8")
+
+        graph, format = RDFLoader.load_rdf_bytes_with_format(data)
+
+        self.assertEqual(format, "nquads")
+        self.assertEqual(len(graph), len(self.graph))
+
+    def test_load_gzip_compressed_bytes(self):
+        graph, format = RDFLoader.load_rdf_bytes_with_format(
+            gzip.compress(self.bytes), "ontology.ttl.gz"
+        )
+
+        self.assertEqual(format, "turtle")
+        self.assertEqual(len(graph), len(self.graph))
+
+    def test_fallback_when_guess_fails(self):
+        data = self.graph.serialize(format="xml").encode("utf-8")
+
+        graph, format = RDFLoader.load_rdf_bytes_with_format(
+            b"<!-- comment -->" + data[data.index(b"<rdf:RDF") :]
+        )
+
+        self.assertEqual(format, "xml")
+        self.assertEqual(len(graph), len(self.graph))
+
+    def test_stream_triples_filters_predicates(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "ontology.nt.gz"
+            file_path.write_bytes(
+                gzip.compress(self.graph.serialize(format="nt").encode("utf-8"))
+            )
+            self.assertEqual(
+                RDFLoader.guess_file_format(file_path, file_path.name), "nt"
+            )
+
+            triples = []
+            RDFLoader.stream_triples(
+                file_path,
+                "nt",
+                lambda s, p, o: triples.append((s, p, o)),
+                predicates=[RDF.type, RDFS.subClassOf],
+            )
+
+        self.assertEqual(
+            set(triples),
+            set(self.graph.triples((None, RDF.type, None)))
+            | set(self.graph.triples((None, RDFS.subClassOf, None))),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from rdflib import Graph
+
+from server.utils.rml_partitioner import RML, RMLPartitioner
+
+MAPPING = """
+@prefix rr: <http://www.w3.org/ns/r2rml#> .
+@prefix rml: <http://semweb.mmlab.be/ns/rml#> .
+@prefix ql: <http://semweb.mmlab.be/ns/ql#> .
+
+<#Person> a rr:TriplesMap ;
+    rml:logicalSource [ rml:source "%s" ; rml:referenceFormulation ql:CSV ] ;
+    rr:subjectMap [ rr:template "http://example.org/person/{id}" ] .
+"""
+
+
+class TestRMLPartitioner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.csv_file = self.dir / "people.csv"
+        self.csv_file.write_bytes(
+            b'id,name\n1,"Doe, John"\n2,"multi\nline"\n3,"quote "" here"\n4,Jane'
+        )
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def test_split_csv_keeps_records_and_header(self):
+        partitions = RMLPartitioner.split_csv(self.csv_file, self.dir, 2)
+
+        self.assertEqual(
+            [partition.read_bytes() for partition in partitions],
+            [
+                b'id,name\n1,"Doe, John"\n2,"multi\nline"\n',
+                b'id,name\n3,"quote "" here"\n4,Jane',
+            ],
+        )
+
+    def test_partition_mapping_reads_partition(self):
+        rml = Graph().parse(data=MAPPING % self.csv_file, format="turtle")
+        source = RMLPartitioner.find_partitionable_source(rml)
+        self.assertEqual(source, str(self.csv_file))
+
+        partition = self.dir / "people_part0.csv"
+        mapping_file = self.dir / "rml_0.ttl"
+        RMLPartitioner.write_partition_mapping(rml, source, partition, mapping_file)
+
+        partition_rml = Graph().parse(mapping_file, format="turtle")
+        self.assertEqual(
+            [str(o) for o in partition_rml.objects(None, RML.source)],
+            [str(partition)],
+        )
+        self.assertEqual(len(partition_rml), len(rml))
+
+    def test_mapping_with_join_is_not_partitioned(self):
+        rml = Graph().parse(
+            data=MAPPING % self.csv_file
+            + """
+            <#Person> rr:predicateObjectMap [
+                rr:objectMap [
+                    rr:parentTriplesMap <#Person> ;
+                    rr:joinCondition [ rr:child "id" ; rr:parent "id" ]
+                ]
+            ] .
+            """,
+            format="turtle",
+        )
+
+        self.assertIsNone(RMLPartitioner.find_partitionable_source(rml))
+
+    def test_merge_renames_blank_nodes(self):
+        first = self.dir / "rdf_0.nq"
+        first.write_bytes(
+            b'<http://a> <http://p> _:0 .\n<http://a> <http://q> "_:0 text" .\n'
+        )
+        second = self.dir / "rdf_1.nq"
+        second.write_bytes(
+            b'<http://a> <http://p> _:0 .\n<http://a> <http://q> "_:0 text" .\n'
+            b"<http://ex.org/a_:b> <http://p> _:0 <http://g_:0> ."
+        )
+        output = self.dir / "rdf.nq"
+
+        lines = RMLPartitioner.merge_nquads([first, second], output)
+
+        self.assertEqual(lines, 5)
+        self.assertEqual(
+            output.read_bytes(),
+            b"<http://a> <http://p> _:p0x0 .\n"
+            b'<http://a> <http://q> "_:0 text" .\n'
+            b"<http://a> <http://p> _:p1x0 .\n"
+            b'<http://a> <http://q> "_:0 text" .\n'
+            b"<http://ex.org/a_:b> <http://p> _:p1x0 <http://g_:0> .\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
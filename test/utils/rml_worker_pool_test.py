@@ -0,0 +1,102 @@
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from server.utils.rml_worker_pool import (
+    RMLWorker,
+    RMLWorkerError,
+    RMLWorkerPool,
+    RMLWorkerStartError,
+)
+
+# Speaks the RMLWorker.java protocol, the mapping file tells it what to do
+FAKE_WORKER = textwrap.dedent(
+    """
+    import sys, time
+    print("READY", flush=True)
+    for line in sys.stdin:
+        line = line.rstrip("\\n")
+        if line == "PING":
+            print("PONG", flush=True)
+            continue
+        job_id, mapping, output, serialization = line.split("\\t")
+        action = open(mapping).read()
+        if action == "crash":
+            sys.exit(1)
+        if action == "slow":
+            time.sleep(10)
+        if action == "fail":
+            print("mapper error", file=sys.stderr, flush=True)
+            print(f"ERR {job_id} Invalid mapping", flush=True)
+            continue
+        open(output, "w").write(serialization)
+        print(f"OK {job_id}", flush=True)
+    """
+)
+
+
+class TestRMLWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.pool = RMLWorkerPool(
+            1, lambda: RMLWorker([sys.executable, "-c", FAKE_WORKER])
+        )
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def _run(self, action: str, timeout: float = 10) -> Path:
+        mapping_file = self.dir / "mapping.ttl"
+        mapping_file.write_text(action)
+        output_file = self.dir / "output.nt"
+        output_file.unlink(missing_ok=True)
+        self.pool.run(mapping_file, output_file, "nquads", timeout)
+        return output_file
+
+    def test_worker_is_reused(self):
+        self.assertEqual(self._run("map").read_text(), "nquads")
+        self.assertEqual(self._run("map").read_text(), "nquads")
+
+        stats = self.pool.stats()
+        self.assertEqual(stats.workers, 1)
+        self.assertEqual(stats.completed, 2)
+        self.assertEqual(stats.restarts, 0)
+
+    def test_failed_job_keeps_worker(self):
+        with self.assertRaises(RMLWorkerError) as context:
+            self._run("fail")
+        self.assertIn("Invalid mapping", str(context.exception))
+
+        self._run("map")
+        self.assertEqual(self.pool.stats().restarts, 0)
+
+    def test_crashed_worker_is_restarted(self):
+        with self.assertRaises(RMLWorkerError):
+            self._run("crash")
+
+        self._run("map")
+        stats = self.pool.stats()
+        self.assertEqual(stats.restarts, 1)
+        self.assertEqual(stats.failed, 1)
+
+    def test_timed_out_worker_is_replaced(self):
+        with self.assertRaises(TimeoutError):
+            self._run("slow", timeout=0.5)
+
+        self._run("map")
+        stats = self.pool.stats()
+        self.assertEqual(stats.timeouts, 1)
+        self.assertEqual(stats.restarts, 1)
+
+    def test_worker_that_does_not_start(self):
+        with self.assertRaises(RMLWorkerStartError):
+            RMLWorker([sys.executable, "-c", "import sys; sys.exit(1)"])
+
+
+if __name__ == "__main__":
+    unittest.main()